@@ -0,0 +1,96 @@
+"""Import-time benchmark for the package.
+
+Imports each entry module in a fresh interpreter several times and reports
+the median time, and which heavy dependencies the import pulled in. Exits
+with status 1 if the median exceeds --budget-ms, so it can guard the
+budget in CI.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_import.py --budget-ms 150
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "concall_parser.parser",
+    "concall_parser.async_parser",
+    "concall_parser.cli",
+]
+# Loaded on first use; importing the package must not load them.
+HEAVY_DEPENDENCIES = [
+    "asyncio",
+    "dotenv",
+    "groq",
+    "httpx",
+    "pdfplumber",
+    "pypdfium2",
+    "requests",
+]
+# The async API needs asyncio itself.
+ALLOWED_DEPENDENCIES = {"concall_parser.async_parser": {"asyncio"}}
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    """Imports module in a fresh interpreter, returns seconds and heavy deps."""
+    heavy = [
+        name
+        for name in HEAVY_DEPENDENCIES
+        if name not in ALLOWED_DEPENDENCIES.get(module, set())
+    ]
+    script = SCRIPT.format(module=module, heavy=heavy)
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def bench_import(module: str, repeat: int) -> dict:
+    """Returns the median import time of module over `repeat` runs."""
+    runs = [measure_import(module) for _ in range(repeat)]
+    return {
+        "module": module,
+        "median_ms": statistics.median(run["seconds"] for run in runs) * 1000,
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    over_budget = False
+    print(f"{'module':<30} {'median ms':>10}  heavy dependencies loaded")
+    for module in MODULES:
+        result = bench_import(module, args.repeat)
+        print(
+            f"{module:<30} {result['median_ms']:>10.1f}  "
+            f"{', '.join(result['heavy']) or '-'}"
+        )
+        if args.budget_ms is not None and result["median_ms"] > args.budget_ms:
+            over_budget = True
+    if over_budget:
+        print(f"Over the import budget of {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Scaling benchmark for the management case extractor.
+
+Extracts speeches from synthetic calls without a moderator, up to 300 pages,
+and reports the time per character, which stays flat as the call grows. The
+legacy pattern, a lazy DOTALL match with a lookahead tried at every
+character, is timed on the same pages for comparison, and on a single page
+of unpunctuated text, where its cost grows quadratically.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_management_case.py
+"""
+
+import argparse
+import re
+
+from benchmarks.bench_segmentation import best_of
+from benchmarks.synthetic import make_management_call, make_unpunctuated_page
+from concall_parser.extractors.management_case_extractor import (
+    ManagementCaseExtractor,
+)
+
+LEGACY_PATTERN = re.compile(
+    r"([A-Z]\.\s)?([A-Za-z\s]+):\s(.*?)(?=\s[A-Z]\.?\s?[A-Za-z\s]+:\s|$)",
+    re.DOTALL,
+)
+
+
+def legacy_extract(transcript: dict[int, str]) -> dict[str, list[str]]:
+    """The extractor before the single-pass scanner, for comparison."""
+    speech_pair: dict[str, list[str]] = {}
+    for text in transcript.values():
+        for initial, name, speech in LEGACY_PATTERN.findall(text):
+            speaker = f"{(initial or '').strip()} {name.strip()}".strip()
+            speech_pair.setdefault(speaker, []).append(
+                re.sub(r"\n", " ", speech).strip()
+            )
+    return speech_pair
+
+
+def bench_call_scaling(page_counts: list[int], repeat: int) -> list[dict]:
+    """Times both extractors on whole calls of increasing length."""
+    extractor = ManagementCaseExtractor()
+    results = []
+    for pages in page_counts:
+        transcript = make_management_call(pages)
+        chars = sum(len(text) for text in transcript.values())
+        new = best_of(lambda: extractor.extract(transcript), repeat)
+        legacy = best_of(lambda: legacy_extract(transcript), repeat)
+        results.append(
+            {
+                "pages": pages,
+                "chars": chars,
+                "new": new,
+                "legacy": legacy,
+                "ns_per_char": new / chars * 1e9,
+            }
+        )
+    return results
+
+
+def bench_page_scaling(line_counts: list[int], repeat: int) -> list[dict]:
+    """Times a single unpunctuated page with both extractors."""
+    extractor = ManagementCaseExtractor()
+    results = []
+    for lines in line_counts:
+        transcript = {1: make_unpunctuated_page(lines)}
+        new = best_of(lambda: extractor.extract(transcript), repeat)
+        legacy = best_of(lambda: legacy_extract(transcript), repeat)
+        results.append({"lines": lines, "new": new, "legacy": legacy})
+    return results
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[50, 100, 200, 300]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("Whole call:")
+    print(
+        f"{'pages':>8} {'chars':>10} {'new (s)':>9} {'ns/char':>8} "
+        f"{'legacy (s)':>11}"
+    )
+    results = bench_call_scaling(args.pages, args.repeat)
+    for row in results:
+        print(
+            f"{row['pages']:>8} {row['chars']:>10} {row['new']:>9.4f} "
+            f"{row['ns_per_char']:>8.1f} {row['legacy']:>11.4f}"
+        )
+    growth = results[-1]["ns_per_char"] / results[0]["ns_per_char"]
+    print(f"per-character cost ratio, largest/smallest: {growth:.2f}")
+
+    print("\nSingle unpunctuated page:")
+    print(f"{'lines':>8} {'new (s)':>9} {'legacy (s)':>11}")
+    for row in bench_page_scaling([50, 100, 200, 400], args.repeat):
+        print(f"{row['lines']:>8} {row['new']:>9.5f} {row['legacy']:>11.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Throughput and parity benchmark for the pdf text extraction backends.
+
+Extracts every document in tests/test_documents with each backend and
+reports pages per second. Parity is measured against pdfplumber as the
+sequence of speaker labels found on each page: a page matches when
+segmenting its text yields the same speakers in the same order.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pdf_backends.py
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from concall_parser.utils.pdf_backends import PDF_BACKENDS, open_pdf
+from concall_parser.utils.speaker_segmenter import segment_speakers
+
+
+def extract_all(path: str, backend: str) -> tuple[list[str], float, list]:
+    """Extracts every page, returns texts, seconds and fallback pages."""
+    start = time.perf_counter()
+    with open_pdf(path, backend) as pdf:
+        texts = [pdf.extract_page(index) for index in range(pdf.page_count)]
+        fallback_pages = getattr(pdf, "fallback_pages", [])
+    return texts, time.perf_counter() - start, fallback_pages
+
+
+def speakers(text: str) -> list[str]:
+    """Returns the speaker labels of a page, in order."""
+    return [turn.speaker for turn in segment_speakers(text)]
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", default="tests/test_documents")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.documents, "*.pdf")))
+    totals = {backend: [0, 0.0] for backend in PDF_BACKENDS}
+
+    print(
+        f"{'document':<22} {'backend':<11} {'pages/s':>8} "
+        f"{'parity':>7} {'fallback':>8}"
+    )
+    for path in paths:
+        reference, _, _ = extract_all(path, "pdfplumber")
+        for backend in PDF_BACKENDS:
+            texts, seconds, fallback_pages = extract_all(path, backend)
+            matching = sum(
+                speakers(text) == speakers(expected)
+                for text, expected in zip(texts, reference)
+            )
+            totals[backend][0] += len(texts)
+            totals[backend][1] += seconds
+            print(
+                f"{os.path.basename(path)[:22]:<22} {backend:<11} "
+                f"{len(texts) / seconds:>8.1f} "
+                f"{matching:>3}/{len(texts):<3} {len(fallback_pages):>8}"
+            )
+
+    print("\nOverall:")
+    baseline = totals["pdfplumber"][0] / totals["pdfplumber"][1]
+    for backend, (pages, seconds) in totals.items():
+        rate = pages / seconds
+        print(
+            f"{backend:<11} {rate:>8.1f} pages/s "
+            f"({rate / baseline:.1f}x pdfplumber)"
+        )
+
+
+if __name__ == "__main__":
+    main()
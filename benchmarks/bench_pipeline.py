@@ -0,0 +1,286 @@
+"""Per-stage benchmark of the parsing pipeline, with a stubbed LLM.
+
+Runs every document in tests/test_documents and synthetic moderated calls of
+increasing size through the pipeline and reports, per document:
+
+- pages per second of get_document_transcript (pdfs only),
+- time spent segmenting pages into speaker turns,
+- LLM calls and prompt/completion tokens spent on the document,
+- end-to-end latency of a parse, with the LLM answered instantly and
+  deterministically by an offline backend, so only our own code is timed.
+
+Results are written as JSON, tagged with the git commit; pass the file of
+an earlier run to --compare to print how each timing changed.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_pipeline.py --output results.json
+    PYTHONPATH=. python benchmarks/bench_pipeline.py --compare results.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import threading
+import time
+
+from benchmarks.synthetic import make_moderated_call
+from concall_parser.agents import classify
+from concall_parser.agents.moderator_rules import RuleBasedModeratorIntent
+from concall_parser.extractors.dialogue_extractor import DialogueExtractor
+from concall_parser.extractors.management import CompanyAndManagementExtractor
+from concall_parser.parser import ConcallParser
+from concall_parser.utils.file_utils import get_document_transcript
+from concall_parser.utils.get_groq_responses import set_llm_backend
+from concall_parser.utils.llm_backends import LLMBackend, OfflineBackend
+from concall_parser.utils.speaker_segmenter import iter_transcript_turns
+from concall_parser.utils.transcript_buffer import TranscriptBuffer
+
+MODEL = "llama3-70b-8192"
+MANAGEMENT_ANSWER = json.dumps(
+    {"company_name": "Synthetic Industries", "Rahul Jain": "CEO"}
+)
+# Timings compared between runs, and whether larger is better.
+COMPARED_METRICS = {
+    "pages_per_second": True,
+    "segmentation_seconds": False,
+    "end_to_end_seconds": False,
+}
+
+
+def stub_answer(messages: list[dict], model: str) -> str:
+    """Answers like the model would, instantly and deterministically."""
+    if messages[0]["content"] != classify.CONTEXT:
+        return MANAGEMENT_ANSWER
+    result = RuleBasedModeratorIntent.process(messages[-1]["content"])
+    if not result.pop("confidence"):
+        # Keep walking the document rather than ending it early.
+        return json.dumps({"intent": "opening"})
+    return json.dumps(result)
+
+
+class CountingBackend(LLMBackend):
+    """Counts the requests and tokens passing through to another backend."""
+
+    name = "counting"
+
+    def __init__(self, backend: LLMBackend):
+        """Initialize CountingBackend around the backend that answers."""
+        self.backend = backend
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages: list[dict], model: str, **params):
+        """Forwards the request and counts it."""
+        response = self.backend.complete(messages, model, **params)
+        with self._lock:
+            self.calls += 1
+            if response.usage is not None:
+                self.prompt_tokens += response.usage.prompt_tokens
+                self.completion_tokens += response.usage.completion_tokens
+        return response
+
+
+def git_commit() -> str | None:
+    """Returns the commit the benchmark runs on, if in a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def time_segmentation(transcript: dict[int, str]) -> tuple[float, int]:
+    """Returns seconds taken to segment the transcript, and the turns found."""
+    start = time.perf_counter()
+    turns = sum(
+        1 for _ in iter_transcript_turns(transcript, TranscriptBuffer())
+    )
+    return time.perf_counter() - start, turns
+
+
+def parse_transcript(transcript: dict[int, str]) -> dict:
+    """Runs the extract_all stages of ConcallParser on a ready transcript."""
+    management = CompanyAndManagementExtractor().extract(
+        text="".join(transcript.get(page, "") for page in (1, 2)),
+        groq_model=MODEL,
+    )
+    dialogues = DialogueExtractor().extract(
+        transcript=transcript, groq_model=MODEL
+    )
+    return {"concall_info": management, **dialogues}
+
+
+def bench_document(
+    name: str,
+    transcript: dict[int, str],
+    parse,
+    transcript_seconds: float | None = None,
+    repeat: int = 3,
+) -> dict:
+    """Times segmentation and a stubbed parse of one document.
+
+    Timings are the fastest of `repeat` runs; every run makes the same LLM
+    calls.
+    """
+    segmentation_seconds = end_to_end_seconds = float("inf")
+    for _ in range(repeat):
+        backend = CountingBackend(OfflineBackend(rules=[(r"", stub_answer)]))
+        set_llm_backend(backend)
+        try:
+            seconds, turns = time_segmentation(transcript)
+            segmentation_seconds = min(segmentation_seconds, seconds)
+            start = time.perf_counter()
+            parse()
+            end_to_end_seconds = min(
+                end_to_end_seconds, time.perf_counter() - start
+            )
+        finally:
+            set_llm_backend(None)
+
+    pages = len(transcript)
+    return {
+        "document": name,
+        "pages": pages,
+        "chars": sum(len(text) for text in transcript.values()),
+        "turns": turns,
+        "transcript_seconds": transcript_seconds,
+        "pages_per_second": (
+            pages / transcript_seconds if transcript_seconds else None
+        ),
+        "segmentation_seconds": segmentation_seconds,
+        "llm_calls": backend.calls,
+        "prompt_tokens": backend.prompt_tokens,
+        "completion_tokens": backend.completion_tokens,
+        "end_to_end_seconds": end_to_end_seconds,
+    }
+
+
+def bench_pdfs(documents_dir: str, pdf_backend: str, repeat: int) -> list[dict]:
+    """Benchmarks every pdf, end to end through ConcallParser."""
+    results = []
+    for path in sorted(glob.glob(os.path.join(documents_dir, "*.pdf"))):
+        start = time.perf_counter()
+        transcript = get_document_transcript(path, backend=pdf_backend)
+        transcript_seconds = time.perf_counter() - start
+        results.append(
+            bench_document(
+                os.path.basename(path),
+                transcript,
+                lambda path=path: ConcallParser(
+                    path=path, groq_model=MODEL, pdf_backend=pdf_backend
+                ).extract_all(),
+                transcript_seconds,
+                repeat,
+            )
+        )
+    return results
+
+
+def bench_synthetic(page_counts: list[int], repeat: int) -> list[dict]:
+    """Benchmarks synthetic calls, parsed from their ready transcripts."""
+    results = []
+    for pages in page_counts:
+        transcript = make_moderated_call(pages)
+        results.append(
+            bench_document(
+                f"synthetic-{pages}",
+                transcript,
+                lambda transcript=transcript: parse_transcript(transcript),
+                repeat=repeat,
+            )
+        )
+    return results
+
+
+def compare(results: list[dict], baseline_path: str) -> None:
+    """Prints each timing relative to an earlier run, >1 meaning faster."""
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    before = {row["document"]: row for row in baseline["documents"]}
+    print(f"\nCompared to {baseline.get('commit')} (>1 is faster now):")
+    print(f"{'document':<24}" + "".join(f"{m:>22}" for m in COMPARED_METRICS))
+    for row in results:
+        old = before.get(row["document"])
+        if old is None:
+            continue
+        cells = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            new_value, old_value = row[metric], old.get(metric)
+            if not new_value or not old_value:
+                cells.append(f"{'-':>22}")
+                continue
+            ratio = (
+                new_value / old_value
+                if higher_is_better
+                else old_value / new_value
+            )
+            cells.append(f"{ratio:>21.2f}x")
+        print(f"{row['document']:<24}" + "".join(cells))
+
+
+def main():
+    """Runs the benchmark, prints and writes the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", default="tests/test_documents")
+    parser.add_argument(
+        "--synthetic-pages", type=int, nargs="*", default=[50, 200, 800]
+    )
+    parser.add_argument(
+        "--pdf-backend",
+        default="pdfplumber",
+        choices=["pdfplumber", "pdfium", "auto"],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="results file of an earlier run")
+    args = parser.parse_args()
+
+    results = bench_pdfs(args.documents, args.pdf_backend, args.repeat)
+    results += bench_synthetic(args.synthetic_pages, args.repeat)
+
+    print(
+        f"{'document':<24} {'pages':>6} {'pages/s':>8} {'segment s':>10} "
+        f"{'llm calls':>9} {'prompt tok':>10} {'e2e s':>8}"
+    )
+    for row in results:
+        pages_per_second = (
+            f"{row['pages_per_second']:>8.1f}"
+            if row["pages_per_second"]
+            else f"{'-':>8}"
+        )
+        print(
+            f"{row['document']:<24} {row['pages']:>6} {pages_per_second} "
+            f"{row['segmentation_seconds']:>10.4f} {row['llm_calls']:>9} "
+            f"{row['prompt_tokens']:>10} {row['end_to_end_seconds']:>8.3f}"
+        )
+
+    if args.compare:
+        compare(results, args.compare)
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "commit": git_commit(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "python": platform.python_version(),
+                "pdf_backend": args.pdf_backend,
+                "repeat": args.repeat,
+                "documents": results,
+            },
+            file,
+            indent=4,
+        )
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
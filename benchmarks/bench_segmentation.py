@@ -0,0 +1,101 @@
+"""Scaling benchmark for speaker segmentation.
+
+Segments synthetic transcripts of increasing size and reports the time per
+character. With a linear-time segmenter the per-character cost stays flat as
+the input grows; the legacy backtracking pattern is shown for comparison on
+a single page of unpunctuated text, where it degrades quadratically.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_segmentation.py
+"""
+
+import argparse
+import re
+import time
+
+from benchmarks.synthetic import make_transcript, make_unpunctuated_page
+from concall_parser.utils.speaker_segmenter import segment_speakers
+
+LEGACY_SPEAKER_PATTERN = re.compile(
+    r"(?P<speaker>[A-Za-z\s]+):\s*(?P<dialogue>(?:.*(?:\n(?![A-Za-z\s]+:).*)*)*)",
+    re.MULTILINE,
+)
+
+
+def best_of(func, repeat: int) -> float:
+    """Returns the fastest of `repeat` timed runs of func, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_document_scaling(page_counts: list[int], repeat: int) -> list[dict]:
+    """Times segmentation of whole synthetic transcripts, page by page."""
+    results = []
+    for pages in page_counts:
+        transcript = make_transcript(pages)
+        chars = sum(len(text) for text in transcript.values())
+        seconds = best_of(
+            lambda: [segment_speakers(text) for text in transcript.values()],
+            repeat,
+        )
+        results.append(
+            {
+                "pages": pages,
+                "chars": chars,
+                "seconds": seconds,
+                "ns_per_char": seconds / chars * 1e9,
+            }
+        )
+    return results
+
+
+def bench_page_scaling(line_counts: list[int], repeat: int) -> list[dict]:
+    """Times a single unpunctuated page, new segmenter against legacy regex."""
+    results = []
+    for lines in line_counts:
+        text = make_unpunctuated_page(lines)
+        new = best_of(lambda: segment_speakers(text), repeat)
+        legacy = best_of(
+            lambda: list(LEGACY_SPEAKER_PATTERN.finditer(text)), repeat
+        )
+        results.append(
+            {"lines": lines, "chars": len(text), "new": new, "legacy": legacy}
+        )
+    return results
+
+
+def main():
+    """Runs the benchmark and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pages", type=int, nargs="+", default=[125, 250, 500, 1000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print("Whole transcript, page by page:")
+    print(f"{'pages':>8} {'chars':>10} {'seconds':>9} {'ns/char':>8}")
+    doc_results = bench_document_scaling(args.pages, args.repeat)
+    for row in doc_results:
+        print(
+            f"{row['pages']:>8} {row['chars']:>10} "
+            f"{row['seconds']:>9.4f} {row['ns_per_char']:>8.1f}"
+        )
+    growth = doc_results[-1]["ns_per_char"] / doc_results[0]["ns_per_char"]
+    print(f"per-character cost ratio, largest/smallest: {growth:.2f}")
+
+    print("\nSingle unpunctuated page:")
+    print(f"{'lines':>8} {'chars':>10} {'new (s)':>9} {'legacy (s)':>11}")
+    for row in bench_page_scaling([50, 100, 200, 400], args.repeat):
+        print(
+            f"{row['lines']:>8} {row['chars']:>10} "
+            f"{row['new']:>9.5f} {row['legacy']:>11.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Synthetic concall transcripts for benchmarks."""
+
+import random
+
+SPEAKERS = ["Moderator", "Rahul Jain", "Sanjay Kumar Jain", "Mukesh Saraf"]
+
+# Table-like filler with no punctuation: every line is one long run of
+# letters and spaces, the worst case for label detection.
+UNPUNCTUATED_LINE = (
+    "revenue grew in the quarter across all segments and regions"
+)
+
+SENTENCE = (
+    "Our revenue for the quarter was Rs. 1,234 crores, up 12% year-on-year."
+)
+
+
+def make_page(page_number: int, rng: random.Random, lines: int = 40) -> str:
+    """Builds a single page of a moderated call with a header and footer."""
+    out = [f"Synthetic Industries Limited\nPage {page_number}"]
+    for _ in range(lines // 4):
+        speaker = rng.choice(SPEAKERS)
+        out.append(f"{speaker}: {SENTENCE}")
+        out.extend(rng.choice([SENTENCE, UNPUNCTUATED_LINE]) for _ in range(3))
+    return "\n".join(out)
+
+
+def make_transcript(pages: int, seed: int = 0) -> dict[int, str]:
+    """Builds a page number, page text mapping like get_document_transcript."""
+    rng = random.Random(seed)
+    return {
+        page_number: make_page(page_number, rng)
+        for page_number in range(1, pages + 1)
+    }
+
+
+def make_unpunctuated_page(lines: int = 40) -> str:
+    """Builds a page whose single turn is one long run of letters and spaces."""
+    return "Moderator: " + "\n".join([UNPUNCTUATED_LINE] * lines)
+
+
+ANALYSTS = [
+    ("Jane Roe", "ABC Capital"),
+    ("John Doe", "XYZ Securities"),
+    ("Priya Mehta", "Avendus Spark"),
+]
+MANAGEMENT = ["Rahul Jain", "Sanjay Kumar Jain"]
+
+
+def make_moderated_call(pages: int, seed: int = 0) -> dict[int, str]:
+    """Builds a full moderated call: opening, commentary, Q&A and closing.
+
+    The first fifth of the pages is management commentary and the rest is
+    question and answer, with a new analyst every couple of pages, so that
+    every stage of the parser has work to do.
+    """
+    rng = random.Random(seed)
+    commentary_pages = max(1, pages // 5)
+    transcript = {}
+    for page_number in range(1, pages + 1):
+        out = [f"Synthetic Industries Limited\nPage {page_number}"]
+        if page_number == 1:
+            out.append(
+                "Moderator: Ladies and gentlemen, good day and welcome to "
+                "the Q3 FY25 earnings conference call of Synthetic Industries."
+            )
+        elif page_number > commentary_pages and page_number % 2 == 0:
+            name, company = rng.choice(ANALYSTS)
+            out.append(
+                "Moderator: The next question is from the line of "
+                f"{name} from {company}."
+            )
+            out.append(f"{name}: {SENTENCE} What drove the growth?")
+        for _ in range(8):
+            out.append(f"{rng.choice(MANAGEMENT)}: {SENTENCE}")
+            out.extend([SENTENCE, UNPUNCTUATED_LINE])
+        if page_number == pages:
+            out.append("Moderator: That concludes the conference. Thank you.")
+        transcript[page_number] = "\n".join(out)
+    return transcript
+
+
+TITLED_MANAGEMENT = ["Sh B. Srinivasan", "Sh V. Srikanth", "Mr. Kiran Thomas"]
+
+
+def make_management_call(pages: int, seed: int = 0) -> dict[int, str]:
+    """Builds a call without a moderator, the management speaking in turn.
+
+    Speaker labels carry titles and initials, as in press-release style
+    calls, and every page mixes punctuated and unpunctuated lines.
+    """
+    rng = random.Random(seed)
+    transcript = {}
+    for page_number in range(1, pages + 1):
+        out = [f"Synthetic Industries Limited\nPage {page_number}"]
+        for _ in range(6):
+            out.append(f"{rng.choice(TITLED_MANAGEMENT)}:")
+            out.extend(
+                rng.choice([SENTENCE, UNPUNCTUATED_LINE]) for _ in range(5)
+            )
+        transcript[page_number] = "\n".join(out)
+    return transcript
@@ -1,5 +1,6 @@
 from concall_parser.log_config import logger
 from concall_parser.utils.get_groq_responses import get_groq_response
+from concall_parser.utils.instrumentation import span
 
 CONTEXT = """
 You are an AI assistant designed to find if there is a speaker playing the role of moderator from a
@@ -82,7 +83,10 @@ class CheckModerator:
             {"role": "user", "content": page_text},
         ]
         try:
-            response = get_groq_response(messages=messages, model=groq_model)
+            with span("agent.check_moderator"):
+                response = get_groq_response(
+                    messages=messages, model=groq_model
+                )
         except Exception:
             logger.exception(
                 "Could not get groq response for management extraction"
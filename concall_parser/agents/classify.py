@@ -1,4 +1,22 @@
-from concall_parser.utils.get_groq_responses import get_groq_response
+import json
+from typing import TYPE_CHECKING
+
+from concall_parser.agents.moderator_rules import RuleBasedModeratorIntent
+from concall_parser.log_config import logger
+from concall_parser.utils.get_groq_responses import (
+    SAMPLING_PARAMS,
+    get_groq_response,
+    get_groq_response_async,
+)
+from concall_parser.utils.instrumentation import span
+from concall_parser.utils.tokens import (
+    estimate_tokens,
+    get_prompt_budget,
+    trim_to_budget,
+)
+
+if TYPE_CHECKING:
+    import asyncio
 
 CONTEXT = """
 Classify the following moderator statement into one of the three categories:
@@ -57,6 +75,64 @@ Response:
 }
 """  # noqa
 
+BATCH_CONTEXT = """
+Classify each of the following moderator statements into one of the three categories:
+- opening (it's the start of the call)
+- new_analyst_start (it's introducing an analyst from a new company)
+- end (it's closing the call)
+
+The input is a JSON object with a list of statements, each with an "id":
+{"statements": [{"id": 0, "statement": "..."}, {"id": 1, "statement": "..."}]}
+
+Respond with a JSON object holding one result per statement, with the same "id".
+Include "analyst_name" and "analyst_company" only for new_analyst_start:
+{
+    "results": [
+        {"id": 0, "intent": "opening"},
+        {"id": 1, "intent": "new_analyst_start", "analyst_name": "Mukesh Saraf", "analyst_company": "Avendus Spark"},
+        {"id": 2, "intent": "end"}
+    ]
+}
+
+EXAMPLES:
+
+Statement: "Ladies and gentlemen, good morning, and welcome to the SKF India Limited Q1 FY 2024-'25
+Earnings Conference Call."
+Result: {"intent": "opening"}
+
+Statement: "Thank you very much. We will now begin the question-and-answer session. The first question
+is from the line of Mukesh Saraf at Avendus Spark."
+Result: {"intent": "new_analyst_start", "analyst_name": "Mukesh Saraf", "analyst_company": "Avendus Spark"}
+
+Statement: "Shall we go for the closing, sir?"
+Result: {"intent": "end"}
+"""  # noqa
+
+INTENTS = {"opening", "new_analyst_start", "end"}
+RESULT_KEYS = ("intent", "analyst_name", "analyst_company")
+
+# Completion tokens taken by one item of a batch result, and the prompt
+# tokens added around each statement by its id and JSON quoting.
+RESULT_TOKENS = 40
+ITEM_OVERHEAD_TOKENS = 12
+MAX_BATCH_SIZE = 25
+# Intent is decided by how a statement opens and closes; long Moderator turns
+# are cut down to their leading and trailing sentences within this budget.
+MAX_STATEMENT_TOKENS = 256
+
+
+class ClassificationError(RuntimeError):
+    """The LLM gave no usable classification of a moderator statement."""
+
+
+def trim_statement(dialogue: str, groq_model: str) -> str:
+    """Returns the part of a statement sent to the classifier."""
+    budget = min(
+        MAX_STATEMENT_TOKENS,
+        get_prompt_budget(groq_model, CONTEXT, SAMPLING_PARAMS["max_tokens"]),
+    )
+    return trim_to_budget(dialogue, budget)
+
 
 class ClassifyModeratorIntent:
     """Classify moderator statements into categories."""
@@ -74,9 +150,225 @@ class ClassifyModeratorIntent:
         """
         messages = [
             {"role": "system", "content": CONTEXT},
-            {"role": "user", "content": dialogue},
+            {"role": "user", "content": trim_statement(dialogue, groq_model)},
         ]
 
-        response = get_groq_response(messages=messages, model=groq_model)
+        with span("agent.classify"):
+            response = get_groq_response(messages=messages, model=groq_model)
 
         return response
+
+    @staticmethod
+    async def aprocess(
+        dialogue: str,
+        groq_model: str,
+        semaphore: "asyncio.Semaphore | None" = None,
+    ):
+        """Async counterpart of `process`.
+
+        Args:
+            dialogue (str): The moderator's statement to be classified
+            groq_model (str): The model to use for groq
+            semaphore (asyncio.Semaphore): Bounds concurrent Groq requests
+
+        Returns:
+            str: The classified category
+        """
+        messages = [
+            {"role": "system", "content": CONTEXT},
+            {"role": "user", "content": trim_statement(dialogue, groq_model)},
+        ]
+
+        with span("agent.classify"):
+            return await get_groq_response_async(
+                messages=messages, model=groq_model, semaphore=semaphore
+            )
+
+    @staticmethod
+    def parse_response(response: str | None, dialogue: str) -> dict:
+        """Returns the classification in a reply to `process`.
+
+        A request that failed once retries were used up gets None back, and
+        a model can reply with malformed JSON, an unknown intent or a new
+        analyst without a name. The statement is then classified by the
+        rules alone, whatever their confidence.
+
+        Args:
+            response (str | None): The LLM's reply.
+            dialogue (str): The moderator's statement that was classified
+
+        Returns:
+            dict: The classification, with at least an `intent`.
+
+        Raises:
+            ClassificationError: If the reply is unusable and the rules do
+                not recognise the statement either.
+        """
+        try:
+            result = ClassifyModeratorIntent._validate(json.loads(response))
+        except (TypeError, ValueError):
+            result = None
+        if result is not None:
+            return result
+
+        fallback = RuleBasedModeratorIntent.process(dialogue=dialogue)
+        if fallback["intent"] is None:
+            raise ClassificationError(
+                "LLM gave no usable classification of moderator statement "
+                f"{dialogue[:80]!r}: {response!r}"
+            )
+        logger.warning(
+            "LLM gave no usable classification, using rules: %s",
+            fallback["intent"],
+        )
+        return fallback
+
+    @staticmethod
+    def make_batches(dialogues: list[str], groq_model: str) -> list[list[int]]:
+        """Groups statements into batches that fit the model's limits.
+
+        A batch holds as many statements as fit in the model's context window
+        next to the batch prompt, and no more results than fit in one reply.
+
+        Args:
+            dialogues (list[str]): Moderator statements to be classified
+            groq_model (str): The model to use for groq
+
+        Returns:
+            list[list[int]]: Indices into dialogues, one list per batch.
+        """
+        max_completion_tokens = SAMPLING_PARAMS["max_tokens"]
+        prompt_budget = get_prompt_budget(
+            groq_model, BATCH_CONTEXT, max_completion_tokens
+        )
+        max_items = min(MAX_BATCH_SIZE, max_completion_tokens // RESULT_TOKENS)
+
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for index, dialogue in enumerate(dialogues):
+            statement = trim_statement(dialogue, groq_model)
+            tokens = estimate_tokens(statement) + ITEM_OVERHEAD_TOKENS
+            if batch and (
+                len(batch) == max_items or batch_tokens + tokens > prompt_budget
+            ):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(index)
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    def _validate(result) -> dict | None:
+        """Returns a classification with a known intent and its fields.
+
+        A new analyst needs a name; the company defaults to empty. Replies
+        that are not a dict, or have an unknown intent, give None.
+        """
+        if not isinstance(result, dict):
+            return None
+        intent = result.get("intent")
+        if intent not in INTENTS:
+            return None
+        if intent != "new_analyst_start":
+            return {**result, "intent": intent}
+        if not result.get("analyst_name"):
+            return None
+        return {
+            **result,
+            "analyst_company": result.get("analyst_company") or "",
+        }
+
+    @staticmethod
+    def _parse_batch_response(response: str | None, ids: set[int]) -> dict:
+        """Returns the valid results of a batch reply, keyed by statement id."""
+        try:
+            items = json.loads(response)["results"]
+        except (TypeError, KeyError, ValueError):
+            return {}
+        if not isinstance(items, list):
+            return {}
+
+        results = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_id = item.get("id")
+            if isinstance(item_id, str) and item_id.isdigit():
+                item_id = int(item_id)
+            result = ClassifyModeratorIntent._validate(item)
+            if item_id not in ids or result is None:
+                continue
+            results[item_id] = {
+                key: result[key] for key in RESULT_KEYS if key in result
+            }
+        return results
+
+    @staticmethod
+    def process_batch(
+        dialogues: list[str], groq_model: str, max_retries: int = 2
+    ) -> list[dict]:
+        """Classify many moderator statements with a single request.
+
+        Statements are sent as indexed items and the reply is validated item
+        by item. Items missing from a reply, or malformed, are sent again on
+        their own batch, up to max_retries times, and after that classified
+        one at a time with `process`.
+
+        Args:
+            dialogues (list[str]): Moderator statements to be classified
+            groq_model (str): The model to use for groq
+            max_retries (int): Times a batch is resent for missing items
+
+        Returns:
+            list[dict]: Classification of each statement, in input order.
+        """
+        results = {}
+        remaining = list(range(len(dialogues)))
+
+        for attempt in range(max_retries + 1):
+            if not remaining:
+                break
+            if attempt:
+                logger.warning(
+                    "Batch reply missed %d statements, retrying them",
+                    len(remaining),
+                )
+            payload = {
+                "statements": [
+                    {
+                        "id": index,
+                        "statement": trim_statement(
+                            dialogues[index], groq_model
+                        ),
+                    }
+                    for index in remaining
+                ]
+            }
+            messages = [
+                {"role": "system", "content": BATCH_CONTEXT},
+                {"role": "user", "content": json.dumps(payload)},
+            ]
+            with span("agent.classify_batch", statements=len(remaining)):
+                response = get_groq_response(
+                    messages=messages, model=groq_model
+                )
+            results.update(
+                ClassifyModeratorIntent._parse_batch_response(
+                    response, set(remaining)
+                )
+            )
+            remaining = [index for index in remaining if index not in results]
+
+        for index in remaining:
+            results[index] = ClassifyModeratorIntent.parse_response(
+                ClassifyModeratorIntent.process(
+                    dialogue=dialogues[index], groq_model=groq_model
+                ),
+                dialogues[index],
+            )
+
+        return [results[index] for index in range(len(dialogues))]
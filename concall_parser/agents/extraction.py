@@ -1,5 +1,15 @@
+from typing import TYPE_CHECKING
+
 from concall_parser.log_config import logger
-from concall_parser.utils.get_groq_responses import get_groq_response
+from concall_parser.utils.get_groq_responses import (
+    get_groq_response,
+    get_groq_response_async,
+)
+from concall_parser.utils.instrumentation import span
+from concall_parser.utils.rate_limiter import PRIORITY_HIGH
+
+if TYPE_CHECKING:
+    import asyncio
 
 # TODO: add second prompt case, for apollo (may be solved using regex but idk)
 
@@ -98,24 +108,61 @@ class ExtractManagement:
         Returns:
             None
         """
-        # TODO: context selection logic is wrong, recheck
-        if page_text != "":
-            messages = [
-                {"role": "system", "content": CONTEXT},
-                {"role": "user", "content": page_text},
-            ]
-        else:
-            messages = [
-                {"role": "system", "content": SPEAKER_SELECTION_CONTEXT},
-                {"role": "user", "content": page_text},
-            ]
+        messages = ExtractManagement._build_messages(page_text)
 
         # TODO: update data model of response in case of speaker selection
         # TODO: add company name fix in case of speaker selection
         try:
-            response = get_groq_response(messages=messages, model=groq_model)
+            with span("agent.extract_management"):
+                response = get_groq_response(
+                    messages=messages, model=groq_model, priority=PRIORITY_HIGH
+                )
             return response
         except Exception:
             logger.exception(
                 "Could not get groq response for management extraction"
             )
+
+    @staticmethod
+    async def aprocess(
+        page_text: str,
+        groq_model: str,
+        semaphore: "asyncio.Semaphore | None" = None,
+    ) -> str:
+        """Async counterpart of `process`.
+
+        Args:
+            page_text (str): The text content of a page from which management
+                information will be extracted.
+            groq_model (str): The model to use for Groq queries.
+            semaphore (asyncio.Semaphore): Bounds concurrent Groq requests.
+
+        Returns:
+            str: The Groq response.
+        """
+        messages = ExtractManagement._build_messages(page_text)
+        try:
+            with span("agent.extract_management"):
+                return await get_groq_response_async(
+                    messages=messages,
+                    model=groq_model,
+                    semaphore=semaphore,
+                    priority=PRIORITY_HIGH,
+                )
+        except Exception:
+            logger.exception(
+                "Could not get groq response for management extraction"
+            )
+
+    @staticmethod
+    def _build_messages(page_text: str) -> list[dict]:
+        # TODO: context selection logic is wrong, recheck
+        if page_text != "":
+            return [
+                {"role": "system", "content": CONTEXT},
+                {"role": "user", "content": page_text},
+            ]
+        return [
+            {"role": "system", "content": SPEAKER_SELECTION_CONTEXT},
+            {"role": "user", "content": page_text},
+        ]
@@ -0,0 +1,196 @@
+import itertools
+import re
+from collections.abc import Mapping
+
+from concall_parser.utils.speaker_segmenter import (
+    SPEAKER_LABEL_PATTERN,
+    iter_speaker_turns,
+)
+
+# A word of a name or company, or a run of initials such as "J.P.", whose
+# dots do not end the sentence.
+NAME_TOKEN = r"(?:(?:[A-Z]\.)+|[\w&'’-]+)"
+# Connectors between the analyst's name and their company, as in "the line
+# of Mukesh Saraf from Avendus Spark" or "Jane Roe with XYZ Securities".
+# Names and companies are a bounded number of tokens, so a statement is
+# matched in linear time however long it is.
+NEW_ANALYST_PATTERN = re.compile(
+    r"\bquestion\s+(?:is\s+|comes\s+)?from\s+(?:the\s+line\s+of\s+)?"
+    r"(?:(?:mr|ms|mrs|dr|shri|sir)\.?\s+)?"
+    rf"(?P<name>{NAME_TOKEN}(?:\s+{NAME_TOKEN}){{0,5}}?)"
+    r"\s+(?:from|of|with|at|representing)\s+"
+    rf"(?P<company>{NAME_TOKEN}(?:\s+{NAME_TOKEN}){{0,7}}?)"
+    r"\s*(?:[.?!,;](?=\s|$)|$)",
+    re.IGNORECASE,
+)
+HONORIFIC_PATTERN = re.compile(
+    r"^(?:mr|ms|mrs|dr|shri|sir)\.?\s+", re.IGNORECASE
+)
+NAME_WORD_PATTERN = re.compile(r"^[A-Z][A-Za-z.'’-]*$")
+
+END_PATTERN = re.compile(
+    r"\b(?:that\s+(?:concludes|was\s+the\s+last\s+question)"
+    r"|(?:concludes|conclude)\s+(?:this|today's|the)\s+(?:conference|call)"
+    r"|closing\s+(?:comments|remarks)"
+    r"|you\s+may\s+(?:now\s+)?disconnect)",
+    re.IGNORECASE,
+)
+OPENING_PATTERN = re.compile(
+    r"\b(?:ladies\s+and\s+gentlemen|good\s+(?:morning|afternoon|evening|day))"
+    r"\b.*\bwelcome\b"
+    r"|\bwelcome\s+to\s+the\b.*\b(?:call|conference|concall)\b",
+    re.IGNORECASE,
+)
+
+# Labels the conference operator's turns go under.
+MODERATOR_LABELS = frozenset(
+    {"Moderator", "Operator", "Conference Operator", "Coordinator"}
+)
+
+# A moderator label run into the end of the previous sentence, as pdfium
+# leaves it when the newline before the label is lost.
+INLINE_MODERATOR_PATTERN = re.compile(
+    r"[.?!][ \t]+(?P<speaker>"
+    + "|".join(sorted(MODERATOR_LABELS, key=len, reverse=True))
+    + r")[ \t]*:"
+)
+
+HIGH_CONFIDENCE = 0.95
+LOW_CONFIDENCE = 0.5
+
+# Pages whose speaker labels are looked at to tell if a call is moderated.
+DETECTION_PAGES = 5
+# Words a labelled turn needs to count as someone speaking, and turns needed
+# to tell that the management speaks on its own.
+MIN_SPEECH_WORDS = 20
+MIN_SPEECHES = 3
+# Labelled fields of the cover letter filed with the exchange, which come
+# before the transcript in many documents.
+LETTER_FIELD_PATTERN = re.compile(
+    r"^(?:sub(?:ject)?|ref(?:erence)?|scrip|encl|cin|registered|corporate|"
+    r"mailing|website|e-?mail|tel|phone|fax|date|note|to|isin|symbol)\b",
+    re.IGNORECASE,
+)
+
+
+def _find_moderator(pages: list[str]) -> str | None:
+    """Returns a moderator label not at the start of a line, if any.
+
+    Looks at the turns the moderated path segments pages into, and at
+    moderator labels run into the sentence before them.
+    """
+    for text in pages:
+        for turn in iter_speaker_turns(text):
+            if turn.speaker in MODERATOR_LABELS:
+                return turn.speaker
+        match = INLINE_MODERATOR_PATTERN.search(text)
+        if match:
+            return match.group("speaker")
+    return None
+
+
+def _is_name(text: str, max_words: int) -> bool:
+    words = text.split()
+    return 0 < len(words) <= max_words and all(
+        NAME_WORD_PATTERN.match(word) for word in words
+    )
+
+
+class RuleBasedModeratorIntent:
+    """Classify moderator statements with fixed patterns, without an LLM."""
+
+    @staticmethod
+    def process(dialogue: str) -> dict:
+        """Classify a moderator statement into one of the three categories.
+
+        Recognises the stock phrases moderators use to open a call, introduce
+        an analyst and close the call. Anything else is returned with zero
+        confidence, to be classified by ClassifyModeratorIntent instead.
+
+        Args:
+            dialogue (str): The moderator's statement to be classified
+
+        Returns:
+            dict: Same keys as the ClassifyModeratorIntent response, plus a
+                `confidence` between 0 and 1.
+        """
+        statement = re.sub(r"\s+", " ", dialogue).strip()
+
+        match = NEW_ANALYST_PATTERN.search(statement)
+        if match:
+            name = HONORIFIC_PATTERN.sub("", match.group("name").strip(" ,"))
+            company = match.group("company").strip(" ,")
+            # A dot in the company may as well have ended the sentence, as in
+            # "Team B. Please go ahead", so the LLM has the final say.
+            confident = _is_name(name, max_words=5) and "." not in company
+            return {
+                "intent": "new_analyst_start",
+                "analyst_name": name,
+                "analyst_company": company,
+                "confidence": HIGH_CONFIDENCE if confident else LOW_CONFIDENCE,
+            }
+
+        if END_PATTERN.search(statement):
+            return {"intent": "end", "confidence": HIGH_CONFIDENCE}
+
+        if OPENING_PATTERN.search(statement):
+            return {"intent": "opening", "confidence": HIGH_CONFIDENCE}
+
+        return {"intent": None, "confidence": 0.0}
+
+
+class RuleBasedCheckModerator:
+    """Find if a transcript has a moderator from its speaker labels."""
+
+    @staticmethod
+    def process(
+        transcript: Mapping[int, str], max_pages: int = DETECTION_PAGES
+    ) -> dict:
+        """Tells moderated calls from management-only ones, without an LLM.
+
+        Counts the speaker labels starting a line on the first pages, the
+        same labels the management case extractor splits speeches at. A
+        Moderator turn, or one of an alias in MODERATOR_LABELS, makes the
+        call moderated, and so does a moderator label found by the
+        moderated path's segmenter or run into the sentence before it.
+        Without one, two or more named speakers who each say something of
+        length mean the management talks on its own, as in press-release
+        style calls. Fields of a cover letter are not speakers.
+
+        Args:
+            transcript: Page number, page text pairs; only the first
+                max_pages pages are read.
+            max_pages: Number of pages looked at.
+
+        Returns:
+            dict: Same keys as the CheckModerator response, the moderator
+                being the label of the moderator's turns or "", plus a
+                `confidence` between 0 and 1.
+                A low confidence means too few people spoke to tell.
+        """
+        moderator = None
+        speeches: dict[str, int] = {}
+        pages = [
+            text for _, text in itertools.islice(transcript.items(), max_pages)
+        ]
+        for text in pages:
+            labels = list(SPEAKER_LABEL_PATTERN.finditer(text))
+            for label, next_label in zip(labels, labels[1:] + [None]):
+                speaker = label.group("speaker")
+                if speaker in MODERATOR_LABELS:
+                    moderator = moderator or speaker
+                    continue
+                end = next_label.start() if next_label else len(text)
+                speech_words = len(text[label.end() : end].split())
+                if (
+                    not LETTER_FIELD_PATTERN.match(speaker)
+                    and speech_words >= MIN_SPEECH_WORDS
+                ):
+                    speeches[speaker] = speeches.get(speaker, 0) + 1
+
+        moderator = moderator or _find_moderator(pages)
+        if moderator:
+            return {"moderator": moderator, "confidence": HIGH_CONFIDENCE}
+        if len(speeches) >= 2 and sum(speeches.values()) >= MIN_SPEECHES:
+            return {"moderator": "", "confidence": HIGH_CONFIDENCE}
+        return {"moderator": "", "confidence": LOW_CONFIDENCE}
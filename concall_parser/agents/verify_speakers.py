@@ -1,4 +1,5 @@
 from concall_parser.utils.get_groq_responses import get_groq_response
+from concall_parser.utils.instrumentation import span
 
 CONTEXT = """You are analyzing potential speaker names extracted from an earnings call transcript.
 Task: Identify which of the following candidates are plausible speaker identifiers. 
@@ -74,7 +75,8 @@ Candidates:
 Output:
 {"output":[]}
 
-Remember: Your response should ONLY be the JSON list of plausible speaker identifiers extracted from the 'Candidates' list you will provide."""# noqa: E501
+Remember: Your response should ONLY be the JSON list of plausible speaker identifiers extracted from the 'Candidates' list you will provide."""  # noqa: E501
+
 
 class VerifySpeakerNames:
     """Finds actual names from extracted speaker pattern."""
@@ -95,6 +97,7 @@ class VerifySpeakerNames:
             {"role": "user", "content": speakers},
         ]
 
-        response = get_groq_response(messages=messages, model=groq_model)
+        with span("agent.verify_speakers"):
+            response = get_groq_response(messages=messages, model=groq_model)
 
         return response
@@ -0,0 +1,169 @@
+import asyncio
+
+from concall_parser.parser import ConcallParser
+
+
+class AsyncConcallParser:
+    """Parses the conference call transcript on an asyncio event loop.
+
+    Async counterpart of ConcallParser, with the same constructor arguments.
+    The pdf is extracted in a worker thread on first use, as are the pages
+    of a lazy transcript and the segmentation of turns, and Groq is called
+    through a shared async client, so one event loop can drive many
+    documents at once. The number of Groq requests in flight is bounded by a
+    semaphore; pass the same semaphore to every parser to bound them
+    together.
+
+    Example:
+        semaphore = asyncio.Semaphore(16)
+        parsers = [
+            AsyncConcallParser(path=path, semaphore=semaphore)
+            for path in paths
+        ]
+        results = await asyncio.gather(
+            *(parser.extract_all() for parser in parsers)
+        )
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        link: str = None,
+        semaphore: asyncio.Semaphore | None = None,
+        max_concurrency: int = 8,
+        **kwargs,
+    ):
+        """Initialize AsyncConcallParser.
+
+        Args:
+            path: Path to local PDF file
+            link: URL to PDF file
+            semaphore: Bounds the Groq requests in flight, to be shared
+                between parsers. Created from max_concurrency if not given.
+            max_concurrency: Groq requests in flight when no semaphore is
+                given.
+            **kwargs: Other arguments of ConcallParser.
+        """
+        if not (path or link):
+            raise Exception(
+                "Concall source cannot be empty. Provide filepath or link to concall."  # noqa: E501
+            )
+        self._parser_kwargs = {"path": path, "link": link, **kwargs}
+        self.semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+        self._parser: ConcallParser | None = None
+        self._parser_lock = asyncio.Lock()
+        self._dialogues_task: asyncio.Task | None = None
+
+    async def get_parser(self) -> ConcallParser:
+        """Returns the underlying ConcallParser, extracting the pdf once."""
+        async with self._parser_lock:
+            if self._parser is None:
+                self._parser = await asyncio.to_thread(
+                    ConcallParser, **self._parser_kwargs
+                )
+        return self._parser
+
+    async def extract_concall_info(self) -> dict:
+        """Extracts company name and management team from the transcript.
+
+        Returns:
+            dict: Company name and management team as a dictionary.
+        """
+        parser = await self.get_parser()
+        with parser.stage("concall_info"):
+            # Pages of a lazy transcript are extracted on first access.
+            extracted_text = await asyncio.to_thread(
+                lambda: "".join(
+                    parser.transcript[page_number]
+                    for page_number in (1, 2)
+                    if page_number in parser.transcript
+                )
+            )
+            return await parser.company_and_management_extractor.aextract(
+                text=extracted_text,
+                groq_model=parser.groq_model,
+                semaphore=self.semaphore,
+            )
+
+    async def _classify_and_extract_dialogues(self) -> dict:
+        parser = await self.get_parser()
+        extractor = parser.dialogue_extractor
+        with parser.stage("dialogues"):
+            await extractor.aclassify_moderator_turns(
+                transcript=parser.transcript,
+                groq_model=parser.groq_model,
+                semaphore=self.semaphore,
+            )
+            # Every Moderator turn is classified, so the walk makes no LLM
+            # calls; it only segments, off the event loop.
+            return await asyncio.to_thread(
+                extractor.extract,
+                transcript=parser.transcript,
+                groq_model=parser.groq_model,
+            )
+
+    async def _extract_dialogues(self) -> dict:
+        """Extracts dialogue sections once, shared by concurrent callers.
+
+        A failed extraction is started again by the next caller.
+        """
+        task = self._dialogues_task
+        if task is None or (
+            task.done() and (task.cancelled() or task.exception())
+        ):
+            self._dialogues_task = asyncio.ensure_future(
+                self._classify_and_extract_dialogues()
+            )
+        return await self._dialogues_task
+
+    async def extract_commentary(self) -> list:
+        """Extracts commentary from the input."""
+        dialogues = await self._extract_dialogues()
+        return dialogues["commentary_and_future_outlook"]
+
+    async def extract_analyst_discussion(self) -> dict:
+        """Extracts analyst discussion from the input."""
+        dialogues = await self._extract_dialogues()
+        return dialogues["analyst_discussion"]
+
+    async def extract_all(self) -> dict:
+        """Extracts all information from the input, concurrently.
+
+        Calls without a moderator come out with empty "commentary" and
+        "analyst", and the speeches of each speaker under "speeches", see
+        `ConcallParser.extract_all`.
+        """
+        parser = await self.get_parser()
+        if parser.detect_moderator and not await asyncio.to_thread(
+            parser.has_moderator
+        ):
+            management, speeches = await asyncio.gather(
+                self.extract_concall_info(),
+                asyncio.to_thread(parser.handle_only_management_case),
+            )
+            return {
+                "concall_info": management,
+                "commentary": [],
+                "analyst": {},
+                "speeches": speeches,
+            }
+        management, commentary, analyst = await asyncio.gather(
+            self.extract_concall_info(),
+            self.extract_commentary(),
+            self.extract_analyst_discussion(),
+        )
+        return {
+            "concall_info": management,
+            "commentary": commentary,
+            "analyst": analyst,
+        }
+
+    async def get_metrics(self) -> dict:
+        """Returns time spent per stage and LLM usage, see ConcallParser."""
+        parser = await self.get_parser()
+        return parser.get_metrics()
+
+    async def get_classification_stats(self) -> dict:
+        """Returns moderator statements classified by rules and by Groq."""
+        parser = await self.get_parser()
+        return parser.get_classification_stats()
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from concall_parser.log_config import logger
+from concall_parser.parser import ConcallParser
+from concall_parser.utils.disk_store import write_atomic
+
+
+def is_link(source: str) -> bool:
+    """Returns whether a source is a link rather than a local path."""
+    return source.startswith(("http://", "https://"))
+
+
+def collect_sources(input_path: str) -> list[str]:
+    """Lists the documents to parse from a directory or a manifest.
+
+    Args:
+        input_path: Directory whose pdf files are parsed, or a manifest file
+            with one path or link per line. Blank lines and lines starting
+            with # are skipped; relative paths are relative to the manifest.
+
+    Returns:
+        list: Paths and links of the documents, in a stable order.
+    """
+    if os.path.isdir(input_path):
+        return sorted(
+            os.path.join(input_path, name)
+            for name in os.listdir(input_path)
+            if name.lower().endswith(".pdf")
+        )
+
+    base_dir = os.path.dirname(input_path)
+    sources = []
+    with open(input_path) as file:
+        for line in file:
+            source = line.strip()
+            if not source or source.startswith("#"):
+                continue
+            if not is_link(source) and not os.path.isabs(source):
+                source = os.path.join(base_dir, source)
+            sources.append(source)
+    return sources
+
+
+def document_id(source: str) -> str:
+    """Returns a file name safe id for a source, unique per source."""
+    name = os.path.basename(source.split("?")[0].rstrip("/")) or "document"
+    stem = os.path.splitext(name)[0]
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+    return f"{stem}-{digest}"
+
+
+def write_json_atomic(path: str, data) -> None:
+    """Writes json to path so that readers never see a partial file."""
+    write_atomic(
+        path,
+        lambda file: json.dump(data, file, indent=4),
+        mode="w",
+        fsync=True,
+    )
+
+
+class Checkpoint:
+    """Durable record of which documents of a batch are done or failed.
+
+    Each finished document appends one json line and the file is synced, so
+    an interrupted run loses at most the documents in flight. The latest
+    line for a source wins.
+    """
+
+    def __init__(self, path: str):
+        """Initialize Checkpoint, loading records of earlier runs.
+
+        Args:
+            path: Path of the checkpoint file, created if missing.
+        """
+        self.path = path
+        self.records: dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash mid-write.
+                        continue
+                    self.records[record["source"]] = record
+
+    def status(self, source: str) -> str | None:
+        """Returns "done" or "failed" for a finished source, else None."""
+        record = self.records.get(source)
+        return record["status"] if record else None
+
+    def add(self, record: dict) -> None:
+        """Appends the record of a finished document and syncs it to disk."""
+        self.records[record["source"]] = record
+        with open(self.path, "a") as file:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def process_document(
+    source: str, output_dir: str, parser_kwargs: dict | None = None
+) -> dict:
+    """Parses one document and writes its result, in a worker process.
+
+    Args:
+        source: Path or link of the document.
+        output_dir: Directory the result json is written to.
+        parser_kwargs: Keyword arguments passed to ConcallParser.
+
+    Returns:
+        dict: Checkpoint record with the source, status, output path,
+            seconds taken and, for failures, the error.
+    """
+    start = time.perf_counter()
+    record = {"source": source}
+    try:
+        location = {"link": source} if is_link(source) else {"path": source}
+        parser = ConcallParser(**location, **(parser_kwargs or {}))
+        # Download and extraction errors are logged, leaving no transcript.
+        if not parser.transcript:
+            raise ValueError("No text could be extracted from the document")
+        result = parser.extract_all()
+        output_path = os.path.join(output_dir, document_id(source) + ".json")
+        write_json_atomic(output_path, {"source": source, **result})
+        record.update(status="done", output=output_path)
+    except Exception as exc:
+        logger.exception("Could not parse %s", source)
+        record.update(
+            status="failed",
+            error=f"{type(exc).__name__}: {exc}",
+            traceback=traceback.format_exc(),
+        )
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def run_batch(
+    sources: list[str],
+    output_dir: str,
+    checkpoint_path: str | None = None,
+    workers: int = 1,
+    retry_failed: bool = False,
+    parser_kwargs: dict | None = None,
+) -> dict:
+    """Parses many documents, resuming from the checkpoint of earlier runs.
+
+    Documents already done are skipped, and so are documents that failed
+    unless retry_failed is set.
+
+    Args:
+        sources: Paths and links of the documents.
+        output_dir: Directory the result of each document is written to.
+        checkpoint_path: Path of the checkpoint file, by default
+            checkpoint.jsonl in output_dir.
+        workers: Number of processes parsing documents in parallel.
+        retry_failed: Whether to parse documents that failed before again.
+        parser_kwargs: Keyword arguments passed to ConcallParser.
+
+    Returns:
+        dict: Counts of documents done, failed and skipped in this run,
+            elapsed seconds, documents per minute and the failures.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    checkpoint = Checkpoint(
+        checkpoint_path or os.path.join(output_dir, "checkpoint.jsonl")
+    )
+    pending = []
+    for source in dict.fromkeys(sources):
+        status = checkpoint.status(source)
+        if status == "done" or (status == "failed" and not retry_failed):
+            continue
+        pending.append(source)
+    logger.info(
+        "Parsing %d documents, skipping %d",
+        len(pending),
+        len(sources) - len(pending),
+    )
+
+    start = time.perf_counter()
+    records = []
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    process_document, source, output_dir, parser_kwargs
+                )
+                for source in pending
+            ]
+            for future in as_completed(futures):
+                records.append(future.result())
+                checkpoint.add(records[-1])
+    else:
+        for source in pending:
+            records.append(process_document(source, output_dir, parser_kwargs))
+            checkpoint.add(records[-1])
+    elapsed = time.perf_counter() - start
+
+    done = [record for record in records if record["status"] == "done"]
+    failures = [
+        {"source": record["source"], "error": record["error"]}
+        for record in records
+        if record["status"] == "failed"
+    ]
+    return {
+        "done": len(done),
+        "failed": len(failures),
+        "skipped": len(sources) - len(pending),
+        "seconds": round(elapsed, 3),
+        "docs_per_minute": len(done) / elapsed * 60 if elapsed else 0.0,
+        "failures": failures,
+    }
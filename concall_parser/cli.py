@@ -0,0 +1,168 @@
+"""Command line interface of concall-parser.
+
+Usage:
+    concall-parser batch INPUT --output DIR [--workers N] [--retry-failed]
+    concall-parser cache info
+    concall-parser cache list
+    concall-parser cache purge [--older-than DAYS]
+"""
+
+import argparse
+import os
+import time
+
+from concall_parser.config import get_transcript_cache_dir
+from concall_parser.utils.transcript_cache import TranscriptCache
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def cache_info(args: argparse.Namespace) -> None:
+    """Prints the location, number and size of cached transcripts."""
+    cache = TranscriptCache(args.cache_dir)
+    stats = cache.stats()
+    print(f"directory: {cache.directory}")
+    print(f"transcripts: {stats['entries']}")
+    print(f"size: {_format_bytes(stats['bytes'])}")
+
+
+def cache_list(args: argparse.Namespace) -> None:
+    """Prints every cached transcript, least recently used first."""
+    cache = TranscriptCache(args.cache_dir)
+    for entry in cache.entries():
+        last_access = time.strftime(
+            "%Y-%m-%d %H:%M", time.localtime(entry["last_access"])
+        )
+        print(
+            f"{entry['key']}  {_format_bytes(entry['bytes']):>9}  {last_access}"
+        )
+
+
+def cache_purge(args: argparse.Namespace) -> None:
+    """Removes cached transcripts, optionally only the stale ones."""
+    cache = TranscriptCache(args.cache_dir)
+    older_than = None
+    if args.older_than is not None:
+        older_than = args.older_than * 24 * 60 * 60
+    removed = cache.purge(older_than=older_than)
+    print(f"removed {removed} cached transcripts")
+
+
+def batch(args: argparse.Namespace) -> None:
+    """Parses a directory or manifest of documents and prints a summary."""
+    # Imported here so that cache commands work without a Groq API key.
+    from concall_parser.batch import collect_sources, run_batch
+
+    parser_kwargs = {"pdf_backend": args.pdf_backend}
+    if args.groq_model:
+        parser_kwargs["groq_model"] = args.groq_model
+    if args.transcript_cache:
+        parser_kwargs["transcript_cache_dir"] = args.cache_dir
+    if args.llm_cache:
+        parser_kwargs["llm_cache_path"] = args.llm_cache
+
+    sources = collect_sources(args.input)
+    summary = run_batch(
+        sources,
+        output_dir=args.output,
+        checkpoint_path=args.checkpoint,
+        workers=args.workers,
+        retry_failed=args.retry_failed,
+        parser_kwargs=parser_kwargs,
+    )
+
+    print(
+        f"done {summary['done']}, failed {summary['failed']}, "
+        f"skipped {summary['skipped']} in {summary['seconds']:.1f}s "
+        f"({summary['docs_per_minute']:.1f} docs/min)"
+    )
+    for failure in summary["failures"]:
+        print(f"FAILED {failure['source']}: {failure['error']}")
+    if summary["failures"]:
+        print("Run again with --retry-failed to parse failed documents again.")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Returns the argument parser of the command line interface."""
+    parser = argparse.ArgumentParser(prog="concall-parser")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch_parser = commands.add_parser(
+        "batch", help="parse many documents, resuming interrupted runs"
+    )
+    batch_parser.add_argument(
+        "input", help="directory of pdfs, or manifest of paths and links"
+    )
+    batch_parser.add_argument(
+        "--output", required=True, help="directory for per-document results"
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1
+    )
+    batch_parser.add_argument(
+        "--checkpoint",
+        help="checkpoint file, checkpoint.jsonl in the output by default",
+    )
+    batch_parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="parse documents that failed in earlier runs again",
+    )
+    batch_parser.add_argument("--groq-model")
+    batch_parser.add_argument(
+        "--pdf-backend",
+        default="pdfplumber",
+        choices=["pdfplumber", "pdfium", "auto"],
+    )
+    batch_parser.add_argument(
+        "--transcript-cache",
+        action="store_true",
+        help="reuse transcripts from the transcript cache",
+    )
+    batch_parser.add_argument(
+        "--cache-dir",
+        default=get_transcript_cache_dir(),
+        help="transcript cache directory (env CONCALL_TRANSCRIPT_CACHE_DIR)",
+    )
+    batch_parser.add_argument("--llm-cache", help="path of the LLM cache")
+    batch_parser.set_defaults(func=batch)
+
+    cache = commands.add_parser("cache", help="inspect the transcript cache")
+    cache.add_argument(
+        "--cache-dir",
+        default=get_transcript_cache_dir(),
+        help="transcript cache directory (env CONCALL_TRANSCRIPT_CACHE_DIR)",
+    )
+    cache_commands = cache.add_subparsers(dest="cache_command", required=True)
+    cache_commands.add_parser(
+        "info", help="show size of the cache"
+    ).set_defaults(func=cache_info)
+    cache_commands.add_parser(
+        "list", help="list cached transcripts"
+    ).set_defaults(func=cache_list)
+    purge = cache_commands.add_parser("purge", help="remove cached transcripts")
+    purge.add_argument(
+        "--older-than",
+        type=float,
+        metavar="DAYS",
+        help="only remove transcripts not used for this many days",
+    )
+    purge.set_defaults(func=cache_purge)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Entry point of the concall-parser command."""
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
+import functools
 import os
 
-from dotenv import load_dotenv
+DEFAULT_GROQ_MODEL = "llama3-70b-8192"
+DEFAULT_TRANSCRIPT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "concall_parser", "transcripts"
+)
 
-load_dotenv()
 
-DEFAULT_GROQ_MODEL = "llama3-70b-8192"
+@functools.cache
+def load_environment() -> None:
+    """Loads variables from a .env file into the environment, once.
+
+    Deferred to the first setting read rather than done at import, so that
+    importing the package stays cheap.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 
 def get_groq_api_key() -> str:
@@ -15,6 +27,7 @@ def get_groq_api_key() -> str:
     Returns:
         str: The Groq API key.
     """
+    load_environment()
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise OSError(
@@ -33,8 +46,42 @@ def get_groq_model() -> str:
     Returns:
         str: The Groq model name.
     """
+    load_environment()
     model = os.getenv("GROQ_MODEL")
     if not model:
         print(f"⚠️  GROQ_MODEL not set. Using default: {DEFAULT_GROQ_MODEL}")
         return DEFAULT_GROQ_MODEL
     return model
+
+
+def get_transcript_cache_dir() -> str:
+    """Get the transcript cache directory from CONCALL_TRANSCRIPT_CACHE_DIR.
+
+    Returns:
+        str: The directory, ~/.cache/concall_parser/transcripts if unset.
+    """
+    load_environment()
+    return os.getenv(
+        "CONCALL_TRANSCRIPT_CACHE_DIR", DEFAULT_TRANSCRIPT_CACHE_DIR
+    )
+
+
+def get_llm_base_url() -> str | None:
+    """Get the url of an OpenAI-compatible server from LLM_BASE_URL.
+
+    Returns:
+        str: The base url, or None if LLM_BASE_URL is not set, in which case
+            Groq is used.
+    """
+    load_environment()
+    return os.getenv("LLM_BASE_URL") or None
+
+
+def get_llm_api_key() -> str | None:
+    """Get the key of the OpenAI-compatible server from LLM_API_KEY.
+
+    Returns:
+        str: The key, or None if the server needs none.
+    """
+    load_environment()
+    return os.getenv("LLM_API_KEY") or None
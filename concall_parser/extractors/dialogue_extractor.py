@@ -1,104 +1,404 @@
-import json
-import re
+import contextvars
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
 
 from concall_parser.agents.classify import ClassifyModeratorIntent
+from concall_parser.agents.moderator_rules import (
+    MODERATOR_LABELS,
+    RuleBasedModeratorIntent,
+)
 from concall_parser.log_config import logger
 from concall_parser.utils.cleaner import clean_text
+from concall_parser.utils.speaker_segmenter import (
+    NON_SPACE,
+    SpeakerTurn,
+    iter_transcript_turns,
+)
+from concall_parser.utils.transcript_buffer import TranscriptBuffer
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+class DialogueTurn:
+    """A speaker's turn in the output, as offsets into the transcript buffer.
+
+    The text is only sliced, cleaned and joined when `to_dict` is called, so
+    building the output copies no text.
+    """
+
+    __slots__ = ("buffer", "turn")
+
+    def __init__(self, buffer: TranscriptBuffer, turn: SpeakerTurn):
+        """Initialize DialogueTurn.
+
+        Args:
+            buffer: Buffer the offsets of the turn point into.
+            turn: The turn, with offsets into buffer.
+        """
+        self.buffer = buffer
+        self.turn = turn
+
+    @property
+    def speaker(self) -> str:
+        """Speaker label of the turn."""
+        return self.turn.speaker
+
+    @property
+    def page_range(self) -> tuple[int, int]:
+        """Numbers of the first and last page the turn is on."""
+        turn = self.turn
+        return (
+            self.buffer.page_number_at(turn.start),
+            self.buffer.page_number_at(max(turn.start, turn.end - 1)),
+        )
+
+    @property
+    def text(self) -> str:
+        """The cleaned speech, each page's part cleaned on its own."""
+        turn = self.turn
+        parts = self.buffer.iter_parts(
+            turn.dialogue_start, turn.end, self.buffer.page_index(turn.start)
+        )
+        return " ".join(
+            [
+                clean_text(next(parts)),
+                *(clean_text(part) for part in parts if NON_SPACE.search(part)),
+            ]
+        )
+
+    def to_dict(self) -> dict:
+        """Returns the turn as a speaker, dialogue pair."""
+        return {"speaker": self.speaker, "dialogue": self.text}
 
 
 class DialogueExtractor:
     """Extracts dialogue from the input."""
 
-    def __init__(self):
-        self.speaker_pattern = re.compile(
-            r"(?P<speaker>[A-Za-z\s]+):\s*(?P<dialogue>(?:.*(?:\n(?![A-Za-z\s]+:).*)*)*)",
-            re.MULTILINE,
-        )
-        self.dialogues = {
+    def __init__(
+        self,
+        max_workers: int = 1,
+        min_rule_confidence: float | None = None,
+        batch_classification: bool = False,
+    ):
+        """Initialize DialogueExtractor.
+
+        Args:
+            max_workers: Number of moderator statements classified at once.
+                With more than one worker, every Moderator turn in the
+                transcript is classified up front, before sections are built.
+            min_rule_confidence: Moderator statements classified by the
+                rule-based fast path with at least this confidence skip the
+                LLM. None, the default, sends every statement to the LLM.
+            batch_classification: Whether to classify every Moderator turn up
+                front, packing many statements into each LLM request.
+        """
+        self.max_workers = max_workers
+        self.min_rule_confidence = min_rule_confidence
+        self.batch_classification = batch_classification
+        self.classification_stats = {"rule_based": 0, "llm": 0}
+        self._stats_lock = threading.Lock()
+        self._reset_sections()
+        self._transcript = None
+        self._reset_document()
+
+    def _reset_document(self) -> None:
+        """Forgets the segmentation and classifications of the transcript."""
+        self.position = 0
+        self.buffer = TranscriptBuffer()
+        self.turns: list[SpeakerTurn] = []
+        self._segmenter = None
+        self.moderator_intents: dict[int, dict] = {}
+
+    def _use_transcript(self, transcript: dict[int, str]) -> None:
+        """Starts over if transcript is not the one walked so far.
+
+        Turns and intents are kept by their offsets into the transcript, so
+        they are only reused for the same transcript object.
+        """
+        if transcript is not self._transcript:
+            self._transcript = transcript
+            self._reset_sections()
+            self._reset_document()
+
+    def _reset_sections(self) -> None:
+        self.sections = {
             "commentary_and_future_outlook": [],
             "analyst_discussion": {},
             "end": [],
         }
-        self.page_number = 0
+        self._dialogues = None
 
-    def _handle_leftover_text(
-        self, text: str, last_speaker: str, current_analyst: str | None
-    ):
-        first_speaker_match = self.speaker_pattern.search(text)
-        if first_speaker_match:
-            leftover_text = text[: first_speaker_match.start()].strip()
-        else:
-            leftover_text = text.strip()
+    @property
+    def dialogues(self) -> dict:
+        """The extracted sections, with each turn as a speaker, dialogue dict.
 
-        if not leftover_text or last_speaker == "Moderator":
-            return
+        Built from `sections` the first time it is read after they changed,
+        so the text of a turn is cleaned once, however many pages it spans.
+        """
+        if self._dialogues is None:
+            sections = self.sections
+            self._dialogues = {
+                "commentary_and_future_outlook": [
+                    turn.to_dict()
+                    for turn in sections["commentary_and_future_outlook"]
+                ],
+                "analyst_discussion": {
+                    analyst: {
+                        "analyst_company": discussion["analyst_company"],
+                        "dialogue": [
+                            turn.to_dict() for turn in discussion["dialogue"]
+                        ],
+                    }
+                    for analyst, discussion in sections[
+                        "analyst_discussion"
+                    ].items()
+                },
+                "end": [turn.to_dict() for turn in sections["end"]],
+            }
+        return self._dialogues
 
-        cleaned = clean_text(leftover_text)
+    def _iter_turns(
+        self, transcript: dict[int, str], start: int = 0
+    ) -> Iterator[tuple[int, SpeakerTurn]]:
+        """Yields index and turn of every speaker turn from the start-th on.
 
-        if current_analyst:
-            self.dialogues["analyst_discussion"][current_analyst]["dialogue"][
-                -1
-            ]["dialogue"] += f" {cleaned}"
-        elif self.dialogues["commentary_and_future_outlook"]:
-            self.dialogues["commentary_and_future_outlook"][-1]["dialogue"] += (
-                f" {cleaned}"
-            )
+        The transcript is segmented once, as far as walks have reached, and
+        its turns are kept for the walks after.
+        """
+        if self._segmenter is None:
+            self._segmenter = iter_transcript_turns(transcript, self.buffer)
+        index = start
+        while index < len(self.turns) or self._segment_next():
+            yield index, self.turns[index]
+            index += 1
 
-    def _append_dialogue(
-        self,
-        speaker: str,
-        dialogue: str,
-        intent: str,
-        current_analyst: str | None,
-    ):
-        cleaned = clean_text(dialogue)
-        if intent == "opening":
-            self.dialogues["commentary_and_future_outlook"].append(
-                {
-                    "speaker": speaker,
-                    "dialogue": cleaned,
-                }
+    def _segment_next(self) -> bool:
+        """Segments the next turn, returns False at the end of the transcript."""
+        try:
+            turn = next(self._segmenter, None)
+        except BaseException:
+            # A finished segmenter would end every later walk early, at the
+            # page that failed; the next walk segments from the start.
+            self.buffer = TranscriptBuffer()
+            self.turns = []
+            self._segmenter = None
+            raise
+        if turn is None:
+            return False
+        self.turns.append(turn)
+        return True
+
+    def _statement(self, turn: SpeakerTurn) -> str:
+        """Returns what a Moderator said on the page of the turn's label."""
+        return next(
+            self.buffer.iter_parts(
+                turn.dialogue_start,
+                turn.end,
+                self.buffer.page_index(turn.start),
             )
-        elif intent == "new_analyst_start" and current_analyst:
-            self.dialogues["analyst_discussion"][current_analyst][
-                "dialogue"
-            ].append(
-                {
-                    "speaker": speaker,
-                    "dialogue": cleaned,
-                }
+        )
+
+    def _classify_by_rules(self, dialogue: str) -> dict | None:
+        """Returns the rule-based classification if it is confident enough."""
+        if self.min_rule_confidence is None:
+            return None
+        response = RuleBasedModeratorIntent.process(dialogue=dialogue)
+        if response["confidence"] < self.min_rule_confidence:
+            return None
+        self._count_classification("rule_based")
+        return response
+
+    def _classify(self, dialogue: str, groq_model: str) -> dict:
+        """Classifies a moderator statement, by rules first, then by LLM.
+
+        Raises:
+            ClassificationError: If the LLM request fails and the rules do
+                not recognise the statement.
+        """
+        response = self._classify_by_rules(dialogue)
+        if response is not None:
+            return response
+
+        self._count_classification("llm")
+        return ClassifyModeratorIntent.parse_response(
+            ClassifyModeratorIntent.process(
+                dialogue=dialogue, groq_model=groq_model
+            ),
+            dialogue,
+        )
+
+    def _count_classification(self, source: str, count: int = 1) -> None:
+        with self._stats_lock:
+            self.classification_stats[source] += count
+
+    def _classify_batches(
+        self, pending: list[tuple[int, str]], groq_model: str
+    ) -> None:
+        """Classifies statements in batches, many per LLM request."""
+        to_classify = []
+        for key, dialogue in pending:
+            response = self._classify_by_rules(dialogue)
+            if response is not None:
+                self.moderator_intents[key] = response
+            else:
+                to_classify.append((key, dialogue))
+
+        dialogues = [dialogue for _, dialogue in to_classify]
+        batches = ClassifyModeratorIntent.make_batches(dialogues, groq_model)
+        logger.info(
+            "Classifying %d moderator statements in %d batches",
+            len(dialogues),
+            len(batches),
+        )
+        self._count_classification("llm", len(dialogues))
+        context = contextvars.copy_context()
+
+        def classify_batch(batch: list[int]) -> list[dict]:
+            return context.copy().run(
+                ClassifyModeratorIntent.process_batch,
+                [dialogues[index] for index in batch],
+                groq_model,
             )
-        elif intent == "end":
-            self.dialogues["end"].append(
-                {
-                    "speaker": speaker,
-                    "dialogue": cleaned,
-                }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            responses = executor.map(classify_batch, batches)
+            for batch, batch_responses in zip(batches, responses):
+                for index, response in zip(batch, batch_responses):
+                    self.moderator_intents[to_classify[index][0]] = response
+
+    def _get_moderator_intent(self, turn: SpeakerTurn, groq_model: str) -> dict:
+        """Returns the intent of a Moderator turn, classifying it once."""
+        if turn.start not in self.moderator_intents:
+            self.moderator_intents[turn.start] = self._classify(
+                self._statement(turn), groq_model
             )
+        return self.moderator_intents[turn.start]
 
-    def _process_match(
-        self, match, groq_model: str, current_analyst: str | None
-    ):
-        speaker = match.group("speaker").strip()
-        dialogue = match.group("dialogue")
-        intent = None
+    def _pending_moderator_turns(
+        self, transcript: dict[int, str]
+    ) -> list[tuple[int, str]]:
+        """Returns key and statement of every Moderator turn not classified."""
+        return [
+            (turn.start, self._statement(turn))
+            for _, turn in self._iter_turns(transcript)
+            if turn.speaker in MODERATOR_LABELS
+            and turn.start not in self.moderator_intents
+        ]
+
+    def classify_moderator_turns(
+        self, transcript: dict[int, str], groq_model: str
+    ) -> None:
+        """Classifies every Moderator turn of the transcript concurrently.
+
+        The whole transcript is segmented first, then all Moderator statements
+        go to the classifier through a pool of `max_workers` threads, one
+        statement or, with batch_classification, one batch per request.
+        Results are stored by the offset of the turn and read back in
+        transcript order while sections are built.
+
+        Args:
+            transcript (dict[int, str]): The transcript to classify.
+            groq_model (str): The model to use for groq.
+        """
+        self._use_transcript(transcript)
+        pending = self._pending_moderator_turns(transcript)
+        if not pending:
+            return
+        if self.batch_classification:
+            self._classify_batches(pending, groq_model)
+            return
+
+        logger.info(
+            "Classifying %d moderator statements with %d workers",
+            len(pending),
+            self.max_workers,
+        )
+        # Worker threads do not inherit the caller's context, which holds
+        # the instrumentation and LLM settings of the parse; each task runs
+        # in a copy of it.
+        context = contextvars.copy_context()
+
+        def classify(item: tuple[int, str]) -> dict:
+            return context.copy().run(self._classify, item[1], groq_model)
 
-        if speaker == "Moderator":
-            response = json.loads(
-                ClassifyModeratorIntent.process(
-                    dialogue=dialogue, groq_model=groq_model
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            responses = executor.map(classify, pending)
+            for (key, _), response in zip(pending, responses):
+                self.moderator_intents[key] = response
+
+    async def aclassify_moderator_turns(
+        self,
+        transcript: dict[int, str],
+        groq_model: str,
+        semaphore: "asyncio.Semaphore | None" = None,
+    ) -> None:
+        """Classifies every Moderator turn of the transcript on the event loop.
+
+        Async counterpart of `classify_moderator_turns`: statements the rules
+        cannot classify are all sent at once, as many in flight as the
+        semaphore allows. A walk over the transcript afterwards, e.g.
+        `extract`, finds every intent already classified.
+
+        Args:
+            transcript (dict[int, str]): The transcript to classify.
+            groq_model (str): The model to use for groq.
+            semaphore (asyncio.Semaphore): Bounds concurrent Groq requests.
+        """
+
+        async def classify(key: int, dialogue: str) -> None:
+            response = self._classify_by_rules(dialogue)
+            if response is None:
+                self._count_classification("llm")
+                response = ClassifyModeratorIntent.parse_response(
+                    await ClassifyModeratorIntent.aprocess(
+                        dialogue=dialogue,
+                        groq_model=groq_model,
+                        semaphore=semaphore,
+                    ),
+                    dialogue,
                 )
-            )
-            intent = response["intent"]
-            if intent == "new_analyst_start":
-                current_analyst = response["analyst_name"]
-                self.dialogues["analyst_discussion"][current_analyst] = {
-                    "analyst_company": response["analyst_company"],
-                    "dialogue": [],
-                }
-            return intent, current_analyst, None  # Moderator handled
+            self.moderator_intents[key] = response
 
-        return intent, current_analyst, (speaker, dialogue)
+        import asyncio
+
+        self._use_transcript(transcript)
+        # Segmenting, and extracting the pages of a lazy transcript, is
+        # blocking work kept off the event loop.
+        pending = await asyncio.to_thread(
+            self._pending_moderator_turns, transcript
+        )
+        await asyncio.gather(
+            *(classify(key, dialogue) for key, dialogue in pending)
+        )
+
+    def _add_analyst(self, response: dict) -> str:
+        """Starts the discussion of the analyst a Moderator introduced."""
+        analyst = response["analyst_name"]
+        self.sections["analyst_discussion"][analyst] = {
+            "analyst_company": response["analyst_company"],
+            "dialogue": [],
+        }
+        self._dialogues = None
+        return analyst
+
+    def _append_dialogue(
+        self, turn: SpeakerTurn, intent: str, current_analyst: str | None
+    ):
+        if intent == "opening":
+            section = self.sections["commentary_and_future_outlook"]
+        elif intent == "new_analyst_start" and current_analyst:
+            section = self.sections["analyst_discussion"][current_analyst][
+                "dialogue"
+            ]
+        elif intent == "end":
+            section = self.sections["end"]
+        else:
+            return
+        section.append(DialogueTurn(self.buffer, turn))
+        self._dialogues = None
 
     def extract_commentary_and_future_outlook(
         self, transcript: dict[int, str], groq_model: str
@@ -113,44 +413,83 @@ class DialogueExtractor:
             dict: The extracted commentary and future outlook.
         """
         logger.info("Extracting commentary...")
-        last_speaker = None
+        self._use_transcript(transcript)
         intent = None
-        current_analyst = None
 
-        for page_number, text in transcript.items():
-            self.page_number = page_number
-
-            if last_speaker:
-                self._handle_leftover_text(text, last_speaker, current_analyst)
-
-            for match in self.speaker_pattern.finditer(text):
-                speaker = match.group("speaker").strip()
-                last_speaker = speaker
-
-                if speaker == "Moderator":
-                    response = json.loads(
-                        ClassifyModeratorIntent.process(
-                            dialogue=match.group("dialogue"),
-                            groq_model=groq_model,
-                        )
-                    )
-                    intent = response["intent"]
-                    if intent == "new_analyst_start":
-                        return self.dialogues["commentary_and_future_outlook"]
-                    continue
-
-                if intent == "opening":
-                    self._append_dialogue(
-                        speaker,
-                        match.group("dialogue"),
-                        intent,
-                        current_analyst,
-                    )
-                else:
+        if self.max_workers > 1 or self.batch_classification:
+            self.classify_moderator_turns(transcript, groq_model)
+
+        for index, turn in self._iter_turns(transcript):
+            # Where extract_dialogues picks up from.
+            self.position = index
+
+            if turn.speaker in MODERATOR_LABELS:
+                response = self._get_moderator_intent(turn, groq_model)
+                intent = response["intent"]
+                if intent == "new_analyst_start":
                     return self.dialogues["commentary_and_future_outlook"]
+                continue
 
+            if intent == "opening":
+                self._append_dialogue(turn, intent, None)
+            else:
+                return self.dialogues["commentary_and_future_outlook"]
+
+        self.position = len(self.turns)
         return self.dialogues["commentary_and_future_outlook"]
 
+    def iter_dialogue_pages(
+        self, transcript_dict: dict[int, str], groq_model: str
+    ) -> Iterator[str | None]:
+        """Extracts dialogues turn by turn, pausing after each page.
+
+        The walk starts where `extract_commentary_and_future_outlook` stopped,
+        or at the first turn. Pages are only read from the transcript as the
+        walk reaches them, one page ahead to see where the last turn of a
+        page ends, so a caller can stop early, e.g. once the commentary is
+        complete, and resume later with the same generator.
+
+        Args:
+            transcript_dict (dict[int, str]): The transcript to extract from.
+            groq_model (str): The model to use for groq.
+
+        Yields:
+            str | None: Intent of the last Moderator statement seen so far.
+        """
+        self._use_transcript(transcript_dict)
+        intent = None
+        current_analyst = None
+        page_number = None
+        skipped_page = None
+
+        if self.max_workers > 1 or self.batch_classification:
+            self.classify_moderator_turns(transcript_dict, groq_model)
+
+        for _, turn in self._iter_turns(transcript_dict, self.position):
+            turn_page = self.buffer.page_number_at(turn.start)
+            if page_number is not None and turn_page != page_number:
+                yield intent
+            page_number = turn_page
+            if turn_page == skipped_page:
+                continue
+
+            if turn.speaker in MODERATOR_LABELS:
+                response = self._get_moderator_intent(turn, groq_model)
+                intent = response["intent"]
+                if intent == "new_analyst_start":
+                    current_analyst = self._add_analyst(response)
+                continue
+
+            if intent is None:
+                # Speakers before the first Moderator statement are not part
+                # of the call, nor is anything else on their page.
+                skipped_page = turn_page
+                continue
+
+            self._append_dialogue(turn, intent, current_analyst)
+
+        yield intent
+
     def extract_dialogues(
         self, transcript_dict: dict[int, str], groq_model: str
     ) -> dict:
@@ -164,44 +503,50 @@ class DialogueExtractor:
             dict: The extracted dialogues.
         """
         logger.info("Extracting dialogues...")
-        intent = None
-        last_speaker = None
-        current_analyst = None
+        for _ in self.iter_dialogue_pages(transcript_dict, groq_model):
+            pass
+        return self.dialogues
 
-        for page_number, text in transcript_dict.items():
-            if page_number < self.page_number - 1:
-                continue
+    def iter_extract(
+        self, transcript: dict[int, str], groq_model: str
+    ) -> Iterator[str | None]:
+        """Extracts all dialogue sections in a single walk over the transcript.
 
-            if last_speaker:
-                self._handle_leftover_text(text, last_speaker, current_analyst)
-
-            for match in self.speaker_pattern.finditer(text):
-                speaker = match.group("speaker").strip()
-                last_speaker = speaker
-
-                if speaker == "Moderator":
-                    response = json.loads(
-                        ClassifyModeratorIntent.process(
-                            dialogue=match.group("dialogue"),
-                            groq_model=groq_model,
-                        )
-                    )
-                    intent = response["intent"]
-                    if intent == "new_analyst_start":
-                        current_analyst = response["analyst_name"]
-                        self.dialogues["analyst_discussion"][
-                            current_analyst
-                        ] = {
-                            "analyst_company": response["analyst_company"],
-                            "dialogue": [],
-                        }
-                    continue
-
-                if intent is None:
-                    break
-
-                self._append_dialogue(
-                    speaker, match.group("dialogue"), intent, current_analyst
-                )
+        Commentary, analyst discussion and closing remarks are built into
+        `self.dialogues` from the same pass, so the transcript is segmented
+        and each Moderator statement is classified exactly once. The walk pauses
+        after every page, see `iter_dialogue_pages`.
 
+        Args:
+            transcript (dict[int, str]): The transcript to extract from.
+            groq_model (str): The model to use for groq.
+
+        Yields:
+            str | None: Intent of the last Moderator statement seen so far.
+        """
+        logger.info("Extracting dialogues...")
+        self._use_transcript(transcript)
+        self._reset_sections()
+        self.position = 0
+        yield from self.iter_dialogue_pages(transcript, groq_model)
+        logger.info(
+            "Classified %d moderator statements by rules and %d by LLM, "
+            "saving %d LLM calls",
+            self.classification_stats["rule_based"],
+            self.classification_stats["llm"],
+            self.classification_stats["rule_based"],
+        )
+
+    def extract(self, transcript: dict[int, str], groq_model: str) -> dict:
+        """Extracts all dialogue sections in a single walk over the transcript.
+
+        Args:
+            transcript (dict[int, str]): The transcript to extract from.
+            groq_model (str): The model to use for groq.
+
+        Returns:
+            dict: The extracted dialogues, keyed by section.
+        """
+        for _ in self.iter_extract(transcript, groq_model):
+            pass
         return self.dialogues
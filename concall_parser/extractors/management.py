@@ -1,20 +1,86 @@
 import json
+from typing import TYPE_CHECKING
 
-from concall_parser.agents.extraction import ExtractManagement
+from concall_parser.agents.extraction import CONTEXT, ExtractManagement
 from concall_parser.base_parser import BaseExtractor
 from concall_parser.log_config import logger
+from concall_parser.utils.get_groq_responses import SAMPLING_PARAMS
+from concall_parser.utils.tokens import get_prompt_budget, split_into_chunks
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Longer management text is split into chunks, since smaller prompts come
+# back faster and the team rarely spans more than a page.
+MAX_CHUNK_TOKENS = 3000
+
+
+def merge_management_results(results: list[dict]) -> dict:
+    """Merges management extracted from chunks of the same text.
+
+    The first company name found is kept, and every person in the order they
+    were first found, with the designation given there.
+    """
+    merged = {}
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for key, value in result.items():
+            if key not in merged or (key == "company_name" and not merged[key]):
+                merged[key] = value
+    return merged
 
 
 class CompanyAndManagementExtractor(BaseExtractor):
     """Extracts management team from the input."""
 
+    @staticmethod
+    def _chunk(text: str, groq_model: str) -> list[str]:
+        """Splits text into chunks that fit one request to the model."""
+        budget = min(
+            MAX_CHUNK_TOKENS,
+            get_prompt_budget(
+                groq_model, CONTEXT, SAMPLING_PARAMS["max_tokens"]
+            ),
+        )
+        chunks = split_into_chunks(text, budget)
+        if len(chunks) > 1:
+            logger.info("Extracting management from %d chunks", len(chunks))
+        return chunks
+
     def extract(self, text: str, groq_model: str) -> dict:
         """Extracts management team from the input."""
-        try:
-            response = ExtractManagement.process(
-                page_text=text, groq_model=groq_model
-            )
-            return json.loads(response)
-        except Exception:
-            logger.exception("Failed to extract management team.")
-            return {}
+        results = []
+        for chunk in self._chunk(text, groq_model):
+            try:
+                response = ExtractManagement.process(
+                    page_text=chunk, groq_model=groq_model
+                )
+                results.append(json.loads(response))
+            except Exception:
+                logger.exception("Failed to extract management team.")
+        return merge_management_results(results)
+
+    async def aextract(
+        self,
+        text: str,
+        groq_model: str,
+        semaphore: "asyncio.Semaphore | None" = None,
+    ) -> dict:
+        """Async counterpart of `extract`, with chunks sent concurrently."""
+        import asyncio
+
+        async def extract_chunk(chunk: str) -> dict:
+            try:
+                response = await ExtractManagement.aprocess(
+                    page_text=chunk, groq_model=groq_model, semaphore=semaphore
+                )
+                return json.loads(response)
+            except Exception:
+                logger.exception("Failed to extract management team.")
+                return {}
+
+        results = await asyncio.gather(
+            *(extract_chunk(chunk) for chunk in self._chunk(text, groq_model))
+        )
+        return merge_management_results(results)
@@ -1,43 +1,37 @@
-import re
-
 from concall_parser.log_config import logger
+from concall_parser.utils.speaker_segmenter import SPEAKER_LABEL_PATTERN
 
 
 class ManagementCaseExtractor:
     """Handles case where moderator is not present."""
-    def extract(self, transcript:dict[int,str]):
+
+    def extract(self, transcript: dict[int, str]) -> dict[str, list[str]]:
         """Extracts speaker names and their corresponding speeches from the transcript.
-        
-        To be used when moderator is not present in transcript.
+
+        To be used when moderator is not present in transcript. Pages are
+        read as one text, so a speech continued on the next page stays in
+        one piece, and speaker labels starting a line, see
+        SPEAKER_LABEL_PATTERN, are found in a single pass over it.
 
         Args:
-            transcript: A dictionary where keys are page numbers (as strings) and
-                values are extracted text.
+            transcript: A dictionary where keys are page numbers and values
+                are extracted text.
 
         Returns:
-            speech_pair: A dictionary mapping speaker names to a list of their spoken segments.
+            speech_pair: A dictionary mapping speaker names, in the order
+                they first speak, to a list of their spoken segments.
         """
-        all_speakers = set()
+        text = "\n".join(transcript.values())
         speech_pair: dict[str, list[str]] = {}
 
-        for _, text in transcript.items():
-            matches = re.findall(
-                r"([A-Z]\.\s)?([A-Za-z\s]+):\s(.*?)(?=\s[A-Z]\.?\s?[A-Za-z\s]+:\s|$)",
-                text,
-                re.DOTALL,
-            )
-
-            for initial, name, speech in matches:
-                speaker = (
-                    f"{(initial or '').strip()} {name.strip()}".strip()
-                )  # Clean speaker name
-                speech = re.sub(r"\n", " ", speech).strip()  # Clean speech text
-
-                if speaker not in all_speakers:
-                    all_speakers.add(speaker)
-                    speech_pair[speaker] = []
-
-                speech_pair[speaker].append(speech)
-
-        logger.debug(f"Extracted Speakers: {all_speakers}")
-        return speech_pair
\ No newline at end of file
+        labels = SPEAKER_LABEL_PATTERN.finditer(text)
+        label = next(labels, None)
+        while label is not None:
+            next_label = next(labels, None)
+            end = next_label.start() if next_label else len(text)
+            speech = text[label.end() : end].replace("\n", " ").strip()
+            speech_pair.setdefault(label.group("speaker"), []).append(speech)
+            label = next_label
+
+        logger.debug(f"Extracted Speakers: {list(speech_pair)}")
+        return speech_pair
@@ -1,14 +1,38 @@
-from concall_parser.config import get_groq_api_key, get_groq_model
+import contextlib
+
+from concall_parser.agents.moderator_rules import (
+    HIGH_CONFIDENCE,
+    RuleBasedCheckModerator,
+)
+from concall_parser.config import get_groq_model
 from concall_parser.extractors.dialogue_extractor import DialogueExtractor
 from concall_parser.extractors.management import CompanyAndManagementExtractor
 from concall_parser.extractors.management_case_extractor import (
     ManagementCaseExtractor,
 )
-from concall_parser.log_config import configure_logger
+from concall_parser.log_config import configure_logger, logger
+from concall_parser.utils.downloads import HttpCache
 from concall_parser.utils.file_utils import (
+    LazyTranscript,
     get_document_transcript,
     get_transcript_from_link,
 )
+from concall_parser.utils.get_groq_responses import (
+    LLMSettings,
+    get_llm_backend,
+    get_scheduler,
+    use_llm_settings,
+)
+from concall_parser.utils.instrumentation import (
+    Instrumentation,
+    activate,
+    get_instrumentation_hook,
+    span,
+)
+from concall_parser.utils.llm_backends import GroqBackend, LLMBackend
+from concall_parser.utils.rate_limiter import LLMScheduler
+from concall_parser.utils.response_cache import ResponseCache
+from concall_parser.utils.transcript_cache import TranscriptCache, hash_pdf
 
 
 class ConcallParser:
@@ -23,6 +47,22 @@ class ConcallParser:
         save_logs_to_file: bool = False,
         logging_level: str = "INFO",
         log_file: str = "app.log",
+        classification_workers: int = 1,
+        min_rule_confidence: float | None = None,
+        batch_classification: bool = False,
+        pdf_workers: int = 1,
+        pdf_backend: str = "pdfplumber",
+        lazy_transcript: bool = False,
+        llm_cache_path: str | None = None,
+        llm_cache_max_entries: int = 10_000,
+        llm_cache_ttl: float | None = None,
+        transcript_cache_dir: str | None = None,
+        http_cache_dir: str | None = None,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        llm_backend: LLMBackend | None = None,
+        instrument: bool = False,
+        detect_moderator: bool = True,
     ):
         """Initialize ConcallParser.
 
@@ -34,21 +74,132 @@ class ConcallParser:
             save_logs_to_file: Whether to save logs to file
             logging_level: Logging level (DEBUG/INFO/WARNING/ERROR)
             log_file: Log file path when save_logs_to_file is True
+            classification_workers: Number of moderator statements classified
+                concurrently. Values above 1 classify every Moderator turn
+                up front instead of one at a time while walking the transcript.
+            min_rule_confidence: Moderator statements matched by the built-in
+                rules with at least this confidence are classified without
+                Groq, e.g. 0.9 for the stock phrases the rules are sure of.
+                None, the default, sends every statement to Groq.
+            batch_classification: Whether to send many moderator statements
+                to Groq in each request, sized to fit the model's context.
+            pdf_workers: Number of processes extracting pdf pages in parallel.
+            pdf_backend: Text extraction backend: "pdfplumber", "pdfium"
+                (several times faster, less careful about reading order) or
+                "auto" (pdfium, with pages that look degraded extracted again
+                by pdfplumber).
+            lazy_transcript: Whether to extract pages of a local pdf only when
+                an extract method first needs them, instead of all up front.
+            llm_cache_path: Path of an on-disk cache for LLM responses. When
+                set, repeated prompts of this parser are answered from the
+                cache instead of Groq. For a cache shared by every parser in
+                the process, call `get_groq_responses.set_response_cache`.
+            llm_cache_max_entries: Maximum number of cached LLM responses.
+            llm_cache_ttl: Seconds after which cached LLM responses expire.
+            transcript_cache_dir: Directory of an on-disk cache of extracted
+                transcripts, keyed by pdf content. When set, a pdf parsed
+                before is not extracted again.
+            http_cache_dir: Directory of an on-disk cache of pdfs downloaded
+                from links. When set, links are fetched with conditional
+                requests and an unchanged pdf is neither downloaded nor
+                extracted again.
+            requests_per_minute: Groq request budget. When this or
+                tokens_per_minute is set, requests of this parser are queued
+                to stay within the budgets. For budgets shared by every
+                parser in the process, call `get_groq_responses.set_scheduler`.
+            tokens_per_minute: Groq token budget.
+            llm_backend: Backend LLM requests are sent to, e.g. an
+                OpenAICompatibleBackend for a self-hosted model or an
+                OfflineBackend for tests. Used by this parser only. Defaults
+                to the backend set with `get_groq_responses.set_llm_backend`,
+                else Groq, or the server at LLM_BASE_URL if that is set.
+            instrument: Whether to time each stage of the parse and count
+                LLM calls, tokens and cache hits, see `get_metrics`. Always
+                on while an instrumentation hook is set.
+            detect_moderator: Whether extract_all tells calls without a
+                moderator apart by their speaker labels, and extracts their
+                speeches with the management case extractor instead of
+                walking them for moderator statements.
         """
-        self.transcript = self._get_document_transcript(filepath=path, link=link)
-        self.groq_api_key = groq_api_key if groq_api_key else get_groq_api_key()
+        self.instrumentation = None
+        if instrument or get_instrumentation_hook() is not None:
+            self.instrumentation = Instrumentation()
+        self.pdf_workers = pdf_workers
+        self.pdf_backend = pdf_backend
+        self.lazy_transcript = lazy_transcript
+        self.transcript_cache = None
+        if transcript_cache_dir:
+            self.transcript_cache = TranscriptCache(transcript_cache_dir)
+        self.http_cache = None
+        if http_cache_dir:
+            self.http_cache = HttpCache(http_cache_dir)
+        with activate(self.instrumentation), span("transcript"):
+            self.transcript = self._get_document_transcript(
+                filepath=path, link=link
+            )
+        self.groq_api_key = groq_api_key
+        if llm_backend is None and groq_api_key:
+            llm_backend = GroqBackend(api_key=groq_api_key)
+        # Fails here, rather than on the first request, if no backend is
+        # configured.
+        self.llm_backend = llm_backend or get_llm_backend()
         self.groq_model = groq_model if groq_model else get_groq_model()
 
+        self.response_cache = None
+        if llm_cache_path:
+            self.response_cache = ResponseCache(
+                path=llm_cache_path,
+                max_entries=llm_cache_max_entries,
+                ttl=llm_cache_ttl,
+            )
+        self.scheduler = None
+        if requests_per_minute or tokens_per_minute:
+            self.scheduler = LLMScheduler(
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+            )
+        # Kept on the parser and activated around each stage, so that the
+        # options of one parser never apply to another.
+        self.llm_settings = LLMSettings(
+            backend=self.llm_backend,
+            response_cache=self.response_cache,
+            scheduler=self.scheduler,
+        )
+
         self.company_and_management_extractor = CompanyAndManagementExtractor()
-        self.dialogue_extractor = DialogueExtractor()
+        self.dialogue_extractor = DialogueExtractor(
+            max_workers=classification_workers,
+            min_rule_confidence=min_rule_confidence,
+            batch_classification=batch_classification,
+        )
         self.management_case_extractor = ManagementCaseExtractor()
+        self._dialogue_pages = None
+        self._commentary_complete = False
+        self.detect_moderator = detect_moderator
+        self._has_moderator = None
         configure_logger(
             save_to_file=save_logs_to_file,
             logging_level=logging_level,
             log_file=log_file,
         )
 
-    def _get_document_transcript(self, filepath: str, link: str) -> dict[int, str]:
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """Runs a stage of the parse with the settings of this parser.
+
+        The stage is timed as a span named name, and its LLM requests go to
+        this parser's backend, response cache and scheduler.
+        """
+        with (
+            activate(self.instrumentation),
+            use_llm_settings(self.llm_settings),
+            span(name),
+        ):
+            yield
+
+    def _get_document_transcript(
+        self, filepath: str, link: str
+    ) -> dict[int, str]:
         """Extracts text of a pdf document.
 
         Takes in a filepath (locally stored document) or link (online doc) to extract document
@@ -70,9 +221,37 @@ class ConcallParser:
             )
 
         if link:
-            self.transcript = get_transcript_from_link(link=link)
+            self.transcript = get_transcript_from_link(
+                link=link,
+                workers=self.pdf_workers,
+                backend=self.pdf_backend,
+                cache=self.transcript_cache,
+                http_cache=self.http_cache,
+            )
+        elif self.lazy_transcript:
+            cached = key = None
+            if self.transcript_cache is not None:
+                key = TranscriptCache.make_key(
+                    hash_pdf(filepath), self.pdf_backend
+                )
+                cached = self.transcript_cache.get(key)
+            self.transcript = (
+                cached
+                if cached is not None
+                else LazyTranscript(
+                    filepath,
+                    backend=self.pdf_backend,
+                    cache=self.transcript_cache,
+                    cache_key=key,
+                )
+            )
         else:
-            self.transcript = get_document_transcript(filepath=filepath)
+            self.transcript = get_document_transcript(
+                filepath=filepath,
+                workers=self.pdf_workers,
+                backend=self.pdf_backend,
+                cache=self.transcript_cache,
+            )
         return self.transcript
 
     def extract_concall_info(self) -> dict:
@@ -84,44 +263,150 @@ class ConcallParser:
         Returns:
             dict: Company name and management team as a dictionary.
         """
-        extracted_text = ""
-        for page_number, text in self.transcript.items():
-            if page_number <= 2:
-                extracted_text += text
-            else:
-                break
-        return self.company_and_management_extractor.extract(
-            text=extracted_text,
-            groq_model=self.groq_model,
-        )
+        with self.stage("concall_info"):
+            extracted_text = "".join(
+                self.transcript[page_number]
+                for page_number in (1, 2)
+                if page_number in self.transcript
+            )
+            return self.company_and_management_extractor.extract(
+                text=extracted_text,
+                groq_model=self.groq_model,
+            )
+
+    def _extract_dialogues(self, commentary_only: bool = False) -> dict:
+        """Extracts dialogue sections once and reuses them afterwards.
+
+        Commentary and analyst discussion come out of the same walk over the
+        transcript, so each Moderator statement is classified only once per
+        document regardless of which extract methods are called. The walk
+        stops once the commentary is complete if that is all that is needed,
+        and resumes from there when the rest is asked for. If the walk fails,
+        e.g. on an LLM request, the next call walks the transcript again,
+        reusing the statements classified before the failure.
+
+        Args:
+            commentary_only: Whether to stop once the commentary is complete.
+
+        Returns:
+            dict: Dialogues extracted so far, keyed by section.
+        """
+        if self._dialogue_pages is None:
+            self._dialogue_pages = self.dialogue_extractor.iter_extract(
+                transcript=self.transcript,
+                groq_model=self.groq_model,
+            )
+        if not (commentary_only and self._commentary_complete):
+            with self.stage("dialogues"):
+                try:
+                    for intent in self._dialogue_pages:
+                        if intent in ("new_analyst_start", "end"):
+                            self._commentary_complete = True
+                            if commentary_only:
+                                break
+                except BaseException:
+                    # A generator that raised is finished; iterating it
+                    # again would return the partial dialogues.
+                    self._dialogue_pages = None
+                    self._commentary_complete = False
+                    raise
+        return self.dialogue_extractor.dialogues
 
     def extract_commentary(self) -> list:
         """Extracts commentary from the input."""
-        response = self.dialogue_extractor.extract_commentary_and_future_outlook(
-            transcript=self.transcript,
-            groq_model=self.groq_model,
-        )
-        return response
+        return self._extract_dialogues(commentary_only=True)[
+            "commentary_and_future_outlook"
+        ]
 
     def handle_only_management_case(self) -> dict[str, list[str]]:
         """Extracts dialogue where moderator is not present."""
-        return self.management_case_extractor.extract(self.transcript)
+        with self.stage("management_case"):
+            return self.management_case_extractor.extract(self.transcript)
 
     def extract_analyst_discussion(self) -> dict:
         """Extracts analyst discussion from the input."""
-        dialogues = self.dialogue_extractor.extract_dialogues(
-            transcript_dict=self.transcript,
-            groq_model=self.groq_model,
-        )
-        return dialogues["analyst_discussion"]
+        return self._extract_dialogues()["analyst_discussion"]
+
+    def has_moderator(self) -> bool:
+        """Returns whether the call has a moderator, from its speaker labels.
+
+        Decided once per document from the first pages, without an LLM, see
+        RuleBasedCheckModerator. Calls it cannot tell are taken as moderated.
+        """
+        if self._has_moderator is None:
+            with self.stage("detect_moderator"):
+                response = RuleBasedCheckModerator.process(self.transcript)
+            self._has_moderator = (
+                bool(response["moderator"])
+                or response["confidence"] < HIGH_CONFIDENCE
+            )
+            logger.info(
+                "Call %s a moderator",
+                "has" if self._has_moderator else "does not have",
+            )
+        return self._has_moderator
 
     def extract_all(self) -> dict:
-        """Extracts all information from the input."""
-        management = self.extract_concall_info()
-        commentary = self.extract_commentary()
-        analyst = self.extract_analyst_discussion()
+        """Extracts all information from the input.
+
+        Calls without a moderator, see `has_moderator`, come out with empty
+        "commentary" and "analyst", and the speeches of each speaker under
+        "speeches".
+        """
+        with self.stage("extract_all"):
+            management = self.extract_concall_info()
+            if self.detect_moderator and not self.has_moderator():
+                return {
+                    "concall_info": management,
+                    "commentary": [],
+                    "analyst": {},
+                    "speeches": self.handle_only_management_case(),
+                }
+            commentary = self.extract_commentary()
+            analyst = self.extract_analyst_discussion()
         return {
             "concall_info": management,
             "commentary": commentary,
             "analyst": analyst,
         }
+
+    def get_classification_stats(self) -> dict:
+        """Returns the number of moderator statements classified by rules and by Groq.
+
+        Every statement classified by rules is one Groq call saved.
+        """
+        return dict(self.dialogue_extractor.classification_stats)
+
+    def get_metrics(self) -> dict:
+        """Returns time spent per stage and LLM usage of this parse so far.
+
+        Spans are keyed by stage ("transcript", "segmentation", "dialogues",
+        "agent.classify", "llm.request", ...) with their count, total and
+        maximum seconds. Counters include LLM calls, prompt and completion
+        tokens, failures and cache hits. Empty unless the parser was created
+        with instrument=True or an instrumentation hook is set.
+        """
+        if self.instrumentation is None:
+            return {"spans": {}, "counters": {}}
+        return self.instrumentation.to_dict()
+
+    def get_rate_limit_stats(self) -> dict:
+        """Returns queue depth, wait times and retries of Groq requests.
+
+        Counts the requests of this parser if it was given its own budgets,
+        else of every parser sharing the process-wide scheduler.
+        """
+        return (self.scheduler or get_scheduler()).stats()
+
+    def close(self) -> None:
+        """Closes the pdf of a lazy transcript that was not read to the end."""
+        if isinstance(self.transcript, LazyTranscript):
+            self.transcript.close()
+
+    def __enter__(self) -> "ConcallParser":
+        """Returns itself, closed again when the context exits."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Closes the pdf."""
+        self.close()
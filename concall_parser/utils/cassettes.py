@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+
+from concall_parser.log_config import logger
+from concall_parser.utils.disk_store import write_atomic
+from concall_parser.utils.llm_backends import (
+    LLMBackend,
+    LLMResponse,
+    LLMUsage,
+    create_default_backend,
+)
+from concall_parser.utils.response_cache import ResponseCache
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES = ("record", "replay")
+# Characters of the prompt kept in a cassette and in miss errors, so a human
+# can tell which request they belong to.
+PROMPT_PREVIEW_LENGTH = 120
+
+
+class CassetteMissError(LookupError):
+    """A replayed request has no recorded response."""
+
+
+def _preview(messages: list[dict]) -> str:
+    text = messages[-1]["content"] if messages else ""
+    return " ".join(text.split())[:PROMPT_PREVIEW_LENGTH]
+
+
+class Cassette(LLMBackend):
+    """Backend that records LLM responses to a file, or replays them.
+
+    In record mode every request goes to the wrapped backend and the
+    response is kept, keyed by the hash of the model, messages and sampling
+    parameters (the response cache key); `save` writes them out. In replay
+    mode requests are answered from the file alone, and a request that was
+    not recorded raises CassetteMissError and is listed in `misses`, so a
+    changed prompt cannot silently fall back to a live model.
+
+    Example:
+        cassette = Cassette("tests/cassettes/irctc.json", mode="replay")
+        parser = ConcallParser(path="irctc.pdf", llm_backend=cassette)
+    """
+
+    name = "cassette"
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        backend: LLMBackend | None = None,
+    ):
+        """Initialize Cassette.
+
+        Args:
+            path: Path of the cassette file.
+            mode: "record" to call the backend and keep its responses,
+                "replay" to answer from the file.
+            backend: Backend recorded from, the one configured by the
+                environment by default. Unused when replaying.
+
+        Raises:
+            ValueError if mode is not "record" or "replay".
+            FileNotFoundError if replaying a cassette that does not exist.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(
+                f"Unknown cassette mode {mode!r}, "
+                f"expected one of {', '.join(CASSETTE_MODES)}"
+            )
+        self.path = path
+        self.mode = mode
+        self.misses: list[str] = []
+        self.hits = 0
+        self._lock = threading.Lock()
+        # Recording starts empty, so prompts no longer sent drop out.
+        self.interactions: dict[str, dict] = {}
+        if mode == "replay":
+            self.interactions = self._load(path)
+            self.backend = None
+        else:
+            self.backend = backend or create_default_backend()
+
+    @staticmethod
+    def _load(path: str) -> dict[str, dict]:
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"Cassette {path} has version {data.get('version')}, "
+                f"expected {CASSETTE_VERSION}; record it again"
+            )
+        return data["interactions"]
+
+    def _replay(self, messages: list[dict], model: str, params: dict):
+        key = ResponseCache.make_key(model, messages, **params)
+        entry = self.interactions.get(key)
+        with self._lock:
+            if entry is None:
+                self.misses.append(_preview(messages))
+            else:
+                self.hits += 1
+        if entry is None:
+            raise CassetteMissError(
+                f"No recorded response in {self.path} for prompt {key}: "
+                f"{_preview(messages)!r}. Record the cassette again."
+            )
+        usage = entry.get("usage")
+        return LLMResponse(
+            content=entry["content"],
+            usage=LLMUsage(*usage) if usage else None,
+        )
+
+    def _record(
+        self,
+        messages: list[dict],
+        model: str,
+        params: dict,
+        response: LLMResponse,
+    ) -> None:
+        key = ResponseCache.make_key(model, messages, **params)
+        with self._lock:
+            self.interactions[key] = {
+                "model": model,
+                "prompt": _preview(messages),
+                "content": response.content,
+                "usage": list(response.usage) if response.usage else None,
+            }
+
+    def complete(self, messages: list[dict], model: str, **params):
+        """Answers from the cassette, or records the backend's answer."""
+        if self.mode == "replay":
+            return self._replay(messages, model, params)
+        response = self.backend.complete(messages, model, **params)
+        self._record(messages, model, params, response)
+        return response
+
+    async def acomplete(self, messages: list[dict], model: str, **params):
+        """Async counterpart of `complete`."""
+        if self.mode == "replay":
+            return self._replay(messages, model, params)
+        response = await self.backend.acomplete(messages, model, **params)
+        self._record(messages, model, params, response)
+        return response
+
+    def save(self) -> None:
+        """Writes the recorded responses to the cassette file, atomically."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {
+                "version": CASSETTE_VERSION,
+                "interactions": dict(self.interactions),
+            }
+        write_atomic(
+            self.path,
+            lambda file: json.dump(
+                data, file, indent=2, sort_keys=True, ensure_ascii=False
+            ),
+            mode="w",
+            encoding="utf-8",
+        )
+        logger.info(
+            "Recorded %d LLM responses to %s",
+            len(data["interactions"]),
+            self.path,
+        )
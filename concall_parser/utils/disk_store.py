@@ -0,0 +1,96 @@
+import os
+import tempfile
+from collections.abc import Callable, Iterable
+from typing import IO, TypeVar
+
+Entry = TypeVar("Entry")
+
+
+def write_atomic(
+    path: str,
+    write: Callable[[IO], None],
+    mode: str = "wb",
+    encoding: str | None = None,
+    fsync: bool = False,
+) -> None:
+    """Writes a file through a temp file, so readers never see half of it.
+
+    The temp file is created next to path and renamed over it, which
+    replaces the file in one step on the same filesystem. It is removed if
+    writing fails.
+
+    Args:
+        path: Path of the file to write.
+        write: Called with the open temp file, writes the content.
+        mode: Mode the temp file is opened in, "wb" or "w".
+        encoding: Encoding of a file opened in text mode.
+        fsync: Whether to flush the content to disk before the rename, so
+            the file survives a crash as well.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as file:
+            write(file)
+            if fsync:
+                file.flush()
+                os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        remove_file(temp_path)
+        raise
+
+
+def remove_file(path: str) -> None:
+    """Removes a file, if it still exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def list_by_last_access(
+    directory: str, suffix: str
+) -> list[tuple[str, os.stat_result]]:
+    """Returns path and stat of the files in directory ending with suffix.
+
+    The modification time of a file doubles as its last access time, see
+    `evict_least_recently_used`. Files are ordered from least to most
+    recently used; files removed while listing are left out.
+    """
+    files = []
+    for name in os.listdir(directory):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            files.append((path, os.stat(path)))
+        except FileNotFoundError:
+            continue
+    return sorted(files, key=lambda file: file[1].st_mtime)
+
+
+def evict_least_recently_used(
+    entries: Iterable[Entry],
+    total: int,
+    max_bytes: int,
+    remove: Callable[[Entry], int],
+) -> int:
+    """Removes entries, least recently used first, until total fits.
+
+    Args:
+        entries: Entries ordered from least to most recently used.
+        total: Bytes taken by all entries.
+        max_bytes: Bytes the entries may take.
+        remove: Removes an entry, returns the bytes it freed.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    removed = 0
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        total -= remove(entry)
+        removed += 1
+    return removed
@@ -0,0 +1,293 @@
+import collections
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import IO, TYPE_CHECKING
+
+from concall_parser.log_config import logger
+from concall_parser.utils.disk_store import (
+    evict_least_recently_used,
+    list_by_last_access,
+    remove_file,
+    write_atomic,
+)
+from concall_parser.utils.transcript_cache import TranscriptCache, hash_pdf
+
+if TYPE_CHECKING:
+    # Imported on first download instead, see get_session.
+    import requests
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"  # noqa: E501
+}
+# Downloads larger than this spill from memory into an anonymous temp file.
+SPOOL_THRESHOLD = 32 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+POOL_SIZE = 16
+TIMEOUT = 30
+
+_session: "requests.Session | None" = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> "requests.Session":
+    """Returns the process-wide HTTP session, creating it on first use.
+
+    The session keeps connections alive and pools up to POOL_SIZE of them
+    per host, so repeated and concurrent downloads from the same exchange
+    reuse connections instead of opening a new one per request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update(HEADERS)
+            _session = session
+        return _session
+
+
+def _spool(response: "requests.Response", spool_threshold: int) -> IO[bytes]:
+    """Streams a response body into memory, or a temp file if it is large."""
+    document = tempfile.SpooledTemporaryFile(max_size=spool_threshold)
+    try:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            document.write(chunk)
+    except BaseException:
+        document.close()
+        raise
+    logger.debug("Downloaded %d bytes from %s", document.tell(), response.url)
+    document.seek(0)
+    return document
+
+
+def download_pdf(
+    link: str,
+    session: "requests.Session | None" = None,
+    spool_threshold: int = SPOOL_THRESHOLD,
+) -> IO[bytes]:
+    """Downloads a pdf into memory, or a private temp file if it is large.
+
+    Nothing is written to a shared path, so any number of downloads can run
+    at once in threads or processes.
+
+    Args:
+        link: Link to the pdf document.
+        session: Session to download with, the shared session by default.
+        spool_threshold: Size in bytes above which the download is moved
+            from memory to an anonymous temp file.
+
+    Returns:
+        IO[bytes]: Binary file object holding the pdf, at position 0. Close
+            it when done to release the memory or temp file.
+
+    Raises:
+        requests.HTTPError if the server answers with an error status.
+    """
+    session = session or get_session()
+    with session.get(url=link, timeout=TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        return _spool(response, spool_threshold)
+
+
+class HttpCache:
+    """On-disk store of downloaded pdfs and their HTTP validators.
+
+    For every link the last response body is kept along with its ETag,
+    Last-Modified and SHA-256, so the next request for the link can be made
+    conditional. Bodies are stored under their SHA-256 and never rewritten,
+    and the entry of a link names the body it belongs to, so replacing the
+    entry swaps validators and body together even when several processes
+    download the same link. Extracted transcripts are kept in `transcripts`,
+    keyed by content, so an unchanged document is never parsed twice. The
+    bodies take at most `max_bytes`, the least recently used links are
+    evicted first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1024 * 1024 * 1024):
+        """Initialize HttpCache.
+
+        Args:
+            directory: Directory holding the cached downloads, created if
+                missing.
+            max_bytes: Maximum total size of the cached pdfs.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.transcripts = TranscriptCache(
+            os.path.join(directory, "transcripts")
+        )
+        os.makedirs(directory, exist_ok=True)
+
+    def _entry_path(self, link: str) -> str:
+        key = hashlib.sha256(link.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".json")
+
+    def _body_path(self, pdf_hash: str) -> str:
+        return os.path.join(self.directory, pdf_hash + ".pdf")
+
+    def get(self, link: str) -> dict | None:
+        """Returns validators and content hash stored for link, if any.
+
+        An entry whose body is missing or of the wrong size is not returned.
+        """
+        path = self._entry_path(link)
+        try:
+            with open(path) as file:
+                entry = json.load(file)
+            size = os.path.getsize(self._body_path(entry["sha256"]))
+            if size != entry.get("bytes"):
+                return None
+            # The modification time doubles as the last access time for
+            # eviction. An entry evicted since it was read counts as a miss.
+            os.utime(path)
+        except (FileNotFoundError, ValueError, KeyError, TypeError):
+            return None
+        return entry
+
+    def open_body(self, pdf_hash: str) -> IO[bytes]:
+        """Opens the stored pdf with the given SHA-256."""
+        return open(self._body_path(pdf_hash), "rb")
+
+    def set(
+        self, link: str, response: "requests.Response", document: IO[bytes]
+    ) -> dict:
+        """Stores a downloaded pdf with the validators of its response.
+
+        The body is written before the entry that refers to it, so a reader
+        finds either the old entry or the new one with its body.
+
+        Args:
+            link: Link the pdf was downloaded from.
+            response: Response the pdf came in.
+            document: Binary file object holding the pdf, rewound after.
+
+        Returns:
+            dict: The stored entry.
+        """
+        pdf_hash = hash_pdf(document)
+        body_path = self._body_path(pdf_hash)
+        if not os.path.exists(body_path):
+            write_atomic(
+                body_path, lambda file: shutil.copyfileobj(document, file)
+            )
+        entry = {
+            "link": link,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": pdf_hash,
+            "bytes": os.path.getsize(body_path),
+        }
+        previous = self.get(link)
+        write_atomic(
+            self._entry_path(link),
+            lambda file: file.write(json.dumps(entry).encode()),
+        )
+        document.seek(0)
+        # The link's previous document is dropped unless another link has it.
+        if previous is not None and previous["sha256"] != pdf_hash:
+            if all(
+                other["sha256"] != previous["sha256"]
+                for other in self.entries()
+            ):
+                remove_file(self._body_path(previous["sha256"]))
+        self.evict()
+        return entry
+
+    def entries(self) -> list[dict]:
+        """Returns the stored entries with their last access time.
+
+        Entries are ordered from least to most recently used.
+        """
+        entries = []
+        for path, stat in list_by_last_access(self.directory, ".json"):
+            try:
+                with open(path) as file:
+                    entry = json.load(file)
+            except (FileNotFoundError, ValueError):
+                continue
+            entry["last_access"] = stat.st_mtime
+            entries.append(entry)
+        return entries
+
+    def evict(self) -> int:
+        """Removes least recently used links until the pdfs fit max_bytes.
+
+        Returns:
+            int: Number of links removed.
+        """
+        entries = self.entries()
+        sizes = {entry["sha256"]: entry["bytes"] for entry in entries}
+        references = collections.Counter(entry["sha256"] for entry in entries)
+
+        def remove(entry: dict) -> int:
+            # A body is only freed with the last link that refers to it.
+            remove_file(self._entry_path(entry["link"]))
+            references[entry["sha256"]] -= 1
+            if references[entry["sha256"]]:
+                return 0
+            remove_file(self._body_path(entry["sha256"]))
+            return entry["bytes"]
+
+        removed = evict_least_recently_used(
+            entries, sum(sizes.values()), self.max_bytes, remove
+        )
+        if removed:
+            logger.debug("Evicted %d cached downloads", removed)
+        return removed
+
+
+def conditional_download(
+    link: str,
+    http_cache: HttpCache,
+    session: "requests.Session | None" = None,
+    spool_threshold: int = SPOOL_THRESHOLD,
+) -> tuple[str, IO[bytes] | None]:
+    """Downloads a pdf unless the copy in http_cache is still current.
+
+    The request carries If-None-Match and If-Modified-Since from the cached
+    response, if there is one, so an unchanged document costs a 304 with no
+    body.
+
+    Args:
+        link: Link to the pdf document.
+        http_cache: Cache of earlier downloads, updated on a 200.
+        session: Session to download with, the shared session by default.
+        spool_threshold: See download_pdf.
+
+    Returns:
+        tuple: SHA-256 of the pdf, and the downloaded pdf as a binary file
+            object, or None if the server answered 304 Not Modified.
+
+    Raises:
+        requests.HTTPError if the server answers with an error status.
+    """
+    session = session or get_session()
+    entry = http_cache.get(link)
+    headers = {}
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    with session.get(
+        url=link, headers=headers, timeout=TIMEOUT, stream=True
+    ) as response:
+        if response.status_code == 304 and entry is not None:
+            logger.debug("Not modified: %s", link)
+            return entry["sha256"], None
+        response.raise_for_status()
+        document = _spool(response, spool_threshold)
+        entry = http_cache.set(link, response, document)
+    return entry["sha256"], document
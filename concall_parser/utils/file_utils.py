@@ -1,31 +1,122 @@
 import json
 import os
-
-import pdfplumber
-import requests
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import IO
 
 from concall_parser.log_config import logger
+from concall_parser.utils.downloads import (
+    HttpCache,
+    conditional_download,
+    download_pdf,
+)
+from concall_parser.utils.instrumentation import count
+from concall_parser.utils.pdf_backends import open_pdf
+from concall_parser.utils.transcript_cache import TranscriptCache, hash_pdf
+
+
+def _extract_page_range(
+    filepath: str, start: int, stop: int, backend: str = "pdfplumber"
+) -> list[str]:
+    """Extracts text of pages [start, stop) of a pdf, in a worker process."""
+    with open_pdf(filepath, backend) as pdf:
+        return [pdf.extract_page(index) for index in range(start, stop)]
 
 
-def get_document_transcript(filepath: str) -> dict[int, str]:
+def _extract_pages_in_parallel(
+    filepath: str | IO[bytes], workers: int, backend: str = "pdfplumber"
+) -> list[str]:
+    """Extracts text of all pages of a pdf across a pool of processes.
+
+    Pages are split into contiguous ranges, a few per worker so that uneven
+    pages balance out. Every worker opens the pdf on its own, from its path.
+    A file object is written to a temporary file once, so that its bytes
+    are not sent to the workers with every range.
+    """
+    if not isinstance(filepath, str):
+        position = filepath.tell()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "document.pdf")
+            filepath.seek(0)
+            with open(path, "wb") as file:
+                shutil.copyfileobj(filepath, file)
+            filepath.seek(position)
+            return _extract_pages_in_parallel(path, workers, backend)
+
+    with open_pdf(filepath, backend) as pdf:
+        page_count = pdf.page_count
+
+    chunk_size = max(1, -(-page_count // (workers * 4)))
+    ranges = [
+        (start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            _extract_page_range,
+            [filepath] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+            [backend] * len(ranges),
+        )
+        return [text for chunk in chunks for text in chunk]
+
+
+def get_document_transcript(
+    filepath: str | IO[bytes],
+    workers: int = 1,
+    backend: str = "pdfplumber",
+    cache: TranscriptCache | None = None,
+) -> dict[int, str]:
     """Extracts text of a pdf document.
 
     Args:
-        filepath: Path to the pdf file whose text needs to be extracted.
+        filepath: Path to the pdf file whose text needs to be extracted, or
+            a binary file object holding it.
+        workers: Number of processes extracting pages in parallel.
+        backend: Text extraction backend, "pdfplumber", "pdfium" or "auto"
+            (pdfium, with degraded pages extracted again by pdfplumber).
+        cache: Cache of transcripts keyed by pdf content. On a hit the pdf
+            is not parsed at all; on a miss the extracted transcript is
+            stored in it.
 
     Returns:
         transcript: Dictionary of page number, page text pair.
     """
     transcript = {}
     try:
-        with pdfplumber.open(filepath) as pdf:
-            logger.debug("Loaded document")
-            page_number = 1
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    transcript[page_number] = text
-                    page_number += 1
+        if cache is not None:
+            key = TranscriptCache.make_key(hash_pdf(filepath), backend)
+            cached = cache.get(key)
+            count(
+                "transcript_cache.hits"
+                if cached is not None
+                else "transcript_cache.misses"
+            )
+            if cached is not None:
+                logger.debug("Loaded transcript from cache")
+                return cached
+
+        if workers > 1:
+            texts = _extract_pages_in_parallel(filepath, workers, backend)
+        else:
+            with open_pdf(filepath, backend) as pdf:
+                logger.debug("Loaded document")
+                texts = [
+                    pdf.extract_page(index) for index in range(pdf.page_count)
+                ]
+
+        page_number = 1
+        for text in texts:
+            if text:
+                transcript[page_number] = text
+                page_number += 1
+
+        if cache is not None:
+            cache.set(key, transcript)
         return transcript
     except FileNotFoundError:
         raise FileNotFoundError("Please check if file exists.")
@@ -33,6 +124,111 @@ def get_document_transcript(filepath: str) -> dict[int, str]:
         logger.exception("Could not load file %s", filepath)
 
 
+class LazyTranscript(Mapping):
+    """Page number, page text mapping that extracts pages on first access.
+
+    Behaves like the dict returned by get_document_transcript: empty pages
+    are skipped and the rest are numbered from 1. A page is extracted the
+    first time it, or a later page, is asked for and kept afterwards, so
+    reading the first pages of a long document does not pay for the rest.
+    The pdf is closed once its last page has been extracted, and the
+    complete transcript is then stored in the cache, if one is given. Use it
+    as a context manager, or call close, to release a pdf that is not read
+    to the end. Pages may be read from several threads at once.
+    """
+
+    def __init__(
+        self,
+        source: str | IO[bytes],
+        backend: str = "pdfplumber",
+        cache: TranscriptCache | None = None,
+        cache_key: str | None = None,
+    ):
+        """Initialize LazyTranscript.
+
+        Args:
+            source: Path to the pdf file, or a binary file object.
+            backend: Text extraction backend, see get_document_transcript.
+            cache: Cache the transcript is stored in once every page has
+                been extracted.
+            cache_key: Key of the transcript in cache, see
+                TranscriptCache.make_key. Computed from the pdf if missing.
+        """
+        if cache is not None and cache_key is None:
+            cache_key = TranscriptCache.make_key(hash_pdf(source), backend)
+        self._cache = cache
+        self._cache_key = cache_key
+        self._lock = threading.RLock()
+        self._pdf = open_pdf(source, backend)
+        self._page_count = self._pdf.page_count
+        self._next_index = 0
+        self._pages: list[str] = []
+        if self._page_count == 0:
+            self._complete()
+
+    @property
+    def extracted_pages(self) -> int:
+        """Number of pdf pages extracted so far, including empty ones."""
+        return self._next_index
+
+    def _extract_until(self, page_number: int) -> bool:
+        """Extracts pages until page_number exists, returns if it does."""
+        if len(self._pages) >= page_number:
+            return True
+        with self._lock:
+            while len(self._pages) < page_number and self._pdf is not None:
+                text = self._pdf.extract_page(self._next_index)
+                self._next_index += 1
+                if text:
+                    self._pages.append(text)
+                if self._next_index == self._page_count:
+                    self._complete()
+            return len(self._pages) >= page_number
+
+    def _complete(self) -> None:
+        """Closes the pdf after its last page and caches the transcript."""
+        self.close()
+        if self._cache is not None:
+            self._cache.set(
+                self._cache_key, dict(enumerate(self._pages, start=1))
+            )
+
+    def __getitem__(self, page_number: int) -> str:
+        """Returns the text of a page, extracting it if needed."""
+        if not isinstance(page_number, int) or page_number < 1:
+            raise KeyError(page_number)
+        if not self._extract_until(page_number):
+            raise KeyError(page_number)
+        return self._pages[page_number - 1]
+
+    def __iter__(self) -> Iterator[int]:
+        """Yields page numbers, extracting pages as iteration reaches them."""
+        page_number = 1
+        while self._extract_until(page_number):
+            yield page_number
+            page_number += 1
+
+    def __len__(self) -> int:
+        """Returns the number of non-empty pages, extracting all of them."""
+        self._extract_until(self._page_count)
+        return len(self._pages)
+
+    def close(self) -> None:
+        """Closes the pdf, pages not extracted yet are treated as missing."""
+        with self._lock:
+            if self._pdf is not None:
+                self._pdf.close()
+                self._pdf = None
+
+    def __enter__(self) -> "LazyTranscript":
+        """Returns itself, closed again when the context exits."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Closes the pdf."""
+        self.close()
+
+
 def save_output(
     dialogues: dict, document_name: str, output_base_path: str = "output"
 ) -> None:
@@ -84,35 +280,86 @@ def save_transcript(
         logger.exception("Could not save document transcript")
 
 
-def get_transcript_from_link(link:str) -> dict[int, str]:
+def get_transcript_from_link(
+    link: str,
+    workers: int = 1,
+    backend: str = "pdfplumber",
+    cache: TranscriptCache | None = None,
+    http_cache: HttpCache | None = None,
+) -> dict[int, str]:
     """Extracts transcript by downloading pdf from a given link.
-    
+
+    The pdf is downloaded into memory (or a private temp file if it is very
+    large) over a shared pooled session, so concurrent calls are safe.
+
     Args:
         link: Link to the pdf document of earnings call report.
-        
+        workers: Number of processes extracting pages in parallel.
+        backend: Text extraction backend, see get_document_transcript.
+        cache: Cache of transcripts keyed by pdf content, see
+            get_document_transcript. Defaults to the transcripts of
+            http_cache when that is given.
+        http_cache: Cache of earlier downloads. When given, the request is
+            conditional and a document that is not modified, or comes back
+            with the same content, reuses its extracted transcript.
+
     Returns:
-        transcript: A page number-page text mapping.
-    
-    Raises:
-        Http error, if encountered during downloading document.
+        transcript: A page number-page text mapping, empty if the document
+            could not be downloaded.
     """
     try:
         logger.debug("Request to get transcript from link.")
+        if http_cache is None:
+            document = download_pdf(link)
+        else:
+            cache = cache or http_cache.transcripts
+            pdf_hash, document = conditional_download(link, http_cache)
+            if document is None:
+                key = TranscriptCache.make_key(pdf_hash, backend)
+                transcript = cache.get(key)
+                if transcript is not None:
+                    return transcript
+                document = http_cache.open_body(pdf_hash)
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"# noqa: E501
-        }
-        response = requests.get(url=link, headers=headers, timeout=30, stream=True)
-        response.raise_for_status()
-
-        temp_doc_path = "temp_document.pdf"
-        with open(temp_doc_path, 'wb') as temp_pdf:
-            for chunk in response.iter_content(chunk_size=8192):
-                temp_pdf.write(chunk)
-        transcript = get_document_transcript(filepath=temp_doc_path)
-        os.remove(temp_doc_path)
-
-        return transcript
+        with document:
+            return get_document_transcript(
+                filepath=document,
+                workers=workers,
+                backend=backend,
+                cache=cache,
+            )
     except Exception:
         logger.exception("Could not get transcript from link")
-        return dict()
\ No newline at end of file
+        return dict()
+
+
+def get_transcripts_from_links(
+    links: list[str],
+    max_downloads: int = 4,
+    backend: str = "pdfplumber",
+    cache: TranscriptCache | None = None,
+    http_cache: HttpCache | None = None,
+) -> list[dict[int, str]]:
+    """Downloads and extracts several pdfs concurrently.
+
+    Args:
+        links: Links to the pdf documents.
+        max_downloads: Number of documents downloaded at the same time.
+        backend: Text extraction backend, see get_document_transcript.
+        cache: Cache of transcripts keyed by pdf content, see
+            get_document_transcript.
+        http_cache: Cache of earlier downloads, see get_transcript_from_link.
+
+    Returns:
+        list: Transcript of each link, in the order of links. Documents that
+            could not be downloaded have an empty transcript.
+    """
+    with ThreadPoolExecutor(max_workers=max_downloads) as executor:
+        return list(
+            executor.map(
+                lambda link: get_transcript_from_link(
+                    link, backend=backend, cache=cache, http_cache=http_cache
+                ),
+                links,
+            )
+        )
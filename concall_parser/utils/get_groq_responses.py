@@ -1,27 +1,259 @@
-from groq import APIStatusError, Groq
+import contextlib
+import contextvars
+import sqlite3
+from typing import TYPE_CHECKING, NamedTuple
 
-from concall_parser.config import get_groq_api_key
 from concall_parser.log_config import logger
+from concall_parser.utils.instrumentation import count, span
+from concall_parser.utils.llm_backends import LLMBackend, create_default_backend
+from concall_parser.utils.rate_limiter import (
+    PRIORITY_NORMAL,
+    LLMScheduler,
+    get_status_code,
+)
+from concall_parser.utils.response_cache import ResponseCache
+from concall_parser.utils.tokens import estimate_tokens
 
-client = Groq(api_key=get_groq_api_key())
+if TYPE_CHECKING:
+    # asyncio is only imported by async callers; annotations need no import.
+    import asyncio
 
+SAMPLING_PARAMS = {
+    "temperature": 0.3,
+    "max_tokens": 1024,
+    "top_p": 1,
+    "stop": None,
+    "stream": False,
+    "response_format": {"type": "json_object"},
+}
 
-def get_groq_response(messages, model):
-    """Get response from Groq API."""
+# Process-wide defaults, used where the active LLMSettings leave a field
+# unset. Only changed by the set_* functions, never by a parser.
+response_cache: ResponseCache | None = None
+llm_backend: LLMBackend | None = None
+scheduler = LLMScheduler()
+
+
+class LLMSettings(NamedTuple):
+    """Backend, response cache and scheduler of the requests of one parser.
+
+    Fields left None fall back to the process-wide defaults of
+    `set_llm_backend`, `set_response_cache` and `set_scheduler`.
+    """
+
+    backend: LLMBackend | None = None
+    response_cache: ResponseCache | None = None
+    scheduler: LLMScheduler | None = None
+
+
+_settings: contextvars.ContextVar = contextvars.ContextVar(
+    "concall_parser_llm_settings", default=None
+)
+
+
+@contextlib.contextmanager
+def use_llm_settings(settings: LLMSettings | None):
+    """Sends the LLM requests of the block according to settings.
+
+    Like instrumentation, the settings follow the context: they carry into
+    coroutines, tasks and `asyncio.to_thread`, and into threads of a pool
+    whose tasks are run in a copy of the caller's context. None leaves the
+    process-wide defaults in place.
+    """
+    if settings is None:
+        yield
+        return
+    token = _settings.set(settings)
     try:
-        response = client.chat.completions.create(
-            messages=messages,
+        yield
+    finally:
+        _settings.reset(token)
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    """Sets the process-wide cache of LLM responses, None to disable it."""
+    global response_cache
+    response_cache = cache
+
+
+def set_llm_backend(backend: LLMBackend | None) -> None:
+    """Sets the backend LLM requests are sent to, process-wide.
+
+    None goes back to the backend configured by the environment, created on
+    the next request.
+    """
+    global llm_backend
+    llm_backend = backend
+
+
+def get_llm_backend() -> LLMBackend:
+    """Returns the backend every LLM request is sent to, creating it if unset.
+
+    Raises:
+        OSError if no backend is set and the environment does not configure
+        one, i.e. neither LLM_BASE_URL nor GROQ_API_KEY is set.
+    """
+    global llm_backend
+    if llm_backend is None:
+        llm_backend = create_default_backend()
+    return llm_backend
+
+
+def set_scheduler(llm_scheduler: LLMScheduler) -> None:
+    """Sets the scheduler LLM requests go through, process-wide."""
+    global scheduler
+    scheduler = llm_scheduler
+
+
+def get_scheduler() -> LLMScheduler:
+    """Returns the process-wide scheduler LLM requests go through."""
+    return scheduler
+
+
+def _current_cache() -> ResponseCache | None:
+    settings = _settings.get()
+    if settings is not None and settings.response_cache is not None:
+        return settings.response_cache
+    return response_cache
+
+
+def _current_backend() -> LLMBackend:
+    settings = _settings.get()
+    if settings is not None and settings.backend is not None:
+        return settings.backend
+    return get_llm_backend()
+
+
+def _current_scheduler() -> LLMScheduler:
+    settings = _settings.get()
+    if settings is not None and settings.scheduler is not None:
+        return settings.scheduler
+    return scheduler
+
+
+def _estimate_prompt_tokens(messages) -> int:
+    return sum(estimate_tokens(message["content"]) for message in messages)
+
+
+def _get_cached(cache: ResponseCache, key: str, model: str) -> str | None:
+    # A cache that is locked or damaged is skipped, not fatal to the request.
+    try:
+        cached = cache.get(key)
+    except sqlite3.Error:
+        logger.warning(
+            "Response cache unreadable, calling the LLM", exc_info=True
+        )
+        cached = None
+    count(
+        "llm.cache_hits" if cached is not None else "llm.cache_misses",
+        model=model,
+    )
+    return cached
+
+
+def _set_cached(cache: ResponseCache, key: str, content: str) -> None:
+    try:
+        cache.set(key, content)
+    except sqlite3.Error:
+        logger.warning("Could not store the LLM response", exc_info=True)
+
+
+def _count_usage(response, model: str) -> None:
+    """Counts a completed request and the tokens it used."""
+    count("llm.calls", model=model)
+    if response.usage is not None:
+        count("llm.prompt_tokens", response.usage.prompt_tokens, model=model)
+        count(
+            "llm.completion_tokens",
+            response.usage.completion_tokens,
             model=model,
-            temperature=0.3,
-            max_tokens=1024,
-            top_p=1,
-            stop=None,
-            stream=False,
-            response_format={"type": "json_object"},
         )
-        return response.choices[0].message.content
-    except APIStatusError:
+
+
+def _log_failure(exc: Exception, model: str) -> None:
+    count("llm.failures", model=model)
+    if get_status_code(exc) is not None:
         logger.exception("Groq error - check prompt size")
-    except Exception:
+    else:
         logger.exception("Groq response error")
-    return None
+
+
+def get_groq_response(messages, model, priority: int = PRIORITY_NORMAL):
+    """Get response from the LLM backend, served from the response cache if set.
+
+    The request is sent to the backend of the active LLMSettings, or the one
+    set with set_llm_backend, Groq unless configured otherwise. Requests go
+    through the scheduler, which keeps them within the rate limits and
+    retries those that fail with a rate limit or server error. None is
+    returned once retries are used up.
+    """
+    cache = _current_cache()
+    if cache is not None:
+        key = ResponseCache.make_key(model, messages, **SAMPLING_PARAMS)
+        cached = _get_cached(cache, key, model)
+        if cached is not None:
+            return cached
+
+    try:
+        backend = _current_backend()
+        with span("llm.request", model=model):
+            response = _current_scheduler().call(
+                lambda: backend.complete(messages, model, **SAMPLING_PARAMS),
+                tokens=_estimate_prompt_tokens(messages),
+                priority=priority,
+            )
+        _count_usage(response, model)
+        content = response.content
+    except Exception as exc:
+        _log_failure(exc, model)
+        return None
+
+    if cache is not None and content is not None:
+        _set_cached(cache, key, content)
+    return content
+
+
+async def get_groq_response_async(
+    messages,
+    model,
+    semaphore: "asyncio.Semaphore | None" = None,
+    priority: int = PRIORITY_NORMAL,
+):
+    """Get response from the LLM backend without blocking the event loop.
+
+    Same as get_groq_response, through the backend's async client.
+
+    Args:
+        messages: Chat messages of the request.
+        model: Model the request is sent to.
+        semaphore: Bounds the number of requests in flight, shared by every
+            caller that should count against the same limit.
+        priority: Queue priority of the request in the scheduler.
+    """
+    cache = _current_cache()
+    if cache is not None:
+        key = ResponseCache.make_key(model, messages, **SAMPLING_PARAMS)
+        cached = _get_cached(cache, key, model)
+        if cached is not None:
+            return cached
+
+    try:
+        backend = _current_backend()
+        async with semaphore or contextlib.nullcontext():
+            with span("llm.request", model=model):
+                response = await _current_scheduler().acall(
+                    lambda: backend.acomplete(
+                        messages, model, **SAMPLING_PARAMS
+                    ),
+                    tokens=_estimate_prompt_tokens(messages),
+                    priority=priority,
+                )
+        _count_usage(response, model)
+        content = response.content
+    except Exception as exc:
+        _log_failure(exc, model)
+        return None
+
+    if cache is not None and content is not None:
+        _set_cached(cache, key, content)
+    return content
@@ -0,0 +1,146 @@
+import contextlib
+import contextvars
+import threading
+import time
+from collections.abc import Callable
+
+# Called with the metric name, its value, its kind ("span" for durations in
+# seconds, "counter" for increments) and the attributes it was recorded
+# with. Maps directly onto a Prometheus histogram/counter or an
+# OpenTelemetry instrument.
+Hook = Callable[[str, float, str, dict], None]
+
+_current: contextvars.ContextVar = contextvars.ContextVar(
+    "concall_parser_instrumentation", default=None
+)
+hook: Hook | None = None
+
+
+def set_instrumentation_hook(instrumentation_hook: Hook | None) -> None:
+    """Sets the hook every span and counter is exported to, None to unset.
+
+    A parser records spans and counters whenever a hook is set, even if it
+    was not asked to instrument itself.
+    """
+    global hook
+    hook = instrumentation_hook
+
+
+def get_instrumentation_hook() -> Hook | None:
+    """Returns the hook spans and counters are exported to, if any."""
+    return hook
+
+
+class Instrumentation:
+    """Time spent per stage and counts of LLM usage, for one parse.
+
+    Spans of the same name are aggregated into a count, total and maximum
+    duration; counters are summed. Everything recorded is also passed to
+    the hook set with `set_instrumentation_hook`, if any.
+    """
+
+    def __init__(self):
+        """Initialize Instrumentation, empty."""
+        self.spans: dict[str, dict] = {}
+        self.counters: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record_span(self, name: str, seconds: float, attributes: dict) -> None:
+        """Adds a finished span of name that took seconds."""
+        with self._lock:
+            span = self.spans.setdefault(
+                name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            span["count"] += 1
+            span["seconds"] += seconds
+            span["max_seconds"] = max(span["max_seconds"], seconds)
+        if hook is not None:
+            hook(name, seconds, "span", attributes)
+
+    def increment(self, name: str, value: float, attributes: dict) -> None:
+        """Adds value to the counter name."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        if hook is not None:
+            hook(name, value, "counter", attributes)
+
+    def to_dict(self) -> dict:
+        """Returns the spans and counters recorded so far."""
+        with self._lock:
+            return {
+                "spans": {
+                    name: dict(span) for name, span in self.spans.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+
+class _Span:
+    """Times the block it wraps into the active Instrumentation."""
+
+    __slots__ = ("instrumentation", "name", "attributes", "start")
+
+    def __init__(self, instrumentation, name: str, attributes: dict):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.instrumentation.record_span(
+            self.name, time.perf_counter() - self.start, self.attributes
+        )
+
+
+# Shared by every span opened while instrumentation is off, so that a
+# disabled span costs one context variable lookup.
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def get_instrumentation() -> Instrumentation | None:
+    """Returns the Instrumentation of the parse running in this context."""
+    return _current.get()
+
+
+@contextlib.contextmanager
+def activate(instrumentation: Instrumentation | None):
+    """Records spans and counters of the block into instrumentation.
+
+    Activation follows the context: it carries into coroutines, tasks and
+    `asyncio.to_thread`, but not into threads of a pool, whose tasks have to
+    run in a copy of the caller's context (`contextvars.copy_context`).
+    None leaves instrumentation off.
+    """
+    if instrumentation is None:
+        yield
+        return
+    token = _current.set(instrumentation)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def span(name: str, **attributes):
+    """Returns a context manager timing its block as a span named name.
+
+    Does nothing unless an Instrumentation is active.
+
+    Example:
+        with span("segmentation", page=page_number):
+            turns = segment_speakers(text)
+    """
+    instrumentation = _current.get()
+    if instrumentation is None:
+        return _NULL_SPAN
+    return _Span(instrumentation, name, attributes)
+
+
+def count(name: str, value: float = 1, **attributes) -> None:
+    """Adds value to the counter name, if an Instrumentation is active."""
+    instrumentation = _current.get()
+    if instrumentation is not None:
+        instrumentation.increment(name, value, attributes)
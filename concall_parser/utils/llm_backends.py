@@ -0,0 +1,354 @@
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import TYPE_CHECKING, NamedTuple
+
+from concall_parser.config import (
+    get_groq_api_key,
+    get_llm_api_key,
+    get_llm_base_url,
+)
+from concall_parser.utils.response_cache import ResponseCache
+from concall_parser.utils.tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    # Client libraries are imported when a client is first created, so that
+    # importing the package does not pay for them.
+    import httpx
+    from groq import AsyncGroq, Groq
+
+TIMEOUT = 60
+
+
+class LLMUsage(NamedTuple):
+    """Tokens a request used, as reported by the backend."""
+
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+class LLMResponse(NamedTuple):
+    """Text of a chat completion and the tokens it used, if known."""
+
+    content: str | None
+    usage: LLMUsage | None = None
+
+
+def _usage_from(usage) -> LLMUsage | None:
+    """Converts the usage of a provider response, dict or object."""
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        fields = [usage.get(field) for field in LLMUsage._fields]
+    else:
+        fields = [getattr(usage, field, None) for field in LLMUsage._fields]
+    if None in fields:
+        return None
+    return LLMUsage(*fields)
+
+
+class LLMBackend(ABC):
+    """Sends chat completion requests to a language model.
+
+    Every agent reaches the model through the backend of the parser, or the
+    one set with `get_groq_responses.set_llm_backend`, so the same pipeline
+    can run against Groq, a self-hosted model or no model at all. Backends only make
+    the request; caching, rate limits and retries are left to the caller.
+    """
+
+    name: str
+
+    @abstractmethod
+    def complete(self, messages: list[dict], model: str, **params):
+        """Returns the LLMResponse to a chat completion request.
+
+        Args:
+            messages: Chat messages of the request.
+            model: Model the request is sent to.
+            **params: Sampling parameters of the request.
+
+        Raises:
+            The client's error if the request fails, so that the caller can
+            decide whether to retry it.
+        """
+
+    async def acomplete(self, messages: list[dict], model: str, **params):
+        """Async counterpart of `complete`.
+
+        Runs `complete` in a worker thread unless the backend has a native
+        async client.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(self.complete, messages, model, **params)
+
+
+class GroqBackend(LLMBackend):
+    """Groq's hosted models, through the Groq client."""
+
+    name = "groq"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        client: "Groq | None" = None,
+        async_client: "AsyncGroq | None" = None,
+    ):
+        """Initialize GroqBackend.
+
+        Args:
+            api_key: Groq API key, from GROQ_API_KEY by default.
+            client: Client to send requests with, created on first use.
+            async_client: Async client to send requests with, created on
+                first use.
+
+        Raises:
+            OSError if neither an api key nor clients are given and
+            GROQ_API_KEY is not set.
+        """
+        if api_key is None and client is None and async_client is None:
+            api_key = get_groq_api_key()
+        self.api_key = api_key
+        self._client = client
+        self._async_client = async_client
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> "Groq":
+        """The Groq client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                from groq import Groq
+
+                # Retries are left to the scheduler, which paces them across
+                # all requests.
+                self._client = Groq(api_key=self.api_key, max_retries=0)
+            return self._client
+
+    @property
+    def async_client(self) -> "AsyncGroq":
+        """The async Groq client, created on first use."""
+        with self._lock:
+            if self._async_client is None:
+                from groq import AsyncGroq
+
+                self._async_client = AsyncGroq(
+                    api_key=self.api_key, max_retries=0
+                )
+            return self._async_client
+
+    @staticmethod
+    def _to_response(completion) -> LLMResponse:
+        return LLMResponse(
+            content=completion.choices[0].message.content,
+            usage=_usage_from(getattr(completion, "usage", None)),
+        )
+
+    def complete(self, messages: list[dict], model: str, **params):
+        """Sends the request to Groq."""
+        completion = self.client.chat.completions.create(
+            messages=messages, model=model, **params
+        )
+        return self._to_response(completion)
+
+    async def acomplete(self, messages: list[dict], model: str, **params):
+        """Sends the request to Groq without blocking the event loop."""
+        completion = await self.async_client.chat.completions.create(
+            messages=messages, model=model, **params
+        )
+        return self._to_response(completion)
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Any server implementing the OpenAI chat completions endpoint.
+
+    Works with self-hosted model servers such as vLLM, llama.cpp or Ollama,
+    as well as hosted providers with an OpenAI-compatible API.
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        timeout: float = TIMEOUT,
+    ):
+        """Initialize OpenAICompatibleBackend.
+
+        Args:
+            base_url: Base url of the API, the part before
+                /chat/completions, e.g. http://localhost:8000/v1.
+            api_key: Bearer token sent with each request, if the server
+                needs one.
+            timeout: Seconds to wait for a response.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self._client: "httpx.Client | None" = None
+        self._async_client: "httpx.AsyncClient | None" = None
+        self._lock = threading.Lock()
+
+    def _client_kwargs(self) -> dict:
+        headers = {}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return {
+            "base_url": self.base_url,
+            "headers": headers,
+            "timeout": self.timeout,
+        }
+
+    @property
+    def client(self) -> "httpx.Client":
+        """The pooled HTTP client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                import httpx
+
+                self._client = httpx.Client(**self._client_kwargs())
+            return self._client
+
+    @property
+    def async_client(self) -> "httpx.AsyncClient":
+        """The pooled async HTTP client, created on first use."""
+        with self._lock:
+            if self._async_client is None:
+                import httpx
+
+                self._async_client = httpx.AsyncClient(**self._client_kwargs())
+            return self._async_client
+
+    @staticmethod
+    def _payload(messages: list[dict], model: str, params: dict) -> dict:
+        # Servers differ in how they treat explicit nulls, so leave them out.
+        return {
+            "model": model,
+            "messages": messages,
+            **{
+                key: value for key, value in params.items() if value is not None
+            },
+        }
+
+    @staticmethod
+    def _to_response(response: "httpx.Response") -> LLMResponse:
+        response.raise_for_status()
+        data = response.json()
+        return LLMResponse(
+            content=data["choices"][0]["message"]["content"],
+            usage=_usage_from(data.get("usage")),
+        )
+
+    def complete(self, messages: list[dict], model: str, **params):
+        """Posts the request to the server's chat completions endpoint."""
+        response = self.client.post(
+            "/chat/completions", json=self._payload(messages, model, params)
+        )
+        return self._to_response(response)
+
+    async def acomplete(self, messages: list[dict], model: str, **params):
+        """Posts the request without blocking the event loop."""
+        response = await self.async_client.post(
+            "/chat/completions", json=self._payload(messages, model, params)
+        )
+        return self._to_response(response)
+
+
+Responder = str | Callable[[list[dict], str], str]
+
+
+class OfflineBackend(LLMBackend):
+    """Deterministic backend that answers without any network access.
+
+    Answers come from recorded responses, looked up by the same key as the
+    response cache, then from rules matched against the last message, then
+    from a default. Throughput tests and benchmarks can run on it in CI, and
+    the same prompt always gets the same answer.
+
+    Example:
+        backend = OfflineBackend(
+            rules=[(r"first question", '{"intent": "new_analyst_start"}')],
+        )
+    """
+
+    name = "offline"
+
+    def __init__(
+        self,
+        rules: list[tuple[str, Responder]] | None = None,
+        recordings: dict[str, str] | None = None,
+        default: str | None = "{}",
+    ):
+        """Initialize OfflineBackend.
+
+        Args:
+            rules: Pairs of a regex, searched for in the content of the last
+                message, and the answer: a string, or a function of the
+                messages and model returning one. The first match answers.
+            recordings: Answers keyed by `ResponseCache.make_key` of the
+                model, messages and sampling parameters.
+            default: Answer when no recording or rule matches, None to raise
+                LookupError instead.
+        """
+        self.rules = [
+            (re.compile(pattern), responder)
+            for pattern, responder in rules or []
+        ]
+        self.recordings = dict(recordings or {})
+        self.default = default
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, messages: list[dict], model: str, params: dict) -> str:
+        key = ResponseCache.make_key(model, messages, **params)
+        if key in self.recordings:
+            return self.recordings[key]
+        text = messages[-1]["content"] if messages else ""
+        for pattern, responder in self.rules:
+            if pattern.search(text):
+                if callable(responder):
+                    return responder(messages, model)
+                return responder
+        if self.default is None:
+            raise LookupError(f"No offline answer for prompt {key}")
+        return self.default
+
+    def complete(self, messages: list[dict], model: str, **params):
+        """Answers the request from recordings, rules or the default."""
+        with self._lock:
+            self.calls += 1
+        content = self._answer(messages, model, params)
+        prompt_tokens = sum(
+            estimate_tokens(message["content"]) for message in messages
+        )
+        completion_tokens = estimate_tokens(content)
+        return LLMResponse(
+            content=content,
+            usage=LLMUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    async def acomplete(self, messages: list[dict], model: str, **params):
+        """Answers the request; offline answers never block."""
+        return self.complete(messages, model, **params)
+
+
+def create_default_backend() -> LLMBackend:
+    """Returns the backend configured by the environment.
+
+    An OpenAI-compatible server if LLM_BASE_URL is set, authenticated with
+    LLM_API_KEY if that is set too; Groq otherwise.
+
+    Raises:
+        OSError if Groq is to be used and GROQ_API_KEY is not set.
+    """
+    base_url = get_llm_base_url()
+    if base_url:
+        return OpenAICompatibleBackend(base_url, api_key=get_llm_api_key())
+    return GroqBackend()
@@ -0,0 +1,213 @@
+import io
+import re
+import threading
+from abc import ABC, abstractmethod
+from typing import IO
+
+from concall_parser.log_config import logger
+
+# Glyphs without a unicode mapping, e.g. "(cid:45)" in place of "ti".
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+# Two or more consecutive lines holding only a speaker label: the labels sat
+# in their own column and were read apart from what they introduce.
+STACKED_LABELS_PATTERN = re.compile(
+    r"^[ \t]*[A-Za-z][A-Za-z. ]*:[ \t]*\n[ \t]*[A-Za-z][A-Za-z. ]*:[ \t]*$",
+    re.MULTILINE,
+)
+# A speaker label run into the end of the previous sentence, with the
+# newline before it lost.
+INLINE_LABEL_PATTERN = re.compile(
+    r"[.?!][ \t]+(?:Moderator|[A-Z][a-z]+(?:[ \t]+[A-Z][a-z]+){1,3}):[ \t]"
+)
+TRAILING_SPACES_PATTERN = re.compile(r"[ \t]+\n")
+# pdfium is not thread-safe, so calls into it from threads of one process,
+# such as concurrent downloads, are made one at a time.
+_pdfium_lock = threading.RLock()
+
+
+def is_degraded(text: str) -> bool:
+    """Returns whether page text is too garbled to find speaker turns in.
+
+    Args:
+        text: Text of a single page, as extracted by a fast backend.
+
+    Returns:
+        bool: True if the page should be extracted again with pdfplumber.
+    """
+    return bool(
+        CID_PATTERN.search(text)
+        or STACKED_LABELS_PATTERN.search(text)
+        or INLINE_LABEL_PATTERN.search(text)
+    )
+
+
+class PdfBackend(ABC):
+    """Extracts text from the pages of an open pdf document."""
+
+    name: str
+
+    @property
+    @abstractmethod
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+
+    @abstractmethod
+    def extract_page(self, index: int) -> str:
+        """Returns the text of the page at index, counting from 0."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases the document."""
+
+    def __enter__(self):
+        """Returns the backend itself."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Closes the document."""
+        self.close()
+
+
+class PdfplumberBackend(PdfBackend):
+    """Layout-aware extraction with pdfplumber; accurate but slow."""
+
+    name = "pdfplumber"
+
+    def __init__(self, source: str | bytes | IO[bytes]):
+        """Opens a pdf from a path, bytes or binary file object."""
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        # Imported on first open, as is pypdfium2, so that importing the
+        # package does not pay for them.
+        import pdfplumber
+
+        self._pdf = pdfplumber.open(source)
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        return len(self._pdf.pages)
+
+    def extract_page(self, index: int) -> str:
+        """Returns the text of the page at index, counting from 0."""
+        page = self._pdf.pages[index]
+        text = page.extract_text()
+        page.close()
+        return text or ""
+
+    def close(self) -> None:
+        """Releases the document."""
+        self._pdf.close()
+
+
+class PdfiumBackend(PdfBackend):
+    """Native text extraction with pdfium; many times faster than pdfplumber.
+
+    Text follows the order of the content stream, so columns such as speaker
+    labels set in a margin may be read apart from their text. Documents are
+    extracted in parallel across processes, not threads: pdfium calls of one
+    process share a lock.
+    """
+
+    name = "pdfium"
+
+    def __init__(self, source: str | bytes | IO[bytes]):
+        """Opens a pdf from a path, bytes or binary file object."""
+        import pypdfium2
+
+        with _pdfium_lock:
+            self._pdf = pypdfium2.PdfDocument(source)
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        with _pdfium_lock:
+            return len(self._pdf)
+
+    def extract_page(self, index: int) -> str:
+        """Returns the text of the page at index, counting from 0."""
+        with _pdfium_lock:
+            page = self._pdf[index]
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return TRAILING_SPACES_PATTERN.sub("\n", text).strip()
+
+    def close(self) -> None:
+        """Releases the document."""
+        with _pdfium_lock:
+            self._pdf.close()
+
+
+class AutoBackend(PdfBackend):
+    """Extracts with pdfium, falling back to pdfplumber for degraded pages.
+
+    Every page is extracted with pdfium first; pages that look degraded
+    (see `is_degraded`) are extracted again with pdfplumber, which is only
+    opened if such a page turns up.
+    """
+
+    name = "auto"
+
+    def __init__(self, source: str | bytes | IO[bytes]):
+        """Opens a pdf from a path, bytes or binary file object."""
+        if not isinstance(source, str | bytes):
+            source = source.read()
+        self._source = source
+        self._fast = PdfiumBackend(source)
+        self._accurate: PdfplumberBackend | None = None
+        self.fallback_pages: list[int] = []
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        return self._fast.page_count
+
+    def extract_page(self, index: int) -> str:
+        """Returns the text of the page at index, counting from 0."""
+        text = self._fast.extract_page(index)
+        if not is_degraded(text):
+            return text
+
+        logger.debug("Page %d degraded, extracting with pdfplumber", index)
+        if self._accurate is None:
+            self._accurate = PdfplumberBackend(self._source)
+        self.fallback_pages.append(index)
+        return self._accurate.extract_page(index)
+
+    def close(self) -> None:
+        """Releases the document."""
+        self._fast.close()
+        if self._accurate is not None:
+            self._accurate.close()
+
+
+PDF_BACKENDS = {
+    backend.name: backend
+    for backend in (PdfplumberBackend, PdfiumBackend, AutoBackend)
+}
+
+
+def open_pdf(
+    source: str | bytes | IO[bytes], backend: str = "pdfplumber"
+) -> PdfBackend:
+    """Opens a pdf with the named text extraction backend.
+
+    Args:
+        source: Path to the pdf file, its bytes, or a binary file object.
+        backend: One of "pdfplumber", "pdfium" or "auto".
+
+    Returns:
+        PdfBackend: The opened document.
+
+    Raises:
+        ValueError if the backend name is unknown.
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(
+            f"Unknown pdf backend {backend!r}, expected one of "
+            f"{', '.join(PDF_BACKENDS)}."
+        )
+    return PDF_BACKENDS[backend](source)
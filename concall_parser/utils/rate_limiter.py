@@ -0,0 +1,338 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from concall_parser.log_config import logger
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# How often async waiters that are not at the head of the queue look again.
+POLL_INTERVAL = 0.01
+
+
+def get_status_code(exc: Exception) -> int | None:
+    """Returns the HTTP status of a failed LLM request, None if it had none.
+
+    Works for errors of the Groq client and of httpx alike, without
+    importing either.
+    """
+    response = getattr(exc, "response", None)
+    status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Returns whether a failed LLM request is worth sending again."""
+    status_code = get_status_code(exc)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    # Only failed requests get here, by then the clients are imported.
+    import httpx
+    from groq import APIConnectionError
+
+    return isinstance(exc, APIConnectionError | httpx.TransportError)
+
+
+def get_retry_after(exc: Exception) -> float | None:
+    """Returns the seconds to wait a rate limited response asks for, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / scale)
+        except ValueError:
+            # An HTTP date, which providers rarely send; use backoff instead.
+            continue
+    return None
+
+
+class TokenBucket:
+    """Budget that refills continuously up to a capacity.
+
+    The level may go negative when a request turns out to cost more than was
+    reserved for it; the debt is paid off by refilling before anything else
+    is let through.
+    """
+
+    def __init__(self, capacity: float, per_second: float, now: float):
+        """Initialize TokenBucket, full.
+
+        Args:
+            capacity: Largest amount the bucket holds.
+            per_second: Amount added back every second.
+            now: Current time, in seconds of the scheduler's clock.
+        """
+        self.capacity = capacity
+        self.per_second = per_second
+        self.level = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.level = min(self.capacity, self.level + elapsed * self.per_second)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Returns seconds until amount can be taken, 0 if it can be now."""
+        self._refill(now)
+        # Requests larger than the whole bucket go through once it is full.
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.per_second
+
+    def consume(self, amount: float, now: float) -> None:
+        """Takes amount out of the bucket."""
+        self._refill(now)
+        self.level -= amount
+
+
+class LLMScheduler:
+    """Central gate for LLM requests: rate limits, priorities and retries.
+
+    Requests wait in a priority queue until the requests-per-minute and
+    tokens-per-minute budgets allow them through, highest priority (lowest
+    number) first and in arrival order within a priority. Failed requests
+    that can succeed later are retried with jittered exponential backoff; a
+    rate limited response pauses every waiting request for as long as its
+    retry-after header asks.
+
+    Queue depth, wait times and retries are reported by `stats`.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        """Initialize LLMScheduler.
+
+        Args:
+            requests_per_minute: Request budget, None for no limit.
+            tokens_per_minute: Token budget, None for no limit. Requests
+                reserve their estimated prompt tokens and are charged the
+                difference once the response reports its usage.
+            max_retries: Times a failed request is sent again.
+            base_delay: Backoff before the first retry, in seconds; doubled
+                for every retry after.
+            max_delay: Longest backoff between retries, in seconds.
+            clock: Monotonic clock, in seconds.
+            sleep: Blocking sleep used between retries.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self.sleep = sleep
+
+        now = clock()
+        self._request_bucket = None
+        if requests_per_minute:
+            self._request_bucket = TokenBucket(
+                requests_per_minute, requests_per_minute / 60, now
+            )
+        self._token_bucket = None
+        if tokens_per_minute:
+            self._token_bucket = TokenBucket(
+                tokens_per_minute, tokens_per_minute / 60, now
+            )
+
+        self._condition = threading.Condition()
+        self._queue: list[tuple[int, int]] = []
+        self._tickets = itertools.count()
+        self._paused_until = 0.0
+        self._stats = {
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "max_queue_depth": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def _enqueue(self, priority: int) -> tuple[int, int]:
+        ticket = (priority, next(self._tickets))
+        heapq.heappush(self._queue, ticket)
+        self._stats["max_queue_depth"] = max(
+            self._stats["max_queue_depth"], len(self._queue)
+        )
+        return ticket
+
+    def _dequeue(self, ticket: tuple[int, int]) -> None:
+        self._queue.remove(ticket)
+        heapq.heapify(self._queue)
+        self._condition.notify_all()
+
+    def _try_acquire(
+        self, ticket: tuple[int, int], tokens: int
+    ) -> float | None:
+        """Takes a ticket's budget if it may go now, else returns the wait.
+
+        Must be called with the lock held. Returns 0 once acquired, the
+        seconds until the budget allows it if the ticket is at the head of
+        the queue, and None if requests ahead of it are still waiting.
+        """
+        if self._queue[0] != ticket:
+            return None
+        now = self.clock()
+        wait = self._paused_until - now
+        if self._request_bucket is not None:
+            wait = max(wait, self._request_bucket.wait_time(1, now))
+        if self._token_bucket is not None:
+            wait = max(wait, self._token_bucket.wait_time(tokens, now))
+        if wait > 0:
+            return wait
+
+        if self._request_bucket is not None:
+            self._request_bucket.consume(1, now)
+        if self._token_bucket is not None:
+            self._token_bucket.consume(tokens, now)
+        heapq.heappop(self._queue)
+        self._condition.notify_all()
+        return 0.0
+
+    def _record_wait(self, started: float) -> None:
+        waited = self.clock() - started
+        with self._condition:
+            self._stats["requests"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(
+                self._stats["wait_seconds_max"], waited
+            )
+
+    def acquire(self, tokens: int = 0, priority: int = PRIORITY_NORMAL) -> None:
+        """Blocks until a request of `tokens` tokens may be sent."""
+        started = self.clock()
+        with self._condition:
+            ticket = self._enqueue(priority)
+            try:
+                while (wait := self._try_acquire(ticket, tokens)) != 0:
+                    self._condition.wait(timeout=wait)
+            except BaseException:
+                self._dequeue(ticket)
+                raise
+        self._record_wait(started)
+
+    async def acquire_async(
+        self, tokens: int = 0, priority: int = PRIORITY_NORMAL
+    ) -> None:
+        """Waits, without blocking the event loop, until a request may go."""
+        import asyncio
+
+        started = self.clock()
+        with self._condition:
+            ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_acquire(ticket, tokens)
+                if wait == 0:
+                    break
+                await asyncio.sleep(POLL_INTERVAL if wait is None else wait)
+        except BaseException:
+            with self._condition:
+                if ticket in self._queue:
+                    self._dequeue(ticket)
+            raise
+        self._record_wait(started)
+
+    def _settle_tokens(self, reserved: int, response) -> None:
+        """Charges the token budget the difference to the reported usage."""
+        usage = getattr(response, "usage", None)
+        used = getattr(usage, "total_tokens", None)
+        if self._token_bucket is None or used is None:
+            return
+        with self._condition:
+            self._token_bucket.consume(used - reserved, self.clock())
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> float:
+        """Returns the wait before retrying a failed request.
+
+        A retry-after asked for by the provider is honoured, and pauses all
+        other requests too; otherwise the backoff doubles with each attempt,
+        jittered so that failed requests do not retry in lockstep.
+        """
+        retry_after = get_retry_after(exc)
+        backoff = min(self.max_delay, self.base_delay * 2**attempt)
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.base_delay / 10)
+
+        with self._condition:
+            self._stats["retries"] += 1
+            if get_status_code(exc) == 429:
+                self._stats["rate_limited"] += 1
+                self._paused_until = max(
+                    self._paused_until, self.clock() + delay
+                )
+        logger.warning("LLM request failed (%s), retrying in %.1fs", exc, delay)
+        return delay
+
+    def call(self, func, tokens: int = 0, priority: int = PRIORITY_NORMAL):
+        """Sends a request through the scheduler, retrying if it fails.
+
+        Args:
+            func: Makes the request and returns the response.
+            tokens: Estimated tokens of the request.
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW.
+
+        Returns:
+            The response of func.
+
+        Raises:
+            The last exception of func, once it is not retryable or retries
+            are used up.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority)
+            try:
+                response = func()
+            except Exception as exc:
+                if attempt == self.max_retries or not is_retryable(exc):
+                    raise
+                self.sleep(self._retry_delay(exc, attempt))
+                continue
+            self._settle_tokens(tokens, response)
+            return response
+
+    async def acall(
+        self, func, tokens: int = 0, priority: int = PRIORITY_NORMAL
+    ):
+        """Async counterpart of `call`, for a func returning an awaitable."""
+        import asyncio
+
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(tokens, priority)
+            try:
+                response = await func()
+            except Exception as exc:
+                if attempt == self.max_retries or not is_retryable(exc):
+                    raise
+                await asyncio.sleep(self._retry_delay(exc, attempt))
+                continue
+            self._settle_tokens(tokens, response)
+            return response
+
+    def stats(self) -> dict:
+        """Returns queue depth, wait times, and request and retry counts."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._queue)
+        requests = stats["requests"]
+        stats["wait_seconds_mean"] = (
+            stats["wait_seconds_total"] / requests if requests else 0.0
+        )
+        return stats
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from concall_parser.log_config import logger
+
+
+class ResponseCache:
+    """On-disk cache of LLM responses, stored in a SQLite database.
+
+    Entries are keyed by a hash of the model, messages and sampling parameters
+    of a request, so byte-identical prompts are answered from disk. The cache
+    holds at most `max_entries` responses and evicts the least recently used
+    ones first; entries older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10_000,
+        ttl: float | None = None,
+    ):
+        """Initialize ResponseCache.
+
+        Args:
+            path: Path of the SQLite database file, created if missing.
+            max_entries: Maximum number of responses kept on disk.
+            ttl: Seconds after which a cached response expires, None to keep
+                responses until they are evicted.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, "
+                "response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_access "
+                "ON responses (last_access)"
+            )
+
+    @staticmethod
+    def make_key(model: str, messages: list[dict], **params) -> str:
+        """Returns the cache key of a request.
+
+        Args:
+            model: Model the request is sent to.
+            messages: Chat messages of the request.
+            **params: Sampling parameters of the request.
+
+        Returns:
+            str: SHA-256 hex digest of the canonical JSON of the request.
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached response for key, or None on a miss."""
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None and self.ttl is not None:
+                if now - row[1] > self.ttl:
+                    self._connection.execute(
+                        "DELETE FROM responses WHERE key = ?", (key,)
+                    )
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (now, key),
+            )
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """Stores a response, evicting the least recently used ones if full."""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+            if count > self.max_entries:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses "
+                    "ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                logger.debug(
+                    "Evicted %d cached responses", count - self.max_entries
+                )
+
+    def clear(self) -> None:
+        """Removes every cached response and resets the counters."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns hit and miss counters and the number of cached responses."""
+        with self._lock:
+            (entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """Closes the underlying database connection."""
+        self._connection.close()
@@ -0,0 +1,163 @@
+import re
+from collections.abc import Iterator, Mapping
+from typing import NamedTuple
+
+from concall_parser.utils.instrumentation import span
+from concall_parser.utils.transcript_buffer import TranscriptBuffer
+
+# A speaker label is a run of letters and whitespace terminated by a colon.
+# Runs are matched maximally, so every character of the text is visited by
+# this pattern exactly once.
+LABEL_RUN = re.compile(r"[A-Za-z\s]+")
+LEADING_WHITESPACE = re.compile(r"\s*")
+NON_SPACE = re.compile(r"\S")
+
+# A speaker label that starts a line: an optional title, which is left out
+# of the speaker, then up to five capitalised name words, each of which may
+# follow initials, as in "Sh B. Srinivasan:", "Mr. A Smith:" or "Moderator:".
+# Used wherever labels are read line by line, i.e. to tell whether a call is
+# moderated and to split calls without a moderator, so the two agree. Every
+# part is bounded by the line, so a text is scanned once, in linear time.
+# Moderated calls are segmented with LABEL_RUN instead, which finds labels
+# anywhere, as the legacy extractor did.
+TITLE = r"(?:(?:Sh|Shri|Smt|Mr|Mrs|Ms|Dr|Prof)\.?[ \t]+)?"
+NAME_WORD = r"(?:[A-Z]\.[ \t]*)*[A-Z][A-Za-z'’-]*"
+SPEAKER_LABEL_PATTERN = re.compile(
+    rf"^[ \t]*{TITLE}(?P<speaker>{NAME_WORD}(?:[ \t]+{NAME_WORD}){{0,4}})"
+    r"[ \t]*:",
+    re.MULTILINE,
+)
+
+
+class SpeakerTurn(NamedTuple):
+    """A single speaker turn, as offsets into the segmented text.
+
+    Attributes:
+        speaker: Stripped speaker label, e.g. "Moderator".
+        start: Offset where the speaker label starts.
+        dialogue_start: Offset where the spoken text starts.
+        end: Offset where the spoken text ends (exclusive).
+    """
+
+    speaker: str
+    start: int
+    dialogue_start: int
+    end: int
+
+
+def _label_runs(text: str, pos: int, endpos: int):
+    """Yields (start, colon) offsets of letter runs followed by a colon."""
+    for run in LABEL_RUN.finditer(text, pos, endpos):
+        colon = run.end()
+        if colon < endpos and text[colon] == ":":
+            yield run.start(), colon
+
+
+def iter_speaker_turns(text: str, pos: int = 0, endpos: int | None = None):
+    r"""Splits text into speaker turns in a single linear pass.
+
+    Produces the same turns as running the legacy pattern
+    `(?P<speaker>[A-Za-z\s]+):\s*(?P<dialogue>(?:.*(?:\n(?![A-Za-z\s]+:).*)*)*)`
+    through `finditer`, without its backtracking. A turn's dialogue runs line
+    by line until a line starts with a speaker label; label runs are found
+    once up front and consumed in order, so no character is rescanned.
+
+    Args:
+        text: Text to segment, usually a single page of the transcript.
+        pos: Offset to start segmenting from.
+        endpos: Offset to stop segmenting at, defaults to the end of text.
+
+    Yields:
+        SpeakerTurn for every speaker label found, in order.
+    """
+    endpos = len(text) if endpos is None else endpos
+    runs = _label_runs(text, pos, endpos)
+    run = next(runs, None)
+    search_from = pos
+
+    while run is not None:
+        run_start, colon = run
+        if colon <= search_from:
+            run = next(runs, None)
+            continue
+
+        label_start = max(run_start, search_from)
+        dialogue_start = LEADING_WHITESPACE.match(text, colon + 1, endpos).end()
+        end = endpos
+        line_end = text.find("\n", dialogue_start, endpos)
+
+        run = None
+        if line_end != -1:
+            # The dialogue stops at the first newline that sits inside a label
+            # run, i.e. the next line starts with "<letters>:".
+            for next_start, next_colon in runs:
+                if next_colon <= line_end + 1:
+                    continue
+                boundary = text.find(
+                    "\n", max(next_start, line_end), next_colon - 1
+                )
+                if boundary != -1:
+                    end = boundary
+                    run = (next_start, next_colon)
+                    break
+
+        yield SpeakerTurn(
+            speaker=text[label_start:colon].strip(),
+            start=label_start,
+            dialogue_start=dialogue_start,
+            end=end,
+        )
+        search_from = end
+
+
+def segment_speakers(
+    text: str, pos: int = 0, endpos: int | None = None
+) -> list[SpeakerTurn]:
+    """Returns all speaker turns found in text, see `iter_speaker_turns`."""
+    return list(iter_speaker_turns(text, pos, endpos))
+
+
+def iter_transcript_turns(
+    transcript: Mapping[int, str], buffer: TranscriptBuffer
+) -> Iterator[SpeakerTurn]:
+    """Splits a whole transcript into speaker turns in a single pass.
+
+    Pages are read in order and appended to buffer, and turns are offsets
+    into it. Each page is segmented as `segment_speakers` would segment it
+    alone; text before the first speaker label of a page continues the
+    last turn of the page before, so a turn spanning pages comes out once,
+    ending where its speech does. A turn is yielded once the page after it
+    shows whether it continues.
+
+    Args:
+        transcript: Page number, page text pairs, in reading order.
+        buffer: Empty buffer the pages are appended to.
+
+    Yields:
+        SpeakerTurn for every speaker label found, with buffer offsets.
+    """
+    last = None
+    for page_number, text in transcript.items():
+        offset = buffer.append(page_number, text)
+        with span("segmentation"):
+            turns = segment_speakers(text)
+
+        leftover_end = turns[0].start if turns else len(text)
+        if last is not None and NON_SPACE.search(text, 0, leftover_end):
+            last = last._replace(end=offset + leftover_end)
+        if not turns:
+            continue
+
+        if last is not None:
+            yield last
+        for turn in turns:
+            last = SpeakerTurn(
+                speaker=turn.speaker,
+                start=offset + turn.start,
+                dialogue_start=offset + turn.dialogue_start,
+                end=offset + turn.end,
+            )
+            if turn is not turns[-1]:
+                yield last
+    if last is not None:
+        yield last
@@ -0,0 +1,130 @@
+import math
+import re
+
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Context window sizes, in tokens, of the Groq models we use.
+MODEL_CONTEXT_WINDOWS = {
+    "llama3-70b-8192": 8192,
+    "llama3-8b-8192": 8192,
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "gemma2-9b-it": 8192,
+    "mixtral-8x7b-32768": 32768,
+}
+
+# Llama-family tokenizers average about four characters of English per token.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Returns a rough, slightly pessimistic token count for text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def get_context_window(model: str) -> int:
+    """Returns the context window of a model, in tokens."""
+    return MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+
+
+# Our estimate is rough, so prompts are held below the true limit by this
+# fraction; tables and numbers tokenize denser than prose.
+PROMPT_SAFETY_MARGIN = 0.9
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.?!])\s+")
+ELLIPSIS = " ... "
+
+
+def get_prompt_budget(
+    model: str, system_prompt: str, max_completion_tokens: int
+) -> int:
+    """Returns the tokens left for the user message of a request.
+
+    Args:
+        model: Model the request is sent to.
+        system_prompt: System message sent along with the user message.
+        max_completion_tokens: Tokens reserved for the reply.
+
+    Returns:
+        int: Estimated tokens the user message may take.
+    """
+    available = get_context_window(model) - max_completion_tokens
+    return int(available * PROMPT_SAFETY_MARGIN) - estimate_tokens(
+        system_prompt
+    )
+
+
+def trim_to_budget(text: str, max_tokens: int) -> str:
+    """Shortens text to its leading and trailing sentences.
+
+    Sentences are taken alternately from the start and the end of the text
+    until the budget is spent, and the middle is replaced by an ellipsis.
+    Text that already fits is returned unchanged.
+
+    Args:
+        text: Text to shorten.
+        max_tokens: Estimated tokens the result may take.
+
+    Returns:
+        str: The shortened text.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(ELLIPSIS)
+    sentences = SENTENCE_BOUNDARY.split(text.strip())
+    head, tail = [], []
+    used = 0
+    start, end = 0, len(sentences) - 1
+    take_head = True
+    while start <= end:
+        sentence = sentences[start] if take_head else sentences[end]
+        if used + len(sentence) + 1 > max_chars:
+            break
+        used += len(sentence) + 1
+        if take_head:
+            head.append(sentence)
+            start += 1
+        else:
+            tail.append(sentence)
+            end -= 1
+        take_head = not take_head
+
+    if not head and not tail:
+        # A single sentence longer than the budget: keep both of its ends.
+        half = max(0, max_chars // 2)
+        return text[:half] + ELLIPSIS + text[len(text) - half :]
+    return " ".join(head) + ELLIPSIS + " ".join(reversed(tail))
+
+
+def split_into_chunks(text: str, max_tokens: int) -> list[str]:
+    """Splits text at line breaks into chunks that fit a token budget.
+
+    Lines longer than the budget on their own are cut at the budget.
+
+    Args:
+        text: Text to split.
+        max_tokens: Estimated tokens each chunk may take.
+
+    Returns:
+        list[str]: Chunks in order, a single one if the text already fits.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:max_chars])
+            line = line[max_chars:]
+        if len(current) + len(line) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current:
+        chunks.append(current)
+    return chunks
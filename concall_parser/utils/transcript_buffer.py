@@ -0,0 +1,78 @@
+import bisect
+from collections.abc import Iterator
+
+
+class TranscriptBuffer:
+    """The pages of a transcript laid end to end, addressed by offset.
+
+    Offset 0 is the start of the first page and every page starts where the
+    one before it ends. Page start offsets are kept sorted, so the page of
+    any offset is found by binary search. Pages are stored as the strings
+    they were read as and appended as a walk reaches them, so a lazily
+    extracted transcript is still only read as far as it is walked.
+
+    Example:
+        buffer = TranscriptBuffer()
+        buffer.append(1, "Moderator: Welcome.")
+        buffer.append(2, "Rahul Jain: Thank you.")
+        buffer.page_number_at(25)  # 2
+    """
+
+    def __init__(self):
+        """Initialize TranscriptBuffer, empty."""
+        self.page_numbers: list[int] = []
+        self.page_starts: list[int] = []
+        self.pages: list[str] = []
+        self.length = 0
+
+    def __len__(self) -> int:
+        """Returns the number of characters in the buffer."""
+        return self.length
+
+    def append(self, page_number: int, text: str) -> int:
+        """Adds a page at the end of the buffer, returns its start offset."""
+        start = self.length
+        self.page_numbers.append(page_number)
+        self.page_starts.append(start)
+        self.pages.append(text)
+        self.length += len(text)
+        return start
+
+    def page_index(self, offset: int) -> int:
+        """Returns the position in the buffer of the page holding offset."""
+        if not 0 <= offset < self.length:
+            raise IndexError(f"Offset {offset} is outside the buffer")
+        return bisect.bisect_right(self.page_starts, offset) - 1
+
+    def page_number_at(self, offset: int) -> int:
+        """Returns the number of the page holding offset."""
+        return self.page_numbers[self.page_index(offset)]
+
+    def page_end(self, index: int) -> int:
+        """Returns the offset where the index-th page ends (exclusive)."""
+        return self.page_starts[index] + len(self.pages[index])
+
+    def iter_parts(
+        self, start: int, end: int, index: int | None = None
+    ) -> Iterator[str]:
+        """Yields the text between start and end, one part per page.
+
+        Args:
+            start: Offset of the first character.
+            end: Offset after the last character.
+            index: Position of the page the text starts on, the page holding
+                start by default. Needed when start is the end of its page.
+        """
+        if index is None:
+            index = self.page_index(start)
+        while True:
+            page_start = self.page_starts[index]
+            yield self.pages[index][start - page_start : end - page_start]
+            index += 1
+            if index == len(self.pages) or self.page_starts[index] >= end:
+                return
+            start = self.page_starts[index]
+
+    def text(self, start: int, end: int) -> str:
+        """Returns the text between start and end."""
+        return "".join(self.iter_parts(start, end))
@@ -0,0 +1,226 @@
+import hashlib
+import mmap
+import os
+import struct
+import time
+from typing import IO
+
+from concall_parser.log_config import logger
+from concall_parser.utils.disk_store import (
+    evict_least_recently_used,
+    list_by_last_access,
+    remove_file,
+    write_atomic,
+)
+
+# Bump whenever a change to text extraction or page numbering would make
+# previously cached transcripts differ from freshly extracted ones.
+EXTRACTOR_VERSION = "1"
+
+# File layout: magic, page count, (page count + 1) byte offsets into the
+# UTF-8 text that follows, so any page is a slice of the memory-mapped file.
+MAGIC = b"CCTR0001"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<Q")
+SUFFIX = ".cctr"
+
+
+def hash_pdf(source: str | bytes | IO[bytes], chunk_size: int = 1 << 20) -> str:
+    """Returns the SHA-256 hex digest of a pdf.
+
+    Args:
+        source: Path to the pdf file, its bytes, or a binary file object,
+            which is read from its current position and rewound after.
+        chunk_size: Number of bytes hashed at a time.
+
+    Returns:
+        str: Hex digest of the pdf bytes.
+    """
+    if isinstance(source, bytes):
+        return hashlib.sha256(source).hexdigest()
+    digest = hashlib.sha256()
+    if isinstance(source, str):
+        with open(source, "rb") as file:
+            while chunk := file.read(chunk_size):
+                digest.update(chunk)
+    else:
+        position = source.tell()
+        while chunk := source.read(chunk_size):
+            digest.update(chunk)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def _encode(transcript: dict[int, str]) -> bytes:
+    """Serializes a transcript into the cache file layout."""
+    texts = [transcript[page] for page in sorted(transcript)]
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    return b"".join(
+        [
+            HEADER.pack(MAGIC, len(encoded)),
+            b"".join(OFFSET.pack(offset) for offset in offsets),
+            *encoded,
+        ]
+    )
+
+
+def _decode(buffer) -> dict[int, str]:
+    """Reads a transcript from a buffer in the cache file layout."""
+    magic, page_count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a cached transcript")
+    offsets_start = HEADER.size
+    text_start = offsets_start + OFFSET.size * (page_count + 1)
+    offsets = [
+        OFFSET.unpack_from(buffer, offsets_start + OFFSET.size * index)[0]
+        for index in range(page_count + 1)
+    ]
+    if text_start + offsets[-1] != len(buffer):
+        raise ValueError("Truncated cached transcript")
+    return {
+        page: buffer[text_start + start : text_start + stop].decode("utf-8")
+        for page, (start, stop) in enumerate(zip(offsets, offsets[1:]), start=1)
+    }
+
+
+class TranscriptCache:
+    """On-disk cache of extracted transcripts, keyed by pdf content.
+
+    Each transcript is stored in its own file, named by the SHA-256 of the
+    pdf bytes, the extraction backend and EXTRACTOR_VERSION, so a pdf is
+    found again wherever it was downloaded to and stale extractions are never
+    served. Files hold page texts with an offset index and are read through
+    mmap. The cache holds at most `max_bytes` and evicts the least recently
+    used transcripts first.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        """Initialize TranscriptCache.
+
+        Args:
+            directory: Directory holding the cached transcripts, created if
+                missing.
+            max_bytes: Maximum total size of the cached transcripts.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_hash: str, backend: str = "pdfplumber") -> str:
+        """Returns the cache key of a pdf extracted with a backend.
+
+        Args:
+            pdf_hash: SHA-256 hex digest of the pdf bytes, see hash_pdf.
+            backend: Name of the text extraction backend.
+
+        Returns:
+            str: SHA-256 hex digest identifying the cached transcript.
+        """
+        payload = f"{pdf_hash}:{backend}:{EXTRACTOR_VERSION}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key: str) -> dict[int, str] | None:
+        """Returns the cached transcript for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                with mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ
+                ) as buffer:
+                    transcript = _decode(buffer)
+            # The modification time doubles as the last access time for
+            # eviction. A file evicted since it was read counts as a miss.
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, struct.error, UnicodeDecodeError):
+            logger.warning("Discarding unreadable cached transcript %s", path)
+            remove_file(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return transcript
+
+    def set(self, key: str, transcript: dict[int, str]) -> None:
+        """Stores a transcript, evicting the least recently used if full."""
+        data = _encode(transcript)
+        write_atomic(self._path(key), lambda file: file.write(data))
+        self.evict()
+
+    def entries(self) -> list[dict]:
+        """Returns key, size and last access time of every cached transcript.
+
+        Entries are ordered from least to most recently used.
+        """
+        return [
+            {
+                "key": os.path.basename(path)[: -len(SUFFIX)],
+                "bytes": stat.st_size,
+                "last_access": stat.st_mtime,
+            }
+            for path, stat in list_by_last_access(self.directory, SUFFIX)
+        ]
+
+    def evict(self) -> int:
+        """Removes least recently used transcripts until under max_bytes.
+
+        Returns:
+            int: Number of transcripts removed.
+        """
+
+        def remove(entry: dict) -> int:
+            remove_file(self._path(entry["key"]))
+            return entry["bytes"]
+
+        entries = self.entries()
+        removed = evict_least_recently_used(
+            entries,
+            sum(entry["bytes"] for entry in entries),
+            self.max_bytes,
+            remove,
+        )
+        if removed:
+            logger.debug("Evicted %d cached transcripts", removed)
+        return removed
+
+    def purge(self, older_than: float | None = None) -> int:
+        """Removes cached transcripts.
+
+        Args:
+            older_than: Only remove transcripts not used for this many
+                seconds, None to remove all of them.
+
+        Returns:
+            int: Number of transcripts removed.
+        """
+        now = time.time()
+        removed = 0
+        for entry in self.entries():
+            if (
+                older_than is not None
+                and now - entry["last_access"] < older_than
+            ):
+                continue
+            remove_file(self._path(entry["key"]))
+            removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Returns hit and miss counters, number and size of transcripts."""
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(entry["bytes"] for entry in entries),
+        }
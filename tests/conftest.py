@@ -0,0 +1,156 @@
+import json
+import os
+
+import pytest
+
+from concall_parser.utils import get_groq_responses
+from concall_parser.utils.cassettes import Cassette
+from concall_parser.utils.llm_backends import OfflineBackend
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+
+
+def pytest_addoption(parser):
+    """Adds --llm, choosing how document tests reach the LLM."""
+    parser.addoption(
+        "--llm",
+        choices=("replay", "record", "live"),
+        default="replay",
+        help=(
+            "replay: answer LLM requests of document tests from "
+            "tests/cassettes, failing on prompts not recorded; record: "
+            "call the LLM and write the cassettes; live: call the LLM"
+        ),
+    )
+
+
+@pytest.fixture
+def offline_llm(monkeypatch):
+    """Answers every LLM request with the offline backend, no key needed."""
+    backend = OfflineBackend()
+    monkeypatch.setattr(get_groq_responses, "llm_backend", backend)
+    return backend
+
+
+@pytest.fixture
+def moderated_transcript() -> dict[int, str]:
+    """A short moderated call: commentary, two analysts and the closing."""
+    return {
+        1: (
+            "Synthetic Industries Ltd.\n"
+            "Moderator: Ladies and gentlemen, welcome to the Q3 FY25 call.\n"
+            "Rahul Jain: Thank you. Good evening, everyone.\n"
+            "Our revenue grew 12% this quarter"
+        ),
+        2: (
+            "and margins were stable.\n"
+            "Moderator: The first question is from the line of Jane Roe from "
+            "ABC Capital.\n"
+            "Jane Roe: What drove the growth?\n"
+            "Rahul Jain: Mostly volumes."
+        ),
+        3: (
+            "Moderator: The next question is from the line of John Doe from "
+            "XYZ Securities.\n"
+            "John Doe: Any guidance for FY26?\n"
+            "Rahul Jain: We expect similar growth,\n"
+            "subject to demand."
+        ),
+        4: (
+            "Moderator: That concludes the conference. Thank you.\n"
+            "Rahul Jain: Thank you all."
+        ),
+    }
+
+
+@pytest.fixture
+def management_only_transcript() -> dict[int, str]:
+    """A press-release style call: the management speaks in turn."""
+    return {
+        1: (
+            "Synthetic Industries Limited\n"
+            "Scrip Code: 500325\n"
+            "Sub: Transcript of the earnings call for the quarter ended "
+            "December"
+        ),
+        2: (
+            "Sh B. Srinivasan:\n"
+            "Good evening and a very happy new year to all of you. Very happy "
+            "to welcome you to the third quarter business presentation. Our "
+            "CFO will walk you through the consolidated numbers first, then "
+            "the segments.\n"
+            "Sh V. Srikanth:\n"
+            "Thank you, Srini, and happy new year to everyone. We had a good "
+            "operating quarter with strong performances in each of our "
+            "segments and growth in revenue, EBITDA and profit after tax."
+        ),
+        3: (
+            "Sh B. Srinivasan:\n"
+            "Thank you, Srikanth. Now we will have Kiran Thomas talk about "
+            "Jio, then Dinesh Taluja about retail, and Srikanth will come back "
+            "at the end to summarise the performance of the quarter."
+        ),
+    }
+
+
+@pytest.fixture
+def fake_classify():
+    """Rule-based stand-in for the Groq moderator intent classifier."""
+
+    def classify(dialogue: str, groq_model: str) -> str:
+        if "welcome" in dialogue:
+            return json.dumps({"intent": "opening"})
+        if "question is from the line of" in dialogue:
+            name, company = (
+                dialogue.split("line of ")[1].rstrip(".\n").split(" from ")
+            )
+            return json.dumps(
+                {
+                    "intent": "new_analyst_start",
+                    "analyst_name": name,
+                    "analyst_company": company,
+                }
+            )
+        return json.dumps({"intent": "end"})
+
+    return classify
+
+
+@pytest.fixture
+def use_cassette(request, monkeypatch):
+    """Routes LLM requests of a document test through its cassette.
+
+    Call it with the path of the document; the cassette is named after it.
+    Replaying fails the test if any prompt was not recorded, and skips
+    documents without a cassette, except in CI where a missing cassette
+    fails too. Recording writes the cassette after the test.
+    """
+    mode = request.config.getoption("--llm")
+    cassettes = []
+
+    def use(document_path: str) -> Cassette | None:
+        if mode == "live":
+            return None
+        name = os.path.splitext(os.path.basename(document_path))[0]
+        path = os.path.join(CASSETTE_DIR, name + ".json")
+        if mode == "replay" and not os.path.exists(path):
+            message = f"No cassette for {name}; record it with --llm=record"
+            if os.environ.get("CI"):
+                pytest.fail(message)
+            pytest.skip(message)
+        cassette = Cassette(path, mode=mode)
+        monkeypatch.setattr(get_groq_responses, "llm_backend", cassette)
+        cassettes.append(cassette)
+        return cassette
+
+    yield use
+
+    for cassette in cassettes:
+        if cassette.misses:
+            pytest.fail(
+                f"{len(cassette.misses)} LLM requests not in {cassette.path}, "
+                "record it again with --llm=record:\n"
+                + "\n".join(cassette.misses)
+            )
+        if mode == "record":
+            cassette.save()
@@ -9,11 +9,17 @@ from concall_parser.parser import ConcallParser
 PDF_DIR = "tests/test_documents"
 
 
-@pytest.mark.parametrize("pdf_file", [
-    os.path.join(PDF_DIR, f) for f in os.listdir(PDF_DIR) if f.endswith(".pdf")
-])
-def test_pdf_parser_regression(pdf_file, data_regression):
+@pytest.mark.parametrize(
+    "pdf_file",
+    [
+        os.path.join(PDF_DIR, f)
+        for f in os.listdir(PDF_DIR)
+        if f.endswith(".pdf")
+    ],
+)
+def test_pdf_parser_regression(pdf_file, data_regression, use_cassette):
     """Test against saved working version of output."""
+    use_cassette(pdf_file)
     data_regression.maxDiff = None
     logger.info(f"Testing for file {pdf_file}")
     parser = ConcallParser(path=pdf_file)
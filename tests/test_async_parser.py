@@ -0,0 +1,220 @@
+import asyncio
+import json
+import threading
+from collections.abc import Mapping
+from types import SimpleNamespace
+
+import pytest
+
+from concall_parser import parser as parser_module
+from concall_parser.agents import extraction
+from concall_parser.agents.classify import ClassifyModeratorIntent
+from concall_parser.agents.extraction import ExtractManagement
+from concall_parser.async_parser import AsyncConcallParser
+from concall_parser.parser import ConcallParser
+from concall_parser.utils import get_groq_responses
+from concall_parser.utils.llm_backends import GroqBackend
+
+MANAGEMENT = {"company_name": "Synthetic Industries", "Rahul Jain": "CEO"}
+
+
+class FakeCompletions:
+    """Async stand-in for the Groq chat completions endpoint.
+
+    Answers management extraction and intent classification prompts, and
+    records how many requests were in flight at once.
+    """
+
+    def __init__(self, classify):
+        """Initialize FakeCompletions.
+
+        Args:
+            classify: Answers a classification prompt, like fake_classify.
+        """
+        self.classify = classify
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, messages, model, **params):
+        """Returns a canned completion after yielding to the event loop."""
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        system, user = messages[0]["content"], messages[1]["content"]
+        if system == extraction.CONTEXT:
+            content = json.dumps(MANAGEMENT)
+        else:
+            content = self.classify(user, model)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+
+@pytest.fixture
+def completions(monkeypatch, moderated_transcript, fake_classify):
+    """Serves the moderated transcript for any pdf and answers Groq with FakeCompletions."""
+    monkeypatch.setattr(
+        parser_module,
+        "get_document_transcript",
+        lambda **kwargs: moderated_transcript,
+    )
+    fake = FakeCompletions(fake_classify)
+    monkeypatch.setattr(
+        get_groq_responses,
+        "llm_backend",
+        GroqBackend(
+            async_client=SimpleNamespace(chat=SimpleNamespace(completions=fake))
+        ),
+    )
+    return fake
+
+
+def test_matches_sync_parser(completions, monkeypatch, fake_classify):
+    """The async parser extracts what ConcallParser extracts."""
+    parser = AsyncConcallParser(path="call.pdf", min_rule_confidence=None)
+    result = asyncio.run(parser.extract_all())
+
+    monkeypatch.setattr(
+        ExtractManagement,
+        "process",
+        lambda page_text, groq_model: json.dumps(MANAGEMENT),
+    )
+    monkeypatch.setattr(ClassifyModeratorIntent, "process", fake_classify)
+    expected = ConcallParser(
+        path="call.pdf", min_rule_confidence=None
+    ).extract_all()
+
+    assert result == expected
+    assert completions.calls == 5
+
+
+def test_semaphore_is_shared_between_parsers(completions):
+    """Requests of many documents in flight never exceed the semaphore."""
+
+    async def parse_all():
+        semaphore = asyncio.Semaphore(3)
+        parsers = [
+            AsyncConcallParser(
+                path=f"call-{index}.pdf",
+                semaphore=semaphore,
+                min_rule_confidence=None,
+            )
+            for index in range(4)
+        ]
+        return await asyncio.gather(*(p.extract_all() for p in parsers))
+
+    results = asyncio.run(parse_all())
+    assert len(results) == 4
+    assert completions.calls == 20
+    assert completions.peak == 3
+
+
+def test_dialogues_are_classified_once(completions):
+    """Commentary and analyst discussion share one classification pass."""
+
+    async def extract():
+        parser = AsyncConcallParser(path="call.pdf", min_rule_confidence=None)
+        await parser.extract_commentary()
+        await parser.extract_analyst_discussion()
+        return await parser.get_classification_stats()
+
+    assert asyncio.run(extract()) == {"rule_based": 0, "llm": 4}
+    assert completions.calls == 4
+
+
+def test_call_without_moderator_is_routed(
+    completions, monkeypatch, management_only_transcript
+):
+    """Unmoderated calls get their speeches extracted, with no classifying."""
+    monkeypatch.setattr(
+        parser_module,
+        "get_document_transcript",
+        lambda **kwargs: management_only_transcript,
+    )
+    result = asyncio.run(AsyncConcallParser(path="call.pdf").extract_all())
+
+    assert result["concall_info"] == MANAGEMENT
+    assert (result["commentary"], result["analyst"]) == ([], {})
+    assert list(result["speeches"])[-2:] == ["B. Srinivasan", "V. Srikanth"]
+    assert completions.calls == 1
+
+
+def test_failed_extraction_is_retried(completions, monkeypatch):
+    """A dialogue extraction that failed is started again, not re-raised."""
+    aclassify = ClassifyModeratorIntent.aprocess
+    failures = [RuntimeError("LLM request failed")]
+
+    async def flaky(*args, **kwargs):
+        if failures:
+            raise failures.pop()
+        return await aclassify(*args, **kwargs)
+
+    monkeypatch.setattr(ClassifyModeratorIntent, "aprocess", flaky)
+
+    async def extract():
+        parser = AsyncConcallParser(path="call.pdf", min_rule_confidence=None)
+        with pytest.raises(RuntimeError):
+            await parser.extract_analyst_discussion()
+        return await parser.extract_analyst_discussion()
+
+    assert list(asyncio.run(extract())) == ["Jane Roe", "John Doe"]
+
+
+class RecordingTranscript(Mapping):
+    """Transcript that records the threads its pages are read from."""
+
+    def __init__(self, pages):
+        """Initialize RecordingTranscript.
+
+        Args:
+            pages: Page number, page text pairs served.
+        """
+        self.pages = pages
+        self.threads = set()
+
+    def __getitem__(self, page_number):
+        """Returns the text of a page."""
+        self.threads.add(threading.get_ident())
+        return self.pages[page_number]
+
+    def __iter__(self):
+        """Yields page numbers."""
+        self.threads.add(threading.get_ident())
+        return iter(self.pages)
+
+    def __len__(self):
+        """Returns the number of pages."""
+        self.threads.add(threading.get_ident())
+        return len(self.pages)
+
+
+@pytest.mark.parametrize("moderated", [True, False])
+def test_lazy_transcript_is_read_off_the_event_loop(
+    completions,
+    monkeypatch,
+    moderated,
+    moderated_transcript,
+    management_only_transcript,
+):
+    """Pages of a lazy transcript are never extracted on the event loop."""
+    transcript = RecordingTranscript(
+        moderated_transcript if moderated else management_only_transcript
+    )
+    monkeypatch.setattr(
+        parser_module, "LazyTranscript", lambda *args, **kwargs: transcript
+    )
+
+    async def extract():
+        parser = AsyncConcallParser(
+            path="call.pdf", lazy_transcript=True, min_rule_confidence=None
+        )
+        return threading.get_ident(), await parser.extract_all()
+
+    loop_thread, result = asyncio.run(extract())
+
+    assert result["concall_info"] == MANAGEMENT
+    assert transcript.threads and loop_thread not in transcript.threads
@@ -0,0 +1,133 @@
+import json
+import os
+
+import pytest
+
+from concall_parser import batch, cli
+from concall_parser.batch import (
+    Checkpoint,
+    collect_sources,
+    process_document,
+    run_batch,
+)
+
+
+class FakeParser:
+    """Stands in for ConcallParser, failing on documents named bad*."""
+
+    calls = []
+
+    def __init__(self, path=None, link=None, **kwargs):
+        """Records the document instead of extracting it."""
+        self.source = path or link
+        self.transcript = {1: "Moderator: Good morning."}
+        FakeParser.calls.append(self.source)
+
+    def extract_all(self):
+        """Returns a fixed result, or raises for bad documents."""
+        if os.path.basename(self.source).startswith("bad"):
+            raise ValueError("unreadable pdf")
+        return {"concall_info": {}, "commentary": [self.source], "analyst": {}}
+
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    """A directory of three documents, one of which fails to parse."""
+    FakeParser.calls = []
+    monkeypatch.setattr(batch, "ConcallParser", FakeParser)
+    directory = tmp_path / "pdfs"
+    directory.mkdir()
+    for name in ("a.pdf", "bad.pdf", "c.pdf", "notes.txt"):
+        (directory / name).write_bytes(b"%PDF")
+    return directory
+
+
+def test_collect_sources_from_manifest(tmp_path):
+    """Manifests list paths relative to themselves and links as they are."""
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text(
+        "# quarterly calls\nq1.pdf\n\nhttps://example.com/q2.pdf\n"
+    )
+    assert collect_sources(str(manifest)) == [
+        str(tmp_path / "q1.pdf"),
+        "https://example.com/q2.pdf",
+    ]
+
+
+def test_results_and_failures_are_recorded(documents, tmp_path):
+    """Each document gets a result file or a failure in the checkpoint."""
+    output = tmp_path / "out"
+    summary = run_batch(collect_sources(str(documents)), str(output))
+
+    assert (summary["done"], summary["failed"], summary["skipped"]) == (2, 1, 0)
+    assert summary["failures"][0]["error"] == "ValueError: unreadable pdf"
+    results = sorted(output.glob("*.json"))
+    assert len(results) == 2
+    assert json.loads(results[0].read_text())["source"].endswith("a.pdf")
+    assert not list(output.glob("*.tmp"))
+
+    checkpoint = Checkpoint(str(output / "checkpoint.jsonl"))
+    assert checkpoint.status(str(documents / "bad.pdf")) == "failed"
+    assert checkpoint.status(str(documents / "c.pdf")) == "done"
+
+
+def test_unreachable_link_fails(offline_llm, tmp_path):
+    """A link that cannot be downloaded is failed, not done."""
+    record = process_document("http://127.0.0.1:9/missing.pdf", str(tmp_path))
+
+    assert record["status"] == "failed"
+    assert record["error"].startswith("ValueError")
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_resume_skips_finished_documents(documents, tmp_path):
+    """A second run redoes nothing, failures only when asked to."""
+    sources = collect_sources(str(documents))
+    output = str(tmp_path / "out")
+    run_batch(sources, output)
+    FakeParser.calls = []
+
+    summary = run_batch(sources, output)
+    assert FakeParser.calls == []
+    assert summary["skipped"] == 3
+
+    summary = run_batch(sources, output, retry_failed=True)
+    assert FakeParser.calls == [str(documents / "bad.pdf")]
+    assert summary["failed"] == 1
+
+
+def test_truncated_checkpoint_line_is_ignored(tmp_path):
+    """A record cut short by a crash does not stop the next run."""
+    path = tmp_path / "checkpoint.jsonl"
+    path.write_text(
+        json.dumps({"source": "a.pdf", "status": "done"}) + '\n{"source": "b'
+    )
+    checkpoint = Checkpoint(str(path))
+    assert checkpoint.status("a.pdf") == "done"
+    assert checkpoint.status("b.pdf") is None
+
+
+def test_process_pool(documents, tmp_path):
+    """Documents parsed across worker processes are checkpointed alike."""
+    output = tmp_path / "out"
+    summary = run_batch(collect_sources(str(documents)), str(output), workers=2)
+    assert (summary["done"], summary["failed"]) == (2, 1)
+    assert len(Checkpoint(str(output / "checkpoint.jsonl")).records) == 3
+
+
+def test_cli_reports_throughput_and_failures(documents, tmp_path, capsys):
+    """The batch command prints docs/min and each failure."""
+    cli.main(
+        [
+            "batch",
+            str(documents),
+            "--output",
+            str(tmp_path / "out"),
+            "--workers",
+            "1",
+        ]
+    )
+    out = capsys.readouterr().out
+    assert "done 2, failed 1, skipped 0" in out
+    assert "docs/min" in out
+    assert "FAILED" in out and "bad.pdf" in out
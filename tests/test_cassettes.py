@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from concall_parser import parser as parser_module
+from concall_parser.parser import ConcallParser
+from concall_parser.utils.cassettes import Cassette, CassetteMissError
+from concall_parser.utils.llm_backends import OfflineBackend
+
+MESSAGES = [{"role": "user", "content": "Moderator: welcome"}]
+
+
+@pytest.fixture
+def transcript(monkeypatch, moderated_transcript):
+    """Serves the moderated transcript for any pdf."""
+    monkeypatch.setattr(
+        parser_module,
+        "get_document_transcript",
+        lambda **kwargs: moderated_transcript,
+    )
+
+
+def model_backend(fake_classify) -> OfflineBackend:
+    """Stands in for the live model a cassette is recorded from."""
+    return OfflineBackend(
+        rules=[
+            (r"Industries", '{"company_name": "Synthetic Industries"}'),
+            (
+                r".",
+                lambda messages, model: fake_classify(
+                    messages[-1]["content"], model
+                ),
+            ),
+        ]
+    )
+
+
+def test_replay_matches_recording(tmp_path, transcript, fake_classify):
+    """A parse replayed from its cassette equals the recorded parse."""
+    path = str(tmp_path / "call.json")
+    recorder = Cassette(
+        path, mode="record", backend=model_backend(fake_classify)
+    )
+    recorded = ConcallParser(
+        path="call.pdf", llm_backend=recorder, min_rule_confidence=None
+    ).extract_all()
+    recorder.save()
+
+    player = Cassette(path, mode="replay")
+    replayed = ConcallParser(
+        path="call.pdf", llm_backend=player, min_rule_confidence=None
+    ).extract_all()
+
+    assert replayed == recorded
+    assert recorded["analyst"]
+    assert player.hits == len(recorder.interactions) > 0
+    assert player.misses == []
+
+
+def test_replay_miss_fails_loudly(tmp_path):
+    """A prompt that was not recorded raises instead of calling a model."""
+    path = str(tmp_path / "call.json")
+    recorder = Cassette(path, mode="record", backend=OfflineBackend())
+    recorder.complete(MESSAGES, "model")
+    recorder.save()
+
+    player = Cassette(path, mode="replay")
+    assert player.complete(MESSAGES, "model").content == "{}"
+    changed = [{"role": "user", "content": "Moderator: welcome back"}]
+    with pytest.raises(CassetteMissError, match="welcome back"):
+        player.complete(changed, "model")
+    with pytest.raises(CassetteMissError):
+        player.complete(MESSAGES, "other-model")
+    assert player.misses == ["Moderator: welcome back", "Moderator: welcome"]
+
+
+def test_cassette_file_is_checked(tmp_path):
+    """Missing, outdated and misnamed cassettes are rejected."""
+    path = tmp_path / "call.json"
+    with pytest.raises(FileNotFoundError):
+        Cassette(str(path))
+    path.write_text(json.dumps({"version": 0, "interactions": {}}))
+    with pytest.raises(ValueError, match="record it again"):
+        Cassette(str(path))
+    with pytest.raises(ValueError, match="Unknown cassette mode"):
+        Cassette(str(path), mode="rewind")
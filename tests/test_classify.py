@@ -0,0 +1,145 @@
+import json
+
+import pytest
+
+from concall_parser.agents import classify
+from concall_parser.agents.classify import (
+    MAX_STATEMENT_TOKENS,
+    ClassificationError,
+    ClassifyModeratorIntent,
+)
+from concall_parser.utils.tokens import estimate_tokens
+
+STATEMENTS = [
+    "Ladies and gentlemen, welcome to the call.",
+    "The first question is from the line of Jane Roe from ABC Capital.",
+    "That concludes the conference.",
+]
+RESULTS = [
+    {"id": 0, "intent": "opening"},
+    {
+        "id": 1,
+        "intent": "new_analyst_start",
+        "analyst_name": "Jane Roe",
+        "analyst_company": "ABC Capital",
+    },
+    {"id": 2, "intent": "end"},
+]
+
+
+def test_process_batch_splits_reply(monkeypatch):
+    """A batch reply is split back into one result per statement."""
+    requests = []
+
+    def get_groq_response(messages, model):
+        requests.append(json.loads(messages[1]["content"]))
+        return json.dumps({"results": list(reversed(RESULTS))})
+
+    monkeypatch.setattr(classify, "get_groq_response", get_groq_response)
+    results = ClassifyModeratorIntent.process_batch(STATEMENTS, "test")
+
+    assert len(requests) == 1
+    assert [item["id"] for item in requests[0]["statements"]] == [0, 1, 2]
+    assert [result["intent"] for result in results] == [
+        "opening",
+        "new_analyst_start",
+        "end",
+    ]
+    assert results[1]["analyst_name"] == "Jane Roe"
+
+
+def test_process_batch_retries_missing_items(monkeypatch):
+    """Only items missing or malformed in a reply are requested again."""
+    requests = []
+    replies = iter(
+        [
+            json.dumps(
+                {"results": [RESULTS[0], {"id": 1, "intent": "unknown"}]}
+            ),
+            "not json",
+            json.dumps({"results": RESULTS[1:]}),
+        ]
+    )
+
+    def get_groq_response(messages, model):
+        requests.append(json.loads(messages[1]["content"]))
+        return next(replies)
+
+    monkeypatch.setattr(classify, "get_groq_response", get_groq_response)
+    results = ClassifyModeratorIntent.process_batch(STATEMENTS, "test")
+
+    assert [[item["id"] for item in r["statements"]] for r in requests] == [
+        [0, 1, 2],
+        [1, 2],
+        [1, 2],
+    ]
+    assert [result["intent"] for result in results] == [
+        "opening",
+        "new_analyst_start",
+        "end",
+    ]
+
+
+def test_make_batches_fits_context_window():
+    """Batches get smaller when statements are long or the model is small."""
+    short = ["Next question please."] * 60
+    long = ["word " * 1200] * 30
+
+    short_batches = ClassifyModeratorIntent.make_batches(
+        short, "llama3-70b-8192"
+    )
+    assert [len(batch) for batch in short_batches] == [25, 25, 10]
+    assert sum(short_batches, []) == list(range(60))
+
+    small = ClassifyModeratorIntent.make_batches(long, "llama3-70b-8192")
+    large = ClassifyModeratorIntent.make_batches(
+        long, "llama-3.3-70b-versatile"
+    )
+    assert [len(batch) for batch in small] == [22, 8]
+    assert [len(batch) for batch in large] == [25, 5]
+
+
+def test_long_statements_are_trimmed(monkeypatch):
+    """Only the leading and trailing sentences of long turns are sent."""
+    requests = []
+
+    def get_groq_response(messages, model):
+        requests.append(messages)
+        return json.dumps({"intent": "new_analyst_start"})
+
+    monkeypatch.setattr(classify, "get_groq_response", get_groq_response)
+    statement = (
+        "Thank you. "
+        + "We have a few participants still in the queue. " * 200
+        + "The next question is from the line of Jane Roe from ABC Capital."
+    )
+    ClassifyModeratorIntent.process(statement, "llama3-70b-8192")
+
+    sent = requests[-1][1]["content"]
+    assert estimate_tokens(sent) <= MAX_STATEMENT_TOKENS
+    assert sent.startswith("Thank you.")
+    assert sent.endswith("Jane Roe from ABC Capital.")
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        '{"intent": "new_analyst_start"}',
+        '{"intent": "question"}',
+        '["opening"]',
+    ],
+)
+def test_incomplete_reply_falls_back_to_rules(reply):
+    """A reply without a usable intent is classified by the rules."""
+    result = ClassifyModeratorIntent.parse_response(reply, STATEMENTS[1])
+
+    assert result["intent"] == "new_analyst_start"
+    assert result["analyst_name"] == "Jane Roe"
+
+
+def test_incomplete_reply_on_unknown_statement_raises():
+    """A new analyst without a name the rules cannot supply is an error."""
+    with pytest.raises(ClassificationError):
+        ClassifyModeratorIntent.parse_response(
+            '{"intent": "new_analyst_start"}', "Over to you."
+        )
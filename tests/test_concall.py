@@ -9,16 +9,18 @@ TEST_FILES = [
     "tests/test_documents/apollo_hospitals.pdf",
 ]
 
-@pytest.mark.parametrize('path', TEST_FILES)
-def test_single_file(path: str):
+
+@pytest.mark.parametrize("path", TEST_FILES)
+def test_single_file(path: str, use_cassette):
     """Run a single file and save its output and log."""
+    use_cassette(path)
     logger.debug("Starting testing for %s", path)
     parser = ConcallParser(path=path)
     extracted = parser.extract_all()
     logger.info(f"Extracted info: {json.dumps(extracted, indent=4)}")
 
     assert isinstance(extracted, dict)
-    assert isinstance(extracted['management'], dict)
-    assert isinstance(extracted['commentary'], list)
-    assert isinstance(extracted['analyst'], dict)
-    assert extracted['commentary'] != []
+    assert isinstance(extracted["concall_info"], dict)
+    assert isinstance(extracted["commentary"], list)
+    assert isinstance(extracted["analyst"], dict)
+    assert extracted["commentary"] != []
@@ -0,0 +1,319 @@
+import json
+import threading
+import time
+
+import pytest
+
+from concall_parser.agents import classify
+from concall_parser.agents.classify import (
+    ClassificationError,
+    ClassifyModeratorIntent,
+)
+from concall_parser.extractors.dialogue_extractor import DialogueExtractor
+from concall_parser.utils import get_groq_responses
+from concall_parser.utils.llm_backends import OfflineBackend
+
+
+@pytest.fixture
+def classifier_calls(monkeypatch, fake_classify):
+    """Patches the classifier with fake_classify and records its calls."""
+    calls = []
+
+    def process(dialogue: str, groq_model: str) -> str:
+        calls.append(dialogue)
+        return fake_classify(dialogue, groq_model)
+
+    monkeypatch.setattr(ClassifyModeratorIntent, "process", process)
+    return calls
+
+
+def run_extraction(
+    extractor: DialogueExtractor, transcript: dict[int, str]
+) -> dict:
+    """Runs commentary then dialogue extraction, like ConcallParser does."""
+    extractor.extract_commentary_and_future_outlook(
+        transcript=transcript, groq_model="test"
+    )
+    return extractor.extract_dialogues(
+        transcript_dict=transcript, groq_model="test"
+    )
+
+
+def test_sequential_extraction(classifier_calls, moderated_transcript):
+    """Analyst turns, page continuations and closing turns are extracted."""
+    dialogues = run_extraction(
+        DialogueExtractor(min_rule_confidence=None), moderated_transcript
+    )
+
+    assert list(dialogues["analyst_discussion"]) == ["Jane Roe", "John Doe"]
+    john = dialogues["analyst_discussion"]["John Doe"]
+    assert john["analyst_company"] == "XYZ Securities"
+    assert john["dialogue"][-1] == {
+        "speaker": "Rahul Jain",
+        "dialogue": "we expect similar growth, subject to demand.",
+    }
+    assert dialogues["end"] == [
+        {"speaker": "Rahul Jain", "dialogue": "thank you all."}
+    ]
+
+
+def test_single_pass_extraction(classifier_calls, moderated_transcript):
+    """One walk builds every section and classifies each statement once."""
+    dialogues = DialogueExtractor(min_rule_confidence=None).extract(
+        moderated_transcript, groq_model="test"
+    )
+
+    assert dialogues["commentary_and_future_outlook"] == [
+        {
+            "speaker": "Rahul Jain",
+            "dialogue": "thank you. good evening, everyone. our revenue grew "
+            "12% this quarter and margins were stable.",
+        }
+    ]
+    assert list(dialogues["analyst_discussion"]) == ["Jane Roe", "John Doe"]
+    assert len(classifier_calls) == 4
+
+
+def test_classifications_are_reused(classifier_calls, moderated_transcript):
+    """Walking the transcript again does not call the classifier again."""
+    extractor = DialogueExtractor(min_rule_confidence=None)
+    first = run_extraction(extractor, moderated_transcript)
+    assert len(classifier_calls) == 4
+    assert extractor.extract(moderated_transcript, groq_model="test") == first
+    assert len(classifier_calls) == 4
+
+
+def test_concurrent_matches_sequential(classifier_calls, moderated_transcript):
+    """The two-phase pipeline gives the same output as the sequential path."""
+    sequential = run_extraction(
+        DialogueExtractor(min_rule_confidence=None), moderated_transcript
+    )
+    concurrent = run_extraction(
+        DialogueExtractor(max_workers=4, min_rule_confidence=None),
+        moderated_transcript,
+    )
+    assert concurrent == sequential
+
+
+def test_concurrent_classification_overlaps(
+    monkeypatch, moderated_transcript, fake_classify
+):
+    """Moderator turns are classified in parallel, bounded by max_workers."""
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def process(dialogue: str, groq_model: str) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return fake_classify(dialogue, groq_model)
+
+    monkeypatch.setattr(ClassifyModeratorIntent, "process", process)
+    extractor = DialogueExtractor(max_workers=2, min_rule_confidence=None)
+    extractor.classify_moderator_turns(moderated_transcript, groq_model="test")
+
+    assert len(extractor.moderator_intents) == 4
+    assert peak == 2
+
+
+def test_rule_fast_path_skips_llm(classifier_calls, moderated_transcript):
+    """Stock moderator phrases are classified without calling the LLM."""
+    extractor = DialogueExtractor(min_rule_confidence=0.9)
+    dialogues = extractor.extract(moderated_transcript, groq_model="test")
+
+    assert classifier_calls == []
+    assert extractor.classification_stats == {"rule_based": 4, "llm": 0}
+    assert dialogues == DialogueExtractor(min_rule_confidence=None).extract(
+        moderated_transcript, groq_model="test"
+    )
+
+
+def test_batch_classification_matches_single(
+    monkeypatch, classifier_calls, moderated_transcript, fake_classify
+):
+    """Batched classification gives the same output with fewer requests."""
+    requests = []
+
+    def get_groq_response(messages, model):
+        statements = json.loads(messages[1]["content"])["statements"]
+        requests.append(statements)
+        return json.dumps(
+            {
+                "results": [
+                    {
+                        "id": item["id"],
+                        **json.loads(fake_classify(item["statement"], model)),
+                    }
+                    for item in statements
+                ]
+            }
+        )
+
+    monkeypatch.setattr(classify, "get_groq_response", get_groq_response)
+    extractor = DialogueExtractor(
+        min_rule_confidence=None, batch_classification=True
+    )
+    dialogues = extractor.extract(moderated_transcript, groq_model="test")
+
+    assert len(requests) == 1
+    assert classifier_calls == []
+    assert dialogues == DialogueExtractor(min_rule_confidence=None).extract(
+        moderated_transcript, groq_model="test"
+    )
+
+
+def test_turn_spanning_pages_is_cleaned_once(classifier_calls):
+    """A turn continued over many pages is one range of the buffer."""
+    pages = {
+        1: "Moderator: Ladies and gentlemen, welcome to the call.\n"
+        "Rahul Jain: Page ONE"
+    }
+    for page_number in range(2, 51):
+        pages[page_number] = f"  page {page_number}\n"
+    extractor = DialogueExtractor(min_rule_confidence=None)
+    extractor.extract(pages, groq_model="test")
+
+    (turn,) = extractor.sections["commentary_and_future_outlook"]
+    assert turn.page_range == (1, 50)
+    assert extractor.buffer.pages[0] is pages[1]
+    commentary = extractor.dialogues["commentary_and_future_outlook"]
+    assert commentary == [
+        {
+            "speaker": "Rahul Jain",
+            "dialogue": "page one "
+            + " ".join(f"page {number}" for number in range(2, 51)),
+        }
+    ]
+
+
+def test_dialogues_view_is_rebuilt_after_changes(
+    classifier_calls, moderated_transcript
+):
+    """The dict view is reused until the walk adds to the sections."""
+    extractor = DialogueExtractor(min_rule_confidence=None)
+    pages = extractor.iter_extract(moderated_transcript, groq_model="test")
+    next(pages)
+    first = extractor.dialogues
+    assert extractor.dialogues is first
+    assert first["analyst_discussion"] == {}
+
+    for _ in pages:
+        pass
+    assert extractor.dialogues is not first
+    assert list(extractor.dialogues["analyst_discussion"]) == [
+        "Jane Roe",
+        "John Doe",
+    ]
+
+
+def test_continuation_stays_with_its_turn(
+    classifier_calls, moderated_transcript
+):
+    """Closing remarks continued on the next page are not filed elsewhere."""
+    pages = {
+        **moderated_transcript,
+        4: moderated_transcript[4] + " We look forward",
+        5: "to speaking with you next quarter.",
+    }
+    dialogues = DialogueExtractor(min_rule_confidence=None).extract(
+        pages, groq_model="test"
+    )
+
+    assert dialogues["end"] == [
+        {
+            "speaker": "Rahul Jain",
+            "dialogue": "thank you all. we look forward to speaking with you "
+            "next quarter.",
+        }
+    ]
+    assert dialogues["analyst_discussion"]["John Doe"]["dialogue"][-1] == {
+        "speaker": "Rahul Jain",
+        "dialogue": "we expect similar growth, subject to demand.",
+    }
+
+
+def test_dialogue_extraction_resumes_after_commentary(
+    classifier_calls, moderated_transcript
+):
+    """extract_dialogues picks up where the commentary walk stopped."""
+    extractor = DialogueExtractor(min_rule_confidence=None)
+    extractor.extract_commentary_and_future_outlook(
+        transcript=moderated_transcript, groq_model="test"
+    )
+    assert extractor.turns[extractor.position].speaker == "Moderator"
+
+    dialogues = extractor.extract_dialogues(
+        transcript_dict=moderated_transcript, groq_model="test"
+    )
+    assert len(dialogues["commentary_and_future_outlook"]) == 1
+
+
+def test_operator_turns_are_moderator_turns(
+    classifier_calls, moderated_transcript
+):
+    """Turns of an Operator are classified like Moderator turns."""
+    transcript = {
+        page: text.replace("Moderator:", "Operator:")
+        for page, text in moderated_transcript.items()
+    }
+
+    dialogues = DialogueExtractor().extract(transcript, groq_model="test")
+
+    assert len(classifier_calls) == 4
+    assert dialogues == DialogueExtractor().extract(
+        moderated_transcript, groq_model="test"
+    )
+
+
+def test_new_transcript_starts_over(classifier_calls, moderated_transcript):
+    """An extractor reused for another transcript does not keep its turns."""
+    extractor = DialogueExtractor()
+    extractor.extract(moderated_transcript, groq_model="test")
+    other = {1: moderated_transcript[1].replace("Rahul Jain", "Asha Rao")}
+
+    dialogues = extractor.extract(other, groq_model="test")
+
+    assert dialogues == DialogueExtractor().extract(other, groq_model="test")
+    assert dialogues["commentary_and_future_outlook"][0]["speaker"] == (
+        "Asha Rao"
+    )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"min_rule_confidence": None},
+        {"min_rule_confidence": None, "batch_classification": True},
+    ],
+)
+def test_failing_llm_falls_back_to_rules(
+    monkeypatch, options, moderated_transcript
+):
+    """Statements the LLM fails on are classified by the rules alone."""
+    backend = OfflineBackend(default=None)
+    monkeypatch.setattr(get_groq_responses, "llm_backend", backend)
+
+    dialogues = DialogueExtractor(**options).extract(
+        moderated_transcript, groq_model="test"
+    )
+
+    assert backend.calls > 0
+    assert dialogues == DialogueExtractor(min_rule_confidence=0.9).extract(
+        moderated_transcript, groq_model="test"
+    )
+
+
+def test_failing_llm_on_unknown_statement_raises(monkeypatch):
+    """A failed request the rules cannot make up for is a clear error."""
+    monkeypatch.setattr(
+        get_groq_responses, "llm_backend", OfflineBackend(default=None)
+    )
+    transcript = {1: "Moderator: Shall we go for the closing, sir?\n"}
+
+    with pytest.raises(ClassificationError, match="closing"):
+        DialogueExtractor().extract(transcript, groq_model="test")
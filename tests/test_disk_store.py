@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from concall_parser.utils.disk_store import (
+    evict_least_recently_used,
+    list_by_last_access,
+    write_atomic,
+)
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    """A write that fails leaves the file and no temp file behind."""
+    path = str(tmp_path / "data.json")
+    write_atomic(path, lambda file: file.write("old"), mode="w")
+
+    def fail(file):
+        file.write("half")
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        write_atomic(path, fail, mode="w")
+
+    assert open(path).read() == "old"
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_least_recently_used_are_evicted_first(tmp_path):
+    """Files are listed by modification time and evicted oldest first."""
+    for age, name in enumerate(["new", "mid", "old"]):
+        path = str(tmp_path / f"{name}.bin")
+        write_atomic(path, lambda file: file.write(b"x" * 10))
+        os.utime(path, (1000 - age, 1000 - age))
+    (tmp_path / "ignored.txt").write_text("not listed")
+
+    files = list_by_last_access(str(tmp_path), ".bin")
+    assert [os.path.basename(path) for path, _ in files] == [
+        "old.bin",
+        "mid.bin",
+        "new.bin",
+    ]
+
+    removed = []
+
+    def remove(file):
+        removed.append(os.path.basename(file[0]))
+        return file[1].st_size
+
+    assert evict_least_recently_used(files, 30, 15, remove) == 2
+    assert removed == ["old.bin", "mid.bin"]
@@ -0,0 +1,75 @@
+import functools
+import http.server
+import os
+import threading
+
+import pytest
+
+from concall_parser.utils.downloads import download_pdf, get_session
+from concall_parser.utils.file_utils import (
+    get_document_transcript,
+    get_transcript_from_link,
+    get_transcripts_from_links,
+)
+
+DOCUMENTS_DIR = os.path.join(os.path.dirname(__file__), "test_documents")
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves files without logging every request to stderr."""
+
+    def log_message(self, format, *args):
+        """Drops the request log line."""
+
+
+@pytest.fixture(scope="module")
+def server():
+    """Serves tests/test_documents over HTTP on a free local port."""
+    handler = functools.partial(QuietHandler, directory=DOCUMENTS_DIR)
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_download_stays_in_memory_below_threshold(server):
+    """Small pdfs are kept in memory, large ones spill to a temp file."""
+    expected_size = os.path.getsize(f"{DOCUMENTS_DIR}/irctc.pdf")
+    with download_pdf(f"{server}/irctc.pdf") as document:
+        assert not document._rolled
+        assert len(document.read()) == expected_size
+    with download_pdf(f"{server}/irctc.pdf", spool_threshold=1024) as document:
+        assert document._rolled
+        assert len(document.read()) == expected_size
+
+
+def test_transcript_from_link_matches_local_file(server, tmp_path, monkeypatch):
+    """Downloading gives the local transcript, without writing to cwd."""
+    monkeypatch.chdir(tmp_path)
+    local = get_document_transcript(
+        filepath=os.path.join(DOCUMENTS_DIR, "irctc.pdf")
+    )
+    assert get_transcript_from_link(f"{server}/irctc.pdf") == local
+    assert os.listdir(tmp_path) == []
+
+
+def test_concurrent_downloads_keep_documents_apart(server):
+    """Parallel downloads of different pdfs each get their own transcript."""
+    names = ["irctc.pdf", "apollo_hospitals.pdf", "indusind_bank.pdf"]
+    transcripts = get_transcripts_from_links(
+        [f"{server}/{name}" for name in names] + [f"{server}/missing.pdf"],
+        max_downloads=4,
+        backend="pdfium",
+    )
+    for name, transcript in zip(names, transcripts):
+        assert transcript == get_document_transcript(
+            filepath=f"{DOCUMENTS_DIR}/{name}", backend="pdfium"
+        )
+    assert transcripts[-1] == {}
+
+
+def test_session_is_shared():
+    """Every download goes through the same pooled session."""
+    assert get_session() is get_session()
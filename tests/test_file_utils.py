@@ -0,0 +1,80 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from concall_parser.utils import file_utils
+from concall_parser.utils.file_utils import (
+    LazyTranscript,
+    get_document_transcript,
+)
+from concall_parser.utils.transcript_cache import TranscriptCache, hash_pdf
+
+PDF_PATH = "tests/test_documents/icici_lombard.pdf"
+
+
+def test_parallel_extraction_matches_serial():
+    """Page texts and numbering are the same with a process pool."""
+    serial = get_document_transcript(filepath=PDF_PATH)
+    parallel = get_document_transcript(filepath=PDF_PATH, workers=3)
+    assert list(parallel) == list(range(1, len(serial) + 1))
+    assert parallel == serial
+
+
+def test_parallel_extraction_of_file_object(monkeypatch):
+    """Workers get the path of one copy of a file object, not its bytes."""
+    sources = []
+    extract_page_range = file_utils._extract_page_range
+
+    def record_source(filepath, *args):
+        sources.append(filepath)
+        return extract_page_range(filepath, *args)
+
+    monkeypatch.setattr(file_utils, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(file_utils, "_extract_page_range", record_source)
+    with open(PDF_PATH, "rb") as file:
+        data = io.BytesIO(file.read())
+    data.seek(10)
+
+    parallel = get_document_transcript(filepath=data, workers=3)
+
+    assert parallel == get_document_transcript(filepath=PDF_PATH)
+    assert len(sources) > 3
+    assert len(set(sources)) == 1 and isinstance(sources[0], str)
+    assert data.tell() == 10
+
+
+def test_lazy_transcript_extracts_on_demand():
+    """Pages are extracted only as far as they are read."""
+    transcript = LazyTranscript(PDF_PATH)
+    assert transcript.extracted_pages == 0
+
+    first_page = transcript[1]
+    assert transcript.extracted_pages == 1
+    assert 2 in transcript
+    assert transcript.extracted_pages == 2
+
+    eager = get_document_transcript(filepath=PDF_PATH)
+    assert first_page == eager[1]
+    assert dict(transcript.items()) == eager
+    assert len(transcript) == len(eager)
+    assert len(eager) + 1 not in transcript
+
+
+def test_lazy_transcript_is_cached_once_complete(tmp_path):
+    """A lazy transcript is stored in the cache after its last page."""
+    cache = TranscriptCache(str(tmp_path))
+    key = TranscriptCache.make_key(hash_pdf(PDF_PATH))
+    transcript = LazyTranscript(PDF_PATH, cache=cache)
+
+    transcript[1]
+    assert cache.get(key) is None
+
+    eager = dict(transcript.items())
+    assert cache.get(key) == eager
+
+
+def test_lazy_transcript_closes_pdf_on_exit():
+    """Leaving the context closes a pdf that was not read to the end."""
+    with LazyTranscript(PDF_PATH) as transcript:
+        assert transcript[1]
+    assert transcript._pdf is None
+    assert 2 not in transcript
@@ -0,0 +1,182 @@
+import http.server
+import io
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from concall_parser.utils import file_utils
+from concall_parser.utils.downloads import HttpCache
+from concall_parser.utils.file_utils import (
+    get_document_transcript,
+    get_transcript_from_link,
+)
+from concall_parser.utils.transcript_cache import hash_pdf
+
+DOCUMENTS_DIR = os.path.join(os.path.dirname(__file__), "test_documents")
+
+
+class ExchangeHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the server's current document with an ETag, like an exchange.
+
+    Answers 304 when If-None-Match matches, and records the status of every
+    request in the server's `statuses`.
+    """
+
+    def do_GET(self):
+        """Serves the document, or 304 if the client's copy is current."""
+        server = self.server
+        if self.headers.get("If-None-Match") == server.etag:
+            server.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        with open(os.path.join(DOCUMENTS_DIR, server.document), "rb") as file:
+            body = file.read()
+        server.statuses.append(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Drops the request log line."""
+
+
+@pytest.fixture
+def server():
+    """A local stand-in for an exchange attachment URL."""
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ExchangeHandler)
+    httpd.document = "irctc.pdf"
+    httpd.etag = '"v1"'
+    httpd.statuses = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.link = f"http://127.0.0.1:{httpd.server_address[1]}/attachment.pdf"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def no_parsing(monkeypatch):
+    """Makes any attempt to parse a pdf fail the test."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pdf should not be parsed again")
+
+    return lambda: monkeypatch.setattr(file_utils, "open_pdf", fail)
+
+
+def test_not_modified_reuses_transcript(server, tmp_path, no_parsing):
+    """A 304 answer reuses the transcript without parsing anything."""
+    http_cache = HttpCache(str(tmp_path))
+    first = get_transcript_from_link(server.link, http_cache=http_cache)
+    assert first == get_document_transcript(
+        filepath=os.path.join(DOCUMENTS_DIR, "irctc.pdf")
+    )
+
+    no_parsing()
+    assert get_transcript_from_link(server.link, http_cache=http_cache) == first
+    assert server.statuses == [200, 304]
+
+
+def test_unchanged_content_reuses_transcript(server, tmp_path, no_parsing):
+    """A new ETag on the same bytes downloads, but does not parse again."""
+    http_cache = HttpCache(str(tmp_path))
+    first = get_transcript_from_link(server.link, http_cache=http_cache)
+
+    server.etag = '"v2"'
+    no_parsing()
+    assert get_transcript_from_link(server.link, http_cache=http_cache) == first
+    assert server.statuses == [200, 200]
+
+
+def test_changed_content_is_extracted(server, tmp_path):
+    """A document replaced at the same link is downloaded and parsed."""
+    http_cache = HttpCache(str(tmp_path))
+    get_transcript_from_link(server.link, http_cache=http_cache)
+
+    server.document = "apollo_hospitals.pdf"
+    server.etag = '"v2"'
+    transcript = get_transcript_from_link(server.link, http_cache=http_cache)
+    assert transcript == get_document_transcript(
+        filepath=os.path.join(DOCUMENTS_DIR, "apollo_hospitals.pdf")
+    )
+
+
+def test_not_modified_without_transcript_uses_cached_body(server, tmp_path):
+    """If the transcript was evicted, the stored pdf is parsed instead."""
+    http_cache = HttpCache(str(tmp_path))
+    first = get_transcript_from_link(server.link, http_cache=http_cache)
+    http_cache.transcripts.purge()
+
+    assert get_transcript_from_link(server.link, http_cache=http_cache) == first
+    assert server.statuses == [200, 304]
+
+
+def test_entry_always_matches_its_body(server, tmp_path):
+    """A changed document replaces the entry and its body as one unit."""
+    http_cache = HttpCache(str(tmp_path))
+    get_transcript_from_link(server.link, http_cache=http_cache)
+    old_hash = http_cache.get(server.link)["sha256"]
+
+    server.document = "apollo_hospitals.pdf"
+    server.etag = '"v2"'
+    get_transcript_from_link(server.link, http_cache=http_cache)
+
+    entry = http_cache.get(server.link)
+    assert entry["etag"] == '"v2"'
+    with http_cache.open_body(entry["sha256"]) as body:
+        assert hash_pdf(body) == entry["sha256"]
+    assert not os.path.exists(tmp_path / f"{old_hash}.pdf")
+
+
+def test_entry_with_damaged_body_is_ignored(server, tmp_path):
+    """An entry whose body does not have the stored size is a miss."""
+    http_cache = HttpCache(str(tmp_path))
+    get_transcript_from_link(server.link, http_cache=http_cache)
+    entry = http_cache.get(server.link)
+
+    with open(tmp_path / f"{entry['sha256']}.pdf", "ab") as body:
+        body.write(b"garbage")
+
+    assert http_cache.get(server.link) is None
+    get_transcript_from_link(server.link, http_cache=http_cache)
+    assert server.statuses == [200, 200]
+
+
+def test_entry_evicted_while_read_is_a_miss(tmp_path, monkeypatch):
+    """An entry removed between reading and touching it is a miss."""
+    http_cache = HttpCache(str(tmp_path))
+    link = "https://example.com/attachment.pdf"
+    response = SimpleNamespace(headers={"ETag": '"v1"'})
+    http_cache.set(link, response, io.BytesIO(b"%PDF-1.4 document"))
+    utime = os.utime
+
+    def evict_then_touch(path, *args, **kwargs):
+        os.remove(path)
+        utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "utime", evict_then_touch)
+
+    assert http_cache.get(link) is None
+
+
+def test_least_recently_used_download_is_evicted(server, tmp_path):
+    """Storing beyond max_bytes drops the least recently used link."""
+    size = os.path.getsize(os.path.join(DOCUMENTS_DIR, "irctc.pdf"))
+    http_cache = HttpCache(str(tmp_path), max_bytes=size)
+    first_link = server.link
+    get_transcript_from_link(first_link, http_cache=http_cache)
+
+    server.document = "apollo_hospitals.pdf"
+    second_link = server.link.replace("attachment", "other")
+    get_transcript_from_link(second_link, http_cache=http_cache)
+
+    assert http_cache.get(first_link) is None
+    assert http_cache.get(second_link) is not None
+    assert len(list(tmp_path.glob("*.pdf"))) == 1
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from benchmarks.bench_import import MODULES, bench_import
+
+# Far above the ~50 ms the import takes, far below the ~500 ms it took when
+# groq and pdfplumber were imported eagerly.
+IMPORT_BUDGET_MS = 250
+
+
+@pytest.fixture(autouse=True)
+def no_key(monkeypatch):
+    """Imports must not need any configuration."""
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.setenv(
+        "PYTHONPATH",
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_loads_no_heavy_dependencies(module):
+    """Clients and pdf libraries are only imported once a parse starts."""
+    assert bench_import(module, repeat=1)["heavy"] == []
+
+
+def test_import_within_budget():
+    """Importing the parser stays cheap."""
+    result = bench_import("concall_parser.parser", repeat=3)
+    assert result["median_ms"] < IMPORT_BUDGET_MS
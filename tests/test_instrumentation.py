@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from concall_parser import parser as parser_module
+from concall_parser.async_parser import AsyncConcallParser
+from concall_parser.parser import ConcallParser
+from concall_parser.utils import get_groq_responses, instrumentation
+from concall_parser.utils.instrumentation import (
+    Instrumentation,
+    activate,
+    count,
+    span,
+)
+from concall_parser.utils.llm_backends import OfflineBackend
+
+
+@pytest.fixture
+def llm(monkeypatch, moderated_transcript, fake_classify):
+    """Serves the moderated transcript for any pdf and answers the LLM offline."""
+    monkeypatch.setattr(
+        parser_module,
+        "get_document_transcript",
+        lambda **kwargs: moderated_transcript,
+    )
+    backend = OfflineBackend(
+        rules=[
+            (r"Industries", '{"company_name": "Synthetic Industries"}'),
+            (
+                r".",
+                lambda messages, model: fake_classify(
+                    messages[-1]["content"], model
+                ),
+            ),
+        ]
+    )
+    monkeypatch.setattr(get_groq_responses, "llm_backend", backend)
+    return backend
+
+
+def test_disabled_records_nothing():
+    """Without an active Instrumentation spans and counters are no-ops."""
+    with span("stage") as opened:
+        count("calls")
+    assert opened is None
+
+    metrics = Instrumentation()
+    with activate(metrics):
+        with span("stage"):
+            count("calls", 2)
+    with span("stage"):
+        count("calls")
+    assert metrics.to_dict()["counters"] == {"calls": 2}
+    assert metrics.to_dict()["spans"]["stage"]["count"] == 1
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_parse_records_stages_and_usage(llm, workers, moderated_transcript):
+    """Every stage is timed and every LLM call is counted."""
+    parser = ConcallParser(
+        path="call.pdf",
+        instrument=True,
+        min_rule_confidence=None,
+        classification_workers=workers,
+    )
+    parser.extract_all()
+    metrics = parser.get_metrics()
+
+    for stage in (
+        "transcript",
+        "concall_info",
+        "dialogues",
+        "segmentation",
+        "agent.extract_management",
+        "agent.classify",
+        "llm.request",
+        "extract_all",
+    ):
+        assert metrics["spans"][stage]["count"] >= 1, stage
+    assert metrics["spans"]["segmentation"]["count"] == len(
+        moderated_transcript
+    )
+    counters = metrics["counters"]
+    assert counters["llm.calls"] == llm.calls
+    assert counters["llm.calls"] == metrics["spans"]["llm.request"]["count"]
+    assert counters["llm.prompt_tokens"] > counters["llm.completion_tokens"] > 0
+
+
+def test_parsers_are_instrumented_apart(llm):
+    """Each parse records only its own work; off by default."""
+    first = ConcallParser(path="call.pdf", instrument=True)
+    second = ConcallParser(path="call.pdf", instrument=True)
+    first.extract_concall_info()
+    second.extract_all()
+
+    assert "dialogues" not in first.get_metrics()["spans"]
+    assert "dialogues" in second.get_metrics()["spans"]
+    plain = ConcallParser(path="call.pdf")
+    plain.extract_all()
+    assert plain.get_metrics() == {"spans": {}, "counters": {}}
+
+
+def test_hook_receives_spans_and_counters(llm, monkeypatch):
+    """A hook turns instrumentation on and gets every measurement."""
+    events = []
+    monkeypatch.setattr(
+        instrumentation,
+        "hook",
+        lambda name, value, kind, attributes: events.append(
+            (name, kind, attributes)
+        ),
+    )
+    ConcallParser(path="call.pdf").extract_concall_info()
+
+    assert ("transcript", "span", {}) in events
+    assert (
+        "llm.calls",
+        "counter",
+        {"model": "llama3:70b-8192"},
+    ) in events
+
+
+def test_async_parser_metrics(llm):
+    """Spans and counters follow the async parse across tasks."""
+    parser = AsyncConcallParser(
+        path="call.pdf", instrument=True, min_rule_confidence=None
+    )
+
+    async def parse():
+        await parser.extract_all()
+        return await parser.get_metrics()
+
+    metrics = asyncio.run(parse())
+    assert metrics["counters"]["llm.calls"] == llm.calls
+    assert metrics["spans"]["agent.classify"]["count"] >= 1
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from concall_parser.agents.classify import ClassifyModeratorIntent
+from concall_parser.agents.extraction import ExtractManagement
+from concall_parser.utils import get_groq_responses
+from concall_parser.utils.llm_backends import (
+    GroqBackend,
+    OfflineBackend,
+    OpenAICompatibleBackend,
+    create_default_backend,
+)
+from concall_parser.utils.rate_limiter import is_retryable
+from concall_parser.utils.response_cache import ResponseCache
+
+MESSAGES = [
+    {"role": "system", "content": "Classify the statement."},
+    {"role": "user", "content": "The first question is from the line of A."},
+]
+
+
+class CompletionsHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+
+    requests = []
+
+    def do_POST(self):  # noqa: N802
+        """Echoes the model and last message back as the completion."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        CompletionsHandler.requests.append(
+            {"path": self.path, "auth": self.headers["Authorization"], **body}
+        )
+        if body["model"] == "overloaded":
+            self.send_response(503)
+            self.end_headers()
+            return
+        content = json.dumps(
+            {"model": body["model"], "echo": body["messages"][-1]["content"]}
+        )
+        payload = json.dumps(
+            {
+                "choices": [{"message": {"content": content}}],
+                "usage": {
+                    "prompt_tokens": 12,
+                    "completion_tokens": 8,
+                    "total_tokens": 20,
+                },
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        """Keeps the test output quiet."""
+
+
+@pytest.fixture
+def server():
+    """Serves CompletionsHandler on a free local port."""
+    CompletionsHandler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CompletionsHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/v1"
+    httpd.shutdown()
+
+
+def test_offline_backend_is_deterministic():
+    """Recordings win over rules, rules over the default."""
+    key = ResponseCache.make_key("model", MESSAGES, temperature=0.3)
+    backend = OfflineBackend(
+        rules=[
+            (r"first question", '{"intent": "new_analyst_start"}'),
+            (r".", lambda messages, model: json.dumps({"model": model})),
+        ],
+        recordings={key: '{"intent": "recorded"}'},
+    )
+
+    recorded = backend.complete(MESSAGES, "model", temperature=0.3)
+    ruled = backend.complete(MESSAGES, "model", temperature=0.5)
+    assert recorded.content == '{"intent": "recorded"}'
+    assert ruled.content == '{"intent": "new_analyst_start"}'
+    other = [{"role": "user", "content": "Thank you."}]
+    assert backend.complete(other, "m").content == '{"model": "m"}'
+    assert backend.complete([], "m").content == "{}"
+    assert recorded.usage.total_tokens > 0
+    assert backend.calls == 4
+
+    with pytest.raises(LookupError):
+        OfflineBackend(default=None).complete(MESSAGES, "model")
+
+
+def test_agents_go_through_the_backend(monkeypatch):
+    """Agents reach the model through the configured backend."""
+    backend = OfflineBackend(
+        rules=[(r"first question", '{"intent": "new_analyst_start"}')]
+    )
+    monkeypatch.setattr(get_groq_responses, "llm_backend", backend)
+
+    intent = ClassifyModeratorIntent.process(
+        MESSAGES[1]["content"], "llama3-70b-8192"
+    )
+    management = asyncio.run(
+        ExtractManagement.aprocess("Rahul Jain, CEO", "llama3-70b-8192")
+    )
+
+    assert json.loads(intent) == {"intent": "new_analyst_start"}
+    assert management == "{}"
+    assert backend.calls == 2
+
+
+def test_openai_compatible_backend(server):
+    """Requests reach the server's endpoint, nulls left out."""
+    backend = OpenAICompatibleBackend(server, api_key="secret")
+
+    response = backend.complete(MESSAGES, "local", temperature=0.3, stop=None)
+    async_response = asyncio.run(backend.acomplete(MESSAGES, "local"))
+
+    assert json.loads(response.content)["echo"] == MESSAGES[-1]["content"]
+    assert async_response == response
+    assert response.usage.total_tokens == 20
+    first = CompletionsHandler.requests[0]
+    assert first["path"] == "/v1/chat/completions"
+    assert first["auth"] == "Bearer secret"
+    assert first["temperature"] == 0.3
+    assert "stop" not in first
+
+
+def test_openai_compatible_errors_are_retryable(server):
+    """Server errors surface as retryable, so the scheduler retries them."""
+    backend = OpenAICompatibleBackend(server)
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        backend.complete(MESSAGES, "overloaded")
+    assert is_retryable(error.value)
+
+
+def test_default_backend_from_environment(monkeypatch):
+    """LLM_BASE_URL selects a self-hosted server over Groq."""
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.delenv("LLM_BASE_URL", raising=False)
+    with pytest.raises(OSError):
+        create_default_backend()
+
+    monkeypatch.setenv("GROQ_API_KEY", "key")
+    assert isinstance(create_default_backend(), GroqBackend)
+
+    monkeypatch.setenv("LLM_BASE_URL", "http://localhost:8000/v1/")
+    backend = create_default_backend()
+    assert isinstance(backend, OpenAICompatibleBackend)
+    assert backend.base_url == "http://localhost:8000/v1"
+
+
+def test_import_needs_no_key(monkeypatch):
+    """The backend is created on first use, not at import."""
+    monkeypatch.delenv("GROQ_API_KEY", raising=False)
+    monkeypatch.delenv("LLM_BASE_URL", raising=False)
+    monkeypatch.setattr(get_groq_responses, "llm_backend", None)
+    assert get_groq_responses.get_groq_response(MESSAGES, "model") is None
@@ -0,0 +1,40 @@
+import json
+
+from concall_parser.agents.extraction import ExtractManagement
+from concall_parser.extractors.management import (
+    MAX_CHUNK_TOKENS,
+    CompanyAndManagementExtractor,
+)
+from concall_parser.utils.tokens import estimate_tokens
+
+TEAM = [
+    ("Suresh Manglani", "Chief Executive Officer"),
+    ("Parag Parikh", "Chief Financial Officer"),
+    ("Rahul Bhatia", "Business Development Head"),
+]
+
+
+def test_long_text_is_chunked_and_merged(monkeypatch):
+    """Oversized pages go out in chunks whose results are merged."""
+    requests = []
+
+    def process(page_text: str, groq_model: str) -> str:
+        requests.append(page_text)
+        result = {"company_name": "Adani Total Gas Limited"}
+        for name, designation in TEAM:
+            if name in page_text:
+                result[name] = designation
+        return json.dumps(result)
+
+    monkeypatch.setattr(ExtractManagement, "process", process)
+    filler = "Safe harbour statement text for this call.\n" * 400
+    text = (
+        f"{TEAM[0][0]}\n{filler}{TEAM[1][0]}\n{filler}{TEAM[2][0]}\n"
+        "Moderator: Ladies and gentlemen, welcome."
+    )
+
+    result = CompanyAndManagementExtractor().extract(text, "llama3-70b-8192")
+
+    assert len(requests) > 1
+    assert all(estimate_tokens(chunk) <= MAX_CHUNK_TOKENS for chunk in requests)
+    assert result == {"company_name": "Adani Total Gas Limited", **dict(TEAM)}
@@ -0,0 +1,58 @@
+from benchmarks.synthetic import make_management_call
+from concall_parser.extractors.management_case_extractor import (
+    ManagementCaseExtractor,
+)
+
+
+def test_titles_are_dropped_and_initials_kept():
+    """Speakers are named without their title, with their initials."""
+    speeches = ManagementCaseExtractor().extract(
+        {
+            1: "Sh B. Srinivasan:\nGood evening.\n"
+            "Mr. A.K. Sharma: Thank you.\n"
+            "Sanjay Kumar Jain: Thanks.",
+        }
+    )
+    assert speeches == {
+        "B. Srinivasan": ["Good evening."],
+        "A.K. Sharma": ["Thank you."],
+        "Sanjay Kumar Jain": ["Thanks."],
+    }
+
+
+def test_speakers_keep_their_order(management_only_transcript):
+    """Speakers are listed in the order they first speak."""
+    speeches = ManagementCaseExtractor().extract(management_only_transcript)
+    assert list(speeches)[-2:] == ["B. Srinivasan", "V. Srikanth"]
+    assert len(speeches["B. Srinivasan"]) == 2
+
+
+def test_speech_continues_across_pages():
+    """A speech running onto the next page is kept in one piece."""
+    speeches = ManagementCaseExtractor().extract(
+        {
+            1: "Sh V. Srikanth: Our revenue grew",
+            2: "by twelve percent this year.\nSh B. Srinivasan: Thank you.",
+        }
+    )
+    assert speeches["V. Srikanth"] == [
+        "Our revenue grew by twelve percent this year."
+    ]
+
+
+def test_colon_inside_a_line_is_not_a_label():
+    """Only a name starting a line opens a speech."""
+    speeches = ManagementCaseExtractor().extract(
+        {1: "Sh V. Srikanth: The ratio was 3:1, Capex: flat.\nNext Steps: none"}
+    )
+    assert speeches == {
+        "V. Srikanth": ["The ratio was 3:1, Capex: flat."],
+        "Next Steps": ["none"],
+    }
+
+
+def test_every_label_of_a_long_call_is_found():
+    """Each label of a 300 page call opens exactly one speech."""
+    transcript = make_management_call(300)
+    speeches = ManagementCaseExtractor().extract(transcript)
+    assert sum(len(turns) for turns in speeches.values()) == 300 * 6
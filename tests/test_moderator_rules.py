@@ -0,0 +1,196 @@
+import pytest
+
+from concall_parser.agents.moderator_rules import (
+    RuleBasedCheckModerator,
+    RuleBasedModeratorIntent,
+)
+from concall_parser.extractors.management_case_extractor import (
+    ManagementCaseExtractor,
+)
+
+
+@pytest.mark.parametrize(
+    "statement, name, company",
+    [
+        (
+            "Thank you very much. We will now begin the question-and-answer "
+            "session. The first question is from the line of Yogesh Patil "
+            "from Dolat Capital. Please go ahead.",
+            "Yogesh Patil",
+            "Dolat Capital",
+        ),
+        (
+            "The next question comes from Ashish Jain from Macquarie.",
+            "Ashish Jain",
+            "Macquarie",
+        ),
+        (
+            "We have our next question from the line of Sanketh Godha\n"
+            "from Avendus Spark. Please go ahead. Page 22 of 35",
+            "Sanketh Godha",
+            "Avendus Spark",
+        ),
+        (
+            "The first question is from the line of Mukesh Saraf at "
+            "Avendus Spark.",
+            "Mukesh Saraf",
+            "Avendus Spark",
+        ),
+        (
+            "The next question is from Mr. Rahul M. Sharma from ICICI "
+            "Securities Ltd. Please go ahead.",
+            "Rahul M. Sharma",
+            "ICICI Securities Ltd",
+        ),
+    ],
+)
+def test_new_analyst(statement: str, name: str, company: str):
+    """Analyst introductions yield the analyst's name and company."""
+    response = RuleBasedModeratorIntent.process(statement)
+    assert response["intent"] == "new_analyst_start"
+    assert response["analyst_name"] == name
+    assert response["analyst_company"] == company
+    assert response["confidence"] > 0.9
+
+
+@pytest.mark.parametrize(
+    "statement, intent",
+    [
+        (
+            "Ladies and gentlemen, good day and welcome to Adani Total Gas "
+            "Limited Q3 FY25 Investor Update Call.",
+            "opening",
+        ),
+        (
+            "Good evening, ladies and gentlemen. A very warm welcome to ICICI "
+            "Lombard's Q3 Earnings Conference Call.",
+            "opening",
+        ),
+        (
+            "On behalf of ATGL, that concludes this conference. Thank you for "
+            "joining us. And you may now disconnect your lines.",
+            "end",
+        ),
+        (
+            "I now hand the conference over to the management for their "
+            "closing comments.",
+            "end",
+        ),
+    ],
+)
+def test_opening_and_end(statement: str, intent: str):
+    """Stock opening and closing phrases are recognised."""
+    response = RuleBasedModeratorIntent.process(statement)
+    assert response["intent"] == intent
+    assert response["confidence"] > 0.9
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "Hello sir, you are not audible.",
+        "The next question comes from the line of Rajesh Gajra, an Informist.",
+    ],
+)
+def test_unrecognised_statements_are_low_confidence(statement: str):
+    """Statements the rules cannot settle are left to the LLM."""
+    assert RuleBasedModeratorIntent.process(statement)["confidence"] < 0.9
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "The next question is from the line of Jane Roe from J.P. Morgan. "
+        "Please go ahead.",
+        "The next question is from Jane Roe of J. P. Morgan.",
+    ],
+)
+def test_company_with_initials(statement: str):
+    """Initials stay in the company, which is left to the LLM to confirm."""
+    response = RuleBasedModeratorIntent.process(statement)
+    assert response["analyst_name"] == "Jane Roe"
+    assert response["analyst_company"].replace(" ", "") == "J.P.Morgan"
+    assert response["confidence"] < 0.9
+
+
+def test_long_statement_is_matched():
+    """An introduction at the end of a long statement is still found."""
+    statement = (
+        "Thank you. "
+        + "We will wait for a moment while the question queue assembles " * 2000
+        + "The first question is from the line of Jane Roe from ABC Capital."
+    )
+    response = RuleBasedModeratorIntent.process(statement)
+    assert (response["analyst_name"], response["analyst_company"]) == (
+        "Jane Roe",
+        "ABC Capital",
+    )
+
+
+def test_moderated_call_is_detected(moderated_transcript):
+    """A Moderator label on the first pages makes the call moderated."""
+    assert RuleBasedCheckModerator.process(moderated_transcript) == {
+        "moderator": "Moderator",
+        "confidence": 0.95,
+    }
+
+
+def test_management_only_call_is_detected(management_only_transcript):
+    """Named speakers speaking at length, and no Moderator, mean no moderator.
+
+    Cover letter fields are labelled too, but too short to count.
+    """
+    assert RuleBasedCheckModerator.process(management_only_transcript) == {
+        "moderator": "",
+        "confidence": 0.95,
+    }
+
+
+def test_too_few_speakers_is_low_confidence(management_only_transcript):
+    """A transcript whose first pages are a cover letter cannot be told."""
+    response = RuleBasedCheckModerator.process(
+        {1: management_only_transcript[1]}
+    )
+    assert response["confidence"] < 0.9
+
+
+def test_operator_is_a_moderator(management_only_transcript):
+    """Calls run by an Operator are moderated too."""
+    transcript = {
+        **management_only_transcript,
+        2: "Operator: Welcome to the call.\n" + management_only_transcript[2],
+    }
+
+    assert RuleBasedCheckModerator.process(transcript) == {
+        "moderator": "Operator",
+        "confidence": 0.95,
+    }
+
+
+def test_moderator_run_into_a_sentence_is_found(management_only_transcript):
+    """A Moderator label lost at the end of a sentence still counts."""
+    transcript = {
+        **management_only_transcript,
+        3: management_only_transcript[3]
+        + " Thank you. Moderator: The next question is from Jane Roe.",
+    }
+
+    assert RuleBasedCheckModerator.process(transcript) == {
+        "moderator": "Moderator",
+        "confidence": 0.95,
+    }
+
+
+def test_detector_and_extractor_read_the_same_labels():
+    """Speakers that make a call unmoderated are the ones extracted."""
+    transcript = {
+        1: "Mr. A.K. Sharma:\n" + "We had a strong quarter overall. " * 5,
+        2: "Dr. Asha Rao:\n" + "Margins held up well this year. " * 5,
+        3: "Mr. A.K. Sharma:\n" + "Thank you all for joining today. " * 5,
+    }
+
+    assert RuleBasedCheckModerator.process(transcript)["moderator"] == ""
+    assert list(ManagementCaseExtractor().extract(transcript)) == [
+        "A.K. Sharma",
+        "Asha Rao",
+    ]
@@ -0,0 +1,150 @@
+import json
+
+import pytest
+
+from concall_parser import parser as parser_module
+from concall_parser.agents.classify import ClassifyModeratorIntent
+from concall_parser.agents.extraction import ExtractManagement
+from concall_parser.parser import ConcallParser
+from concall_parser.utils import get_groq_responses
+from concall_parser.utils.llm_backends import OfflineBackend
+
+PDF_PATH = "tests/test_documents/irctc.pdf"
+
+pytestmark = pytest.mark.usefixtures("offline_llm")
+
+
+def test_lazy_parser_reads_only_needed_pages(monkeypatch):
+    """Concall info and commentary only pull the pages they need."""
+    monkeypatch.setattr(
+        ExtractManagement, "process", lambda page_text, groq_model: "{}"
+    )
+    monkeypatch.setattr(
+        ClassifyModeratorIntent,
+        "process",
+        lambda dialogue, groq_model: json.dumps({"intent": "opening"}),
+    )
+    # Rules find where the commentary ends; every other statement opens.
+    parser = ConcallParser(
+        path=PDF_PATH, lazy_transcript=True, min_rule_confidence=0.9
+    )
+
+    parser.extract_concall_info()
+    assert parser.transcript.extracted_pages == 2
+
+    commentary = parser.extract_commentary()
+    read_for_commentary = parser.transcript.extracted_pages
+    assert commentary
+    assert read_for_commentary < len(parser.transcript)
+
+    assert parser.extract_commentary() is commentary
+    assert parser.extract_analyst_discussion()
+
+
+def test_lazy_transcript_fills_the_cache(tmp_path):
+    """A lazy parse that reads every page stores the transcript for reuse."""
+    cache_dir = str(tmp_path)
+    with ConcallParser(
+        path=PDF_PATH, lazy_transcript=True, transcript_cache_dir=cache_dir
+    ) as parser:
+        pages = dict(parser.transcript.items())
+
+    reparsed = ConcallParser(
+        path=PDF_PATH, lazy_transcript=True, transcript_cache_dir=cache_dir
+    )
+    assert reparsed.transcript == pages
+    assert reparsed.transcript_cache.hits == 1
+
+
+def test_call_without_moderator_is_routed(
+    offline_llm, monkeypatch, management_only_transcript
+):
+    """extract_all extracts speeches of an unmoderated call, classifying none."""
+    monkeypatch.setattr(
+        ClassifyModeratorIntent,
+        "process",
+        lambda dialogue, groq_model: pytest.fail("classified a statement"),
+    )
+    parser = ConcallParser(path=PDF_PATH)
+    parser.transcript = management_only_transcript
+
+    result = parser.extract_all()
+
+    assert not parser.has_moderator()
+    assert list(result) == ["concall_info", "commentary", "analyst", "speeches"]
+    assert (result["commentary"], result["analyst"]) == ([], {})
+    assert list(result["speeches"])[-2:] == ["B. Srinivasan", "V. Srikanth"]
+    assert offline_llm.calls == 1
+
+
+def test_failed_walk_is_not_returned_as_complete(
+    monkeypatch, moderated_transcript, fake_classify
+):
+    """After a failed LLM request, the next call finishes the dialogues."""
+    monkeypatch.setattr(
+        parser_module,
+        "get_document_transcript",
+        lambda **kwargs: moderated_transcript,
+    )
+    calls = []
+
+    def classify(dialogue, groq_model):
+        calls.append(dialogue)
+        if len(calls) == 3:
+            raise RuntimeError("LLM request failed")
+        return fake_classify(dialogue, groq_model)
+
+    monkeypatch.setattr(ClassifyModeratorIntent, "process", classify)
+    parser = ConcallParser(path="call.pdf", min_rule_confidence=None)
+
+    with pytest.raises(RuntimeError):
+        parser.extract_analyst_discussion()
+    analysts = parser.extract_analyst_discussion()
+
+    assert list(analysts) == ["Jane Roe", "John Doe"]
+    assert analysts["John Doe"]["dialogue"]
+    # Statements classified before the failure are not sent again.
+    assert len(calls) == 5
+
+
+def test_llm_options_stay_with_their_parser(
+    offline_llm, monkeypatch, tmp_path, moderated_transcript, fake_classify
+):
+    """A parser's backend, cache and budgets do not leak into other parsers."""
+    monkeypatch.setattr(
+        parser_module,
+        "get_document_transcript",
+        lambda **kwargs: moderated_transcript,
+    )
+    scheduler = get_groq_responses.get_scheduler()
+    own = OfflineBackend(
+        rules=[
+            (
+                r".",
+                lambda messages, model: fake_classify(
+                    messages[-1]["content"], model
+                ),
+            )
+        ]
+    )
+    configured = ConcallParser(
+        path="call.pdf",
+        llm_backend=own,
+        llm_cache_path=str(tmp_path / "llm.sqlite3"),
+        requests_per_minute=600,
+        min_rule_confidence=None,
+        classification_workers=4,
+    )
+    plain = ConcallParser(path="call.pdf", min_rule_confidence=None)
+
+    configured.extract_all()
+    assert own.calls == 5
+    assert offline_llm.calls == 0
+    assert configured.get_rate_limit_stats()["requests"] == 5
+    assert configured.response_cache.stats()["entries"] == 5
+
+    plain.extract_all()
+    assert own.calls == 5
+    assert offline_llm.calls > 0
+    assert get_groq_responses.response_cache is None
+    assert get_groq_responses.get_scheduler() is scheduler
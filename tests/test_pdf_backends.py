@@ -0,0 +1,76 @@
+import glob
+
+import pytest
+
+from concall_parser.utils.file_utils import get_document_transcript
+from concall_parser.utils.pdf_backends import is_degraded, open_pdf
+from concall_parser.utils.speaker_segmenter import segment_speakers
+
+DOCUMENTS = sorted(glob.glob("tests/test_documents/*.pdf"))
+
+
+def speakers(text: str) -> list[str]:
+    """Returns the speaker labels of a page, in order."""
+    return [turn.speaker for turn in segment_speakers(text)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Moderator: Thank you. The next question is from\n(cid:45)(cid:46)",
+        "Parag Parikh:\nRahul Bhatia:\nThank you for the opportunity.",
+        "Thanks for taking my question. Rahul Bhatia: Sure, go ahead.",
+    ],
+)
+def test_degraded_pages_are_detected(text):
+    """Glyph garbage, stacked labels and inline labels are degraded."""
+    assert is_degraded(text)
+
+
+def test_clean_page_is_not_degraded():
+    """Ordinary speaker turns, one label per line, are not degraded."""
+    text = (
+        "Moderator: Thank you. We will now begin.\n"
+        "Rahul Bhatia: Good morning everyone.\n"
+        "Note: figures are in crores."
+    )
+    assert not is_degraded(text)
+
+
+@pytest.mark.parametrize("path", DOCUMENTS)
+def test_auto_backend_matches_pdfplumber_speakers(path):
+    """Past the cover letter, auto finds the same speakers as pdfplumber."""
+    with open_pdf(path, "pdfplumber") as pdf:
+        expected = [pdf.extract_page(i) for i in range(pdf.page_count)]
+    with open_pdf(path, "auto") as pdf:
+        texts = [pdf.extract_page(i) for i in range(pdf.page_count)]
+
+    assert len(texts) == len(expected)
+    for text, reference in list(zip(texts, expected))[1:]:
+        assert speakers(text) == speakers(reference)
+
+
+def test_auto_backend_falls_back_on_degraded_pages():
+    """Pages with speaker labels in their own column use pdfplumber."""
+    path = "tests/test_documents/Adani_total_gas.pdf"
+    with open_pdf(path, "auto") as pdf:
+        for index in range(pdf.page_count):
+            pdf.extract_page(index)
+        assert 3 in pdf.fallback_pages
+
+    with open_pdf(path, "pdfium") as pdf:
+        assert is_degraded(pdf.extract_page(3))
+
+
+def test_transcript_with_backend_keeps_page_numbering():
+    """Backends agree on which pages are empty and how pages are numbered."""
+    path = "tests/test_documents/indusind_bank.pdf"
+    plumber = get_document_transcript(filepath=path)
+    auto = get_document_transcript(filepath=path, backend="auto")
+    assert list(auto) == list(plumber)
+
+
+def test_unknown_backend_is_rejected():
+    """Asking for a backend that does not exist raises ValueError."""
+    with pytest.raises(ValueError):
+        open_pdf(DOCUMENTS[0], "pymupdf")
@@ -0,0 +1,167 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from concall_parser.utils import get_groq_responses
+from concall_parser.utils.llm_backends import GroqBackend
+from concall_parser.utils.rate_limiter import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    LLMScheduler,
+    TokenBucket,
+)
+
+REQUEST = httpx.Request("POST", "https://api.groq.com/openai/v1/chat")
+
+
+def api_error(status: int, headers: dict | None = None) -> groq.APIStatusError:
+    """Builds the error groq raises for a response with this status."""
+    response = httpx.Response(status, headers=headers, request=REQUEST)
+    error_class = {429: groq.RateLimitError, 400: groq.BadRequestError}.get(
+        status, groq.InternalServerError
+    )
+    return error_class("failed", response=response, body=None)
+
+
+class FakeClock:
+    """Clock whose sleep advances time instantly and records the delays."""
+
+    def __init__(self):
+        """Initialize FakeClock at time 0."""
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        """Returns the current time."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Advances the clock by seconds."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def flaky(errors: list[Exception], response="ok"):
+    """Returns a function raising each of errors in turn, then succeeding."""
+    remaining = list(errors)
+
+    def request():
+        if remaining:
+            raise remaining.pop(0)
+        return response
+
+    return request
+
+
+def test_token_bucket_refills_and_carries_debt():
+    """Budget refills at its rate, and overdraft delays later requests."""
+    bucket = TokenBucket(capacity=60, per_second=1, now=0)
+    assert bucket.wait_time(60, now=0) == 0
+    bucket.consume(60, now=0)
+    assert bucket.wait_time(10, now=4) == pytest.approx(6)
+
+    bucket.consume(30, now=10)
+    assert bucket.level == -20
+    assert bucket.wait_time(1000, now=10) == pytest.approx(80)
+
+
+def test_rate_limit_honours_retry_after():
+    """A 429 waits exactly as long as retry-after asks, then retries."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(clock=clock, sleep=clock.sleep, base_delay=1.0)
+    request = flaky([api_error(429, {"retry-after": "7"})])
+
+    assert scheduler.call(request) == "ok"
+    assert 7 <= clock.sleeps[0] <= 7.1
+    stats = scheduler.stats()
+    assert (stats["retries"], stats["rate_limited"]) == (1, 1)
+
+
+def test_server_errors_back_off_exponentially():
+    """Retries wait between half and all of a doubling backoff."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(clock=clock, sleep=clock.sleep, base_delay=1.0)
+    request = flaky([api_error(503) for _ in range(3)])
+
+    assert scheduler.call(request) == "ok"
+    for attempt, delay in enumerate(clock.sleeps):
+        assert 2**attempt / 2 <= delay <= 2**attempt
+
+
+def test_retries_give_up():
+    """Non-retryable errors and exhausted retries are raised."""
+    clock = FakeClock()
+    scheduler = LLMScheduler(clock=clock, sleep=clock.sleep, max_retries=2)
+    with pytest.raises(groq.BadRequestError):
+        scheduler.call(flaky([api_error(400)]))
+    assert clock.sleeps == []
+
+    with pytest.raises(groq.InternalServerError):
+        scheduler.call(flaky([api_error(500) for _ in range(3)]))
+    assert len(clock.sleeps) == 2
+
+
+def test_token_usage_is_settled():
+    """Requests are charged the tokens their response reports using."""
+    scheduler = LLMScheduler(tokens_per_minute=600)
+    usage = SimpleNamespace(usage=SimpleNamespace(total_tokens=400))
+    scheduler.call(lambda: usage, tokens=100)
+    assert scheduler._token_bucket.level == pytest.approx(200, abs=1)
+
+
+def test_higher_priority_goes_first():
+    """Once the budget is spent, waiting requests go by priority."""
+    scheduler = LLMScheduler(requests_per_minute=600)
+    for _ in range(600):
+        scheduler.acquire()
+
+    order = []
+
+    def request(name: str, priority: int) -> None:
+        scheduler.acquire(priority=priority)
+        order.append(name)
+
+    low = threading.Thread(target=request, args=("low", PRIORITY_LOW))
+    high = threading.Thread(target=request, args=("high", PRIORITY_HIGH))
+    low.start()
+    time.sleep(0.01)
+    high.start()
+    time.sleep(0.01)
+    assert scheduler.stats()["queue_depth"] == 2
+    low.join()
+    high.join()
+
+    assert order == ["high", "low"]
+    stats = scheduler.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 2
+    assert stats["wait_seconds_max"] > 0.05
+
+
+def test_groq_response_survives_rate_limit(monkeypatch):
+    """A 429 from Groq is retried instead of surfacing as None."""
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))]
+    )
+    create = flaky([api_error(429, {"retry-after": "0"})], completion)
+    completions = SimpleNamespace(create=lambda **kwargs: create())
+    monkeypatch.setattr(
+        get_groq_responses,
+        "llm_backend",
+        GroqBackend(
+            client=SimpleNamespace(
+                chat=SimpleNamespace(completions=completions)
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        get_groq_responses, "scheduler", LLMScheduler(sleep=lambda s: None)
+    )
+
+    messages = [{"role": "user", "content": "hello"}]
+    assert get_groq_responses.get_groq_response(messages, "test") == "{}"
+    assert get_groq_responses.get_scheduler().stats()["rate_limited"] == 1
@@ -0,0 +1,130 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from concall_parser.utils import get_groq_responses, response_cache
+from concall_parser.utils.llm_backends import GroqBackend, OfflineBackend
+from concall_parser.utils.response_cache import ResponseCache
+
+MESSAGES = [{"role": "user", "content": "Moderator: welcome"}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """A fresh on-disk response cache."""
+    cache = ResponseCache(path=str(tmp_path / "llm.sqlite3"), max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_key_depends_on_request():
+    """Keys differ by model, messages and sampling parameters."""
+    key = ResponseCache.make_key("model", MESSAGES, temperature=0.3)
+    assert key == ResponseCache.make_key("model", MESSAGES, temperature=0.3)
+    assert key != ResponseCache.make_key("other", MESSAGES, temperature=0.3)
+    assert key != ResponseCache.make_key("model", MESSAGES, temperature=0.5)
+    assert key != ResponseCache.make_key("model", [], temperature=0.3)
+
+
+def test_hits_misses_and_lru_eviction(cache, monkeypatch):
+    """The least recently used entry is evicted once the cache is full."""
+    now = iter(range(100))
+    monkeypatch.setattr(response_cache.time, "time", lambda: next(now))
+
+    assert cache.get("a") is None
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats() == {"hits": 3, "misses": 2, "entries": 2}
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    """Entries older than the ttl are treated as misses."""
+    now = 1000.0
+    monkeypatch.setattr(response_cache.time, "time", lambda: now)
+    cache = ResponseCache(path=str(tmp_path / "llm.sqlite3"), ttl=60)
+
+    cache.set("a", "1")
+    now += 30
+    assert cache.get("a") == "1"
+    now += 31
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_persists_across_instances(tmp_path):
+    """Responses are read back by a new cache on the same file."""
+    path = str(tmp_path / "llm.sqlite3")
+    ResponseCache(path=path).set("a", "1")
+    assert ResponseCache(path=path).get("a") == "1"
+
+
+def test_get_groq_response_uses_cache(cache, monkeypatch):
+    """A cached prompt is answered without calling Groq."""
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        message = SimpleNamespace(content='{"intent": "opening"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    completions = SimpleNamespace(create=create)
+    monkeypatch.setattr(
+        get_groq_responses,
+        "llm_backend",
+        GroqBackend(
+            client=SimpleNamespace(
+                chat=SimpleNamespace(completions=completions)
+            )
+        ),
+    )
+    get_groq_responses.set_response_cache(cache)
+    try:
+        first = get_groq_responses.get_groq_response(MESSAGES, "model")
+        second = get_groq_responses.get_groq_response(MESSAGES, "model")
+    finally:
+        get_groq_responses.set_response_cache(None)
+
+    assert first == second == '{"intent": "opening"}'
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+class LockedCache(ResponseCache):
+    """Response cache whose database is locked by another process."""
+
+    def __init__(self):
+        """Initialize LockedCache, with no database."""
+
+    def get(self, key):
+        """Fails like a read of a locked database."""
+        raise sqlite3.OperationalError("database is locked")
+
+    def set(self, key, response):
+        """Fails like a write to a locked database."""
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_locked_cache_falls_through_to_backend(monkeypatch):
+    """A cache that cannot be read or written does not fail the request."""
+    answer = '{"intent": "opening"}'
+    monkeypatch.setattr(
+        get_groq_responses, "llm_backend", OfflineBackend(default=answer)
+    )
+    get_groq_responses.set_response_cache(LockedCache())
+    try:
+        sync = get_groq_responses.get_groq_response(MESSAGES, "model")
+        result = asyncio.run(
+            get_groq_responses.get_groq_response_async(MESSAGES, "model")
+        )
+    finally:
+        get_groq_responses.set_response_cache(None)
+
+    assert sync == result == answer
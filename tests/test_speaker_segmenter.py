@@ -0,0 +1,125 @@
+import os
+import re
+
+import pytest
+
+from concall_parser.utils.file_utils import get_document_transcript
+from concall_parser.utils.speaker_segmenter import (
+    iter_transcript_turns,
+    segment_speakers,
+)
+from concall_parser.utils.transcript_buffer import TranscriptBuffer
+
+PDF_DIR = "tests/test_documents"
+
+# Pattern used by DialogueExtractor before the segmenter, kept as reference.
+LEGACY_SPEAKER_PATTERN = re.compile(
+    r"(?P<speaker>[A-Za-z\s]+):\s*(?P<dialogue>(?:.*(?:\n(?![A-Za-z\s]+:).*)*)*)",
+    re.MULTILINE,
+)
+
+SAMPLES = [
+    "",
+    "no speakers on this page.",
+    "Moderator: Ladies and gentlemen, welcome.\nJohn Doe: Thank you.",
+    "Leftover from the last page.\nModerator:\n\nThe first question is from\n"
+    "the line of Jane Roe from XYZ.\nJane Roe: Hi.",
+    "Page 3 of 12\nSpeaker One: line one\nline two\nThank you\nSpeaker Two: ok",
+    "Rahul Jain: call at 12:30 please.\n: stray colon\nMr. A Smith: done",
+    "Moderator:Thanks.\n\n\nAnalyst:\nQuestion\ncontinues here.",
+]
+
+
+def legacy_turns(text: str) -> list[tuple]:
+    """Turns found by the legacy backtracking pattern."""
+    return [
+        (
+            match.group("speaker").strip(),
+            match.start(),
+            match.start("dialogue"),
+            match.end(),
+        )
+        for match in LEGACY_SPEAKER_PATTERN.finditer(text)
+    ]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_matches_legacy_pattern(text: str):
+    """Segmenter output is identical to the legacy regex."""
+    assert [tuple(turn) for turn in segment_speakers(text)] == legacy_turns(
+        text
+    )
+
+
+@pytest.mark.parametrize(
+    "pdf_file",
+    [
+        os.path.join(PDF_DIR, f)
+        for f in sorted(os.listdir(PDF_DIR))
+        if f.endswith(".pdf")
+    ],
+)
+def test_matches_legacy_pattern_on_documents(pdf_file: str):
+    """Segmenter output is identical to the legacy regex on test documents."""
+    transcript = get_document_transcript(filepath=pdf_file)
+    for text in transcript.values():
+        assert [tuple(turn) for turn in segment_speakers(text)] == legacy_turns(
+            text
+        )
+
+
+def test_segment_bounds():
+    """Only the text between pos and endpos is segmented."""
+    text = "A: one\nB: two\nC: three"
+    turns = segment_speakers(text, pos=7, endpos=13)
+    assert [(t.speaker, text[t.dialogue_start : t.end]) for t in turns] == [
+        ("B", "two")
+    ]
+
+
+def test_transcript_turns_continue_across_pages():
+    """Text before a page's first label extends the turn before it."""
+    transcript = {
+        1: "Page 1\nModerator: Welcome.\nRahul Jain: Revenue grew",
+        2: "  \n",
+        3: "by 12%.\nModerator: Thank you.",
+        4: "The end.",
+    }
+    buffer = TranscriptBuffer()
+    turns = list(iter_transcript_turns(transcript, buffer))
+
+    assert [turn.speaker for turn in turns] == [
+        "Moderator",
+        "Rahul Jain",
+        "Moderator",
+    ]
+    rahul = turns[1]
+    assert buffer.text(rahul.dialogue_start, rahul.end) == (
+        "Revenue grew  \nby 12%."
+    )
+    assert buffer.page_number_at(rahul.end - 1) == 3
+    assert buffer.text(turns[2].dialogue_start, turns[2].end) == (
+        "Thank you.The end."
+    )
+
+
+@pytest.mark.parametrize("pdf_file", sorted(os.listdir(PDF_DIR)))
+def test_transcript_turns_match_pages(pdf_file: str):
+    """Within a page, turns are those of segmenting the page alone."""
+    transcript = get_document_transcript(os.path.join(PDF_DIR, pdf_file))
+    buffer = TranscriptBuffer()
+    turns = list(iter_transcript_turns(transcript, buffer))
+
+    by_page = {}
+    for turn in turns:
+        index = buffer.page_index(turn.start)
+        offset = buffer.page_starts[index]
+        end = min(turn.end, buffer.page_end(index))
+        by_page.setdefault(buffer.page_numbers[index], []).append(
+            (turn.speaker, turn.start - offset, end - offset)
+        )
+    for page_number, text in transcript.items():
+        assert by_page.get(page_number, []) == [
+            (turn.speaker, turn.start, turn.end)
+            for turn in segment_speakers(text)
+        ]
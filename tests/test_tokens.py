@@ -0,0 +1,41 @@
+from concall_parser.utils.tokens import (
+    estimate_tokens,
+    get_prompt_budget,
+    split_into_chunks,
+    trim_to_budget,
+)
+
+
+def test_prompt_budget_depends_on_model():
+    """Larger context windows leave more room for the user message."""
+    small = get_prompt_budget("llama3-70b-8192", "system prompt", 1024)
+    large = get_prompt_budget("llama-3.3-70b-versatile", "system prompt", 1024)
+    assert 0 < small < 8192 - 1024 < large
+
+
+def test_trim_keeps_leading_and_trailing_sentences():
+    """The middle of long text is dropped, its ends are kept."""
+    text = "First point. " + "Filler sentence. " * 100 + "Last point."
+    trimmed = trim_to_budget(text, 20)
+    assert estimate_tokens(trimmed) <= 20
+    assert trimmed.startswith("First point.")
+    assert trimmed.endswith("Last point.")
+    assert trim_to_budget("Short text.", 20) == "Short text."
+
+
+def test_trim_cuts_a_single_long_sentence():
+    """Text without sentence breaks is cut in the middle too."""
+    trimmed = trim_to_budget("a" * 1000, 50)
+    assert estimate_tokens(trimmed) <= 50
+    assert trimmed.startswith("a") and trimmed.endswith("a")
+
+
+def test_chunks_fit_budget_and_keep_all_text():
+    """Chunks split at line breaks, each within budget, nothing lost."""
+    text = "".join(f"Line {index} of the page.\n" for index in range(300))
+    text += "x" * 900
+    chunks = split_into_chunks(text, 100)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks) == text
+    assert all(chunk.endswith("\n") for chunk in chunks[:-4])
@@ -0,0 +1,36 @@
+import pytest
+
+from concall_parser.utils.transcript_buffer import TranscriptBuffer
+
+
+@pytest.fixture
+def buffer():
+    """Three pages, the middle one empty."""
+    buffer = TranscriptBuffer()
+    buffer.append(1, "first page ")
+    buffer.append(2, "")
+    buffer.append(3, "third page")
+    return buffer
+
+
+def test_offsets_map_to_pages(buffer):
+    """Every offset is found on its page by binary search."""
+    assert len(buffer) == 21
+    assert buffer.page_starts == [0, 11, 11]
+    assert [buffer.page_number_at(offset) for offset in (0, 10, 11, 20)] == [
+        1,
+        1,
+        3,
+        3,
+    ]
+    with pytest.raises(IndexError):
+        buffer.page_index(21)
+
+
+def test_parts_follow_pages(buffer):
+    """Text across pages comes out one part per page."""
+    assert list(buffer.iter_parts(6, 16)) == ["page ", "", "third"]
+    assert list(buffer.iter_parts(0, 4)) == ["firs"]
+    assert buffer.text(6, 16) == "page third"
+    # Text starting at the end of a page is attributed to that page.
+    assert list(buffer.iter_parts(11, 11, index=0)) == [""]
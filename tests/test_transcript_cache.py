@@ -0,0 +1,124 @@
+import os
+
+from concall_parser import cli
+from concall_parser.utils import file_utils
+from concall_parser.utils.file_utils import get_document_transcript
+from concall_parser.utils.transcript_cache import (
+    EXTRACTOR_VERSION,
+    TranscriptCache,
+    hash_pdf,
+)
+
+PDF_PATH = "tests/test_documents/apollo_hospitals.pdf"
+TRANSCRIPT = {
+    1: "Moderator: Good morning.",
+    2: "Analyst: Margins — ₹ 10 crore?",
+}
+
+
+def test_round_trip(tmp_path):
+    """A stored transcript is read back unchanged, unicode included."""
+    cache = TranscriptCache(str(tmp_path))
+    key = TranscriptCache.make_key("abc")
+    assert cache.get(key) is None
+
+    cache.set(key, TRANSCRIPT)
+    assert cache.get(key) == TRANSCRIPT
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_key_depends_on_backend_and_version(monkeypatch):
+    """The same pdf extracted differently is cached separately."""
+    key = TranscriptCache.make_key("abc", "pdfplumber")
+    assert key != TranscriptCache.make_key("abc", "auto")
+    monkeypatch.setattr(
+        "concall_parser.utils.transcript_cache.EXTRACTOR_VERSION",
+        EXTRACTOR_VERSION + "-next",
+    )
+    assert key != TranscriptCache.make_key("abc", "pdfplumber")
+
+
+def test_warm_run_skips_pdf_parsing(tmp_path, monkeypatch):
+    """A cached pdf is served without opening it for extraction."""
+    cache = TranscriptCache(str(tmp_path))
+    cold = get_document_transcript(filepath=PDF_PATH, cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pdf should not be parsed on a cache hit")
+
+    monkeypatch.setattr(file_utils, "open_pdf", fail)
+    warm = get_document_transcript(filepath=PDF_PATH, cache=cache)
+    assert warm == cold
+    assert cache.get(TranscriptCache.make_key(hash_pdf(PDF_PATH))) == cold
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    """Unreadable cache files are discarded instead of raising."""
+    cache = TranscriptCache(str(tmp_path))
+    key = TranscriptCache.make_key("abc")
+    cache.set(key, TRANSCRIPT)
+    path = os.path.join(tmp_path, key + ".cctr")
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 3)
+
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+
+
+def test_entry_evicted_while_read_is_a_miss(tmp_path, monkeypatch):
+    """A transcript removed between reading and touching it is a miss."""
+    cache = TranscriptCache(str(tmp_path))
+    key = TranscriptCache.make_key("abc")
+    cache.set(key, TRANSCRIPT)
+    utime = os.utime
+
+    def evict_then_touch(path, *args, **kwargs):
+        os.remove(path)
+        utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "utime", evict_then_touch)
+
+    assert cache.get(key) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    """Over max_bytes, transcripts not read recently are removed first."""
+    cache = TranscriptCache(str(tmp_path))
+    cache.set("old", TRANSCRIPT)
+    size = cache.stats()["bytes"]
+    cache.max_bytes = 2 * size
+    cache.set("recent", TRANSCRIPT)
+
+    for key, age in (("old", 30), ("recent", 20)):
+        path = os.path.join(tmp_path, key + ".cctr")
+        os.utime(path, (os.path.getatime(path) - age,) * 2)
+    cache.get("old")
+    cache.set("new", TRANSCRIPT)
+
+    assert cache.get("recent") is None
+    assert cache.get("old") == TRANSCRIPT
+    assert cache.get("new") == TRANSCRIPT
+
+
+def test_cli_purge(tmp_path, capsys):
+    """The cache command lists and purges transcripts, stale ones first."""
+    cache = TranscriptCache(str(tmp_path))
+    cache.set("stale", TRANSCRIPT)
+    cache.set("fresh", TRANSCRIPT)
+    stale_path = os.path.join(tmp_path, "stale.cctr")
+    two_days_ago = os.path.getmtime(stale_path) - 2 * 24 * 60 * 60
+    os.utime(stale_path, (two_days_ago, two_days_ago))
+
+    cli.main(["cache", "--cache-dir", str(tmp_path), "info"])
+    assert "transcripts: 2" in capsys.readouterr().out
+
+    cli.main(
+        ["cache", "--cache-dir", str(tmp_path), "purge", "--older-than", "1"]
+    )
+    assert "removed 1" in capsys.readouterr().out
+    assert [entry["key"] for entry in cache.entries()] == ["fresh"]
+
+    cli.main(["cache", "--cache-dir", str(tmp_path), "purge"])
+    assert cache.entries() == []